@@ -0,0 +1,148 @@
+import hashlib
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from financial_a2a_solution.constant import (
+    ARTIFACT_DIR,
+    ARTIFACT_SUMMARY_CHARS,
+    ARTIFACT_THRESHOLD,
+)
+
+
+HANDLE_PREFIX = "artifact://"
+
+
+@dataclass
+class StoredArtifact:
+    """A payload moved to the artifact store.
+
+    Args:
+        handle (str): The handle to read the payload back, `artifact://<sha256>`.
+        size (int): The length of the payload in characters.
+        summary (str): What is shown in place of the payload.
+    """
+
+    handle: str
+    size: int
+    summary: str
+
+
+class ArtifactStore:
+    """Content-addressed file store for large tool results.
+
+    A result longer than `threshold` characters is written once to a file
+    named after its SHA-256 digest, and replaced in the prompts by its
+    handle and a summary made of its first `summary_chars` characters.
+
+    Args:
+        directory (str | Path | None): The store directory. Defaults to a directory in the system temp dir.
+        threshold (int): The length above which a result is stored.
+        summary_chars (int): The number of leading characters kept in the summary.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        directory: str | Path | None = ARTIFACT_DIR,
+        threshold: int = ARTIFACT_THRESHOLD,
+        summary_chars: int = ARTIFACT_SUMMARY_CHARS,
+    ):
+        if directory is None:
+            directory = Path(tempfile.gettempdir()) / "financial-a2a-artifacts"
+        self.directory = Path(directory)
+        self.threshold = threshold
+        self.summary_chars = summary_chars
+        self._lock = threading.Lock()
+
+    def _path(self, handle: str) -> Path:
+        if not handle.startswith(HANDLE_PREFIX):
+            raise ValueError(f"Not an artifact handle: {handle}")
+        digest = handle.removeprefix(HANDLE_PREFIX)
+        if len(digest) != 64 or not digest.isalnum():  # noqa: PLR2004
+            raise ValueError(f"Not an artifact handle: {handle}")
+        return self.directory / digest
+
+    def put(self, text: str) -> str:
+        """Store a payload, once per distinct content.
+
+        Args:
+            text (str): The payload.
+
+        Returns:
+            str: The handle of the payload.
+        """
+        data = text.encode()
+        handle = HANDLE_PREFIX + hashlib.sha256(data).hexdigest()
+        path = self._path(handle)
+        with self._lock:
+            if not path.exists():
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_bytes(data)
+                tmp_path.replace(path)
+        return handle
+
+    def get(self, handle: str) -> str:
+        """Read a stored payload.
+
+        Args:
+            handle (str): The handle returned by `put`.
+
+        Returns:
+            str: The payload.
+
+        Raises:
+            KeyError: If no payload is stored under the handle.
+        """
+        try:
+            return self._path(handle).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            raise KeyError(handle) from None
+
+    def summarize(self, handle: str, text: str) -> str:
+        """Describe a stored payload for the prompts.
+
+        Args:
+            handle (str): The handle of the payload.
+            text (str): The payload.
+
+        Returns:
+            str: The handle, the size and the beginning of the payload.
+        """
+        omitted = len(text) - self.summary_chars
+        return (
+            f"[Stored as {handle}, {len(text)} characters, published as an "
+            f"artifact of the task]\n{text[: self.summary_chars]}\n"
+            f"... [{omitted} characters omitted]"
+        )
+
+    def spill(self, text: str) -> StoredArtifact | None:
+        """Store a payload if it is too large for the prompts.
+
+        Args:
+            text (str): The payload.
+
+        Returns:
+            StoredArtifact | None: The stored payload, or None if it is short enough to be kept inline.
+        """  # noqa: E501
+        if len(text) <= self.threshold:
+            return None
+        handle = self.put(text)
+        return StoredArtifact(handle, len(text), self.summarize(handle, text))
+
+
+_artifact_store: ArtifactStore | None = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the process-wide artifact store.
+
+    Returns:
+        ArtifactStore: The store configured by the `ARTIFACT_*` env variables.
+    """
+    global _artifact_store  # noqa: PLW0603
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
@@ -1,9 +1,6 @@
 import click
 import uvicorn
 from a2a.server.apps.starlette_app import A2AStarletteApplication
-from a2a.server.request_handlers.default_request_handler import (
-    DefaultRequestHandler,
-)
 from a2a.server.tasks.inmemory_task_store import InMemoryTaskStore
 from a2a.types import (
     AgentCapabilities,
@@ -12,6 +9,8 @@ from a2a.types import (
 )
 from dotenv import load_dotenv
 
+from financial_a2a_solution.mcp_pool import mcp_pool_lifespan
+from financial_a2a_solution.request_handler import CancellingRequestHandler
 from financial_a2a_solution.balance_sheet_agent.agent_executor import (
     BalanceSheetAgentExecutor,
 )
@@ -60,16 +59,21 @@ def main(host: str, port: int, env_file: str):
         ],
     )
 
+    agent_executor = BalanceSheetAgentExecutor()
     task_store = InMemoryTaskStore()
-    request_handler = DefaultRequestHandler(
-        agent_executor=BalanceSheetAgentExecutor(),
+    request_handler = CancellingRequestHandler(
+        agent_executor=agent_executor,
         task_store=task_store,
     )
 
     server = A2AStarletteApplication(
         agent_card=agent_card, http_handler=request_handler
     )
-    uvicorn.run(server.build(), host=host, port=port)
+    uvicorn.run(
+        server.build(lifespan=mcp_pool_lifespan(agent_executor.warm_up)),
+        host=host,
+        port=port,
+    )
 
 
 if __name__ == "__main__":
@@ -1,3 +1,15 @@
 import os
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+
+
+def get_agent_request_timeout() -> float | None:
+    """Return the deadline of a request.
+
+    The environment is read on each call, so the variable may come from the
+    env file loaded by `main`.
+
+    Returns:
+        float | None: `AGENT_REQUEST_TIMEOUT` in seconds, 300 by default, or None for no deadline when it is 0.
+    """  # noqa: E501
+    return float(os.getenv("AGENT_REQUEST_TIMEOUT") or 300) or None
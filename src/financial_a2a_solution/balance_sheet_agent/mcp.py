@@ -1,14 +1,12 @@
 import asyncio
-import json
 from pathlib import Path
 
-from mcp.client.session import ClientSession
-from mcp.client.sse import sse_client
-from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.shared.session import ProgressFnT
 from mcp.types import CallToolResult, TextContent
 
-from financial_a2a_solution.the_solution import prompts  # type: ignore
-from financial_a2a_solution.types import Tool
+from financial_a2a_solution.mcp_catalog import ToolCatalog
+from financial_a2a_solution.mcp_pool import MCPSessionPool
+from financial_a2a_solution.mcp_router import MCPRouter
 
 dir_path = Path(__file__).parent
 
@@ -17,74 +15,49 @@ async def get_mcp_tool_prompt(
     *_not_used,  # pyright: ignore # noqa # type: ignore
     url: str | None = None,
     cmd: list[str] | None = None,
+    servers: dict[str, dict] | None = None,
 ) -> str:
     """Get the MCP tool prompt for a given URL.
 
+    The prompt is memoized per server by the shared `ToolCatalog`, and
+    the tools of several servers are discovered in parallel.
+
     Args:
         url (str | None): The URL of the MCP tool.
         cmd (list[str] | None): The command to call the MCP tool.
+        servers (dict[str, dict] | None): Several MCP servers by name, each with a `url` or a `cmd`. Their tools are namespaced as `<server>.<tool>`.
 
     Returns:
         str: The MCP tool prompt.
-    """
-    if not url and not cmd:
-        raise ValueError("Either url or cmd must be provided")
-    if url and cmd:
-        raise ValueError("Only one of url or cmd must be provided")
-
-    if url:
-        async with (
-            sse_client(url) as (read, write),
-            ClientSession(read, write) as session,
-        ):
-            await session.initialize()
-
-            resources = await session.list_tools()
-            tools = [
-                Tool(
-                    name=tool.name,
-                    description=tool.description,
-                    inputSchema=json.dumps(tool.inputSchema),
-                )
-                for tool in resources.tools
-            ]
-            return  prompts.get_tools_prompt(tools)
-    if cmd:
-        command, *args = cmd
-        async with (
-            stdio_client(
-                StdioServerParameters(command=command, args=args) # type: ignore
-            ) as (read, write),
-            ClientSession(read, write) as session,
-        ):
-            await session.initialize()
-            resources = await session.list_tools()
-            tools = [
-                Tool(
-                    name=tool.name,
-                    description=tool.description,
-                    inputSchema=json.dumps(tool.inputSchema),
-                )
-                for tool in resources.tools
-            ]
-            return  prompts.get_tools_prompt(tools)
-    raise ValueError("Either url or cmd must be provided")
-
-
-async def call_mcp_tool(
+    """  # noqa: E501
+    if not url and not cmd and not servers:
+        raise ValueError("Either url, cmd or servers must be provided")
+    if sum(bool(source) for source in (url, cmd, servers)) > 1:
+        raise ValueError("Only one of url, cmd or servers must be provided")
+
+    if servers:
+        return await MCPRouter.shared(servers).get_prompt()
+    return await ToolCatalog.shared(url=url, cmd=cmd).get_prompt()
+
+
+async def call_mcp_tool(  # noqa: PLR0913
     *_not_used,  # pyright: ignore # noqa
     url: str | None = None,
     cmd: list[str] | None = None,
+    servers: dict[str, dict] | None = None,
     tool_name: str | None = None,
     arguments: dict | None = None,
+    progress_callback: ProgressFnT | None = None,
 ) -> CallToolResult:
     """Call an MCP tool with the given URL and tool name.
 
     Args:
         url (str | None): The URL of the MCP tool.
         cmd (list[str] | None): The command to call the MCP tool.
+        servers (dict[str, dict] | None): Several MCP servers by name, each with a `url` or a `cmd`. Their tools are namespaced as `<server>.<tool>`.
         tool_name (str | None): The name of the tool to call.
         arguments (dict | None): The arguments to pass to the tool. Defaults to None.
+        progress_callback (ProgressFnT | None): Called with the progress notifications of the call.
 
     Returns:
         CallToolResult: The result of the tool call.
@@ -92,25 +65,20 @@ async def call_mcp_tool(
     if not tool_name:
         raise ValueError("tool_name (str) must be provided")
 
-    if url:
-        async with (
-            sse_client(url) as (read, write),
-            ClientSession(read, write) as session,
-        ):
-            await session.initialize()
-            return await session.call_tool(tool_name, arguments=arguments)
-    if cmd:
-        command, *args = cmd
-        async with (
-            stdio_client(
-                StdioServerParameters(command=command, args=args)  # type: ignore
-            ) as (read, write),
-            ClientSession(read, write) as session,
-        ):
-            await session.initialize()
-            return await session.call_tool(tool_name, arguments=arguments)
-    else:
-        raise ValueError("Either url or cmd must be provided")
+    if not url and not cmd and not servers:
+        raise ValueError("Either url, cmd or servers must be provided")
+    if sum(bool(source) for source in (url, cmd, servers)) > 1:
+        raise ValueError("Only one of url, cmd or servers must be provided")
+
+    if servers:
+        return await MCPRouter.shared(servers).call_tool(
+            tool_name,
+            arguments=arguments,
+            progress_callback=progress_callback,
+        )
+    return await MCPSessionPool.shared(url=url, cmd=cmd).call_tool(
+        tool_name, arguments=arguments, progress_callback=progress_callback
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+def make_key(*parts: str) -> str:
+    """Build a content-addressed cache key.
+
+    Args:
+        *parts (str): The values identifying the cached item.
+
+    Returns:
+        str: The SHA-256 hex digest of the parts.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class MemoryCache:
+    """Thread-safe in-memory LRU cache with a per-entry TTL.
+
+    Args:
+        max_entries (int): The number of entries kept before the least recently used one is evicted.
+        ttl (float | None): The default time to live of an entry in seconds. None means no expiry.
+    """  # noqa: E501
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:  # noqa: ANN401
+        """Return a cached value, or None if it is missing or expired.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Any | None: The cached value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:  # noqa: ANN401
+        """Store a value.
+
+        Args:
+            key (str): The cache key.
+            value (Any): The value to store.
+            ttl (float | None): The time to live in seconds. Defaults to the cache TTL.
+        """  # noqa: E501
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a value.
+
+        Args:
+            key (str): The cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every value."""
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """Persistent cache storing one JSON file per entry.
+
+    Entries survive restarts. When the directory grows beyond `max_bytes`
+    the least recently written entries are removed first.
+
+    Args:
+        directory (str | Path): The cache directory.
+        max_bytes (int): The maximum total size of the cached files.
+        ttl (float | None): The default time to live of an entry in seconds. None means no expiry.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: float | None = None,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._sizes: OrderedDict[str, int] | None = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _index(self) -> OrderedDict[str, int]:
+        if self._sizes is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime
+            )
+            self._sizes = OrderedDict(
+                (path.stem, path.stat().st_size) for path in files
+            )
+        return self._sizes
+
+    def get(self, key: str) -> Any | None:  # noqa: ANN401
+        """Return a cached value, or None if it is missing or expired.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Any | None: The cached value.
+        """
+        entry = self.get_with_expiry(key)
+        return None if entry is None else entry[1]
+
+    def get_with_expiry(self, key: str) -> tuple[float | None, Any] | None:
+        """Return a cached value with its expiry time.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            tuple[float | None, Any] | None: The expiry timestamp (None if it never expires) and the value, or None if it is missing or expired.
+        """  # noqa: E501
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return expires_at, entry.get("value")
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:  # noqa: ANN401
+        """Store a value.
+
+        Args:
+            key (str): The cache key.
+            value (Any): The JSON serializable value to store.
+            ttl (float | None): The time to live in seconds. Defaults to the cache TTL.
+        """  # noqa: E501
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.time() + ttl
+        data = json.dumps({"expires_at": expires_at, "value": value})
+        with self._lock:
+            sizes = self._index()
+            path = self._path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(data, encoding="utf-8")
+            tmp_path.replace(path)
+            sizes.pop(key, None)
+            sizes[key] = path.stat().st_size
+            total = sum(sizes.values())
+            while total > self.max_bytes and len(sizes) > 1:
+                oldest, size = sizes.popitem(last=False)
+                self._path(oldest).unlink(missing_ok=True)
+                total -= size
+
+    def delete(self, key: str) -> None:
+        """Remove a value.
+
+        Args:
+            key (str): The cache key.
+        """
+        with self._lock:
+            self._index().pop(key, None)
+            self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove every value."""
+        with self._lock:
+            for key in self._index():
+                self._path(key).unlink(missing_ok=True)
+            self._index().clear()
+
+
+class TieredCache:
+    """An in-memory LRU tier in front of an optional on-disk tier.
+
+    Reads try the memory tier first and promote disk hits into memory.
+    Writes go to both tiers.
+
+    Args:
+        memory (MemoryCache): The in-memory tier.
+        disk (DiskCache | None): The on-disk tier.
+    """
+
+    def __init__(self, memory: MemoryCache, disk: DiskCache | None = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str) -> Any | None:  # noqa: ANN401
+        """Return a cached value, or None if it is missing or expired.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Any | None: The cached value.
+        """
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+        entry = self.disk.get_with_expiry(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        ttl = None if expires_at is None else expires_at - time.time()
+        self.memory.set(key, value, ttl)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:  # noqa: ANN401
+        """Store a value in every tier.
+
+        Args:
+            key (str): The cache key.
+            value (Any): The JSON serializable value to store.
+            ttl (float | None): The time to live in seconds. Defaults to the TTL of each tier.
+        """  # noqa: E501
+        self.memory.set(key, value, ttl)
+        if self.disk is not None:
+            self.disk.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove a value from every tier.
+
+        Args:
+            key (str): The cache key.
+        """
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        """Remove every value from every tier."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
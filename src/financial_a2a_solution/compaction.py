@@ -0,0 +1,140 @@
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TypeVar
+
+from pydantic import BaseModel
+
+from financial_a2a_solution.constant import (
+    PROMPT_HISTORY_BUDGET,
+    PROMPT_HISTORY_KEEP_LATEST,
+    PROMPT_HISTORY_MIN_CHARS,
+)
+from financial_a2a_solution.types import AgentAnswer, CalledTool
+
+
+logger = logging.getLogger(__name__)
+
+Entry = TypeVar("Entry", bound=BaseModel)
+
+
+@dataclass
+class CompactionReport:
+    """How much a history was compacted.
+
+    Args:
+        original_chars (int): The size of the history before compaction.
+        compacted_chars (int): The size of the history after compaction.
+        compacted_entries (int): The number of entries that were shortened.
+    """
+
+    original_chars: int
+    compacted_chars: int
+    compacted_entries: int
+
+    @property
+    def saved_chars(self) -> int:
+        """The number of characters removed from the history."""
+        return self.original_chars - self.compacted_chars
+
+
+class HistoryCompactor:
+    """Keep the histories embedded in prompts within a size budget.
+
+    Only the bulky field of each entry counts towards the budget: the tool
+    result or the agent answer. When a history is over budget, older entries
+    are truncated to `min_chars`, oldest first, and if that is not enough
+    they are reduced to a placeholder. The latest `keep_latest` entries are
+    never touched, so the results the LLM has just asked for stay intact.
+
+    Args:
+        budget (int): The maximum combined size of the entries in characters.
+        keep_latest (int): The number of most recent entries kept verbatim.
+        min_chars (int): The number of leading characters kept when an entry is truncated.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        budget: int = PROMPT_HISTORY_BUDGET,
+        keep_latest: int = PROMPT_HISTORY_KEEP_LATEST,
+        min_chars: int = PROMPT_HISTORY_MIN_CHARS,
+    ):
+        self.budget = budget
+        self.keep_latest = keep_latest
+        self.min_chars = min_chars
+
+    def compact_tools(
+        self, called_tools: Sequence[CalledTool]
+    ) -> tuple[list[CalledTool], CompactionReport]:
+        """Compact a tool call history.
+
+        Args:
+            called_tools (Sequence[CalledTool]): The tools called so far, oldest first.
+
+        Returns:
+            tuple[list[CalledTool], CompactionReport]: The compacted history and the compaction report.
+        """  # noqa: E501
+        return self._compact(called_tools, "result")
+
+    def compact_answers(
+        self, agent_answers: Sequence[AgentAnswer]
+    ) -> tuple[list[AgentAnswer], CompactionReport]:
+        """Compact an agent answer history.
+
+        Args:
+            agent_answers (Sequence[AgentAnswer]): The agent answers so far, oldest first.
+
+        Returns:
+            tuple[list[AgentAnswer], CompactionReport]: The compacted history and the compaction report.
+        """  # noqa: E501
+        return self._compact(agent_answers, "answer")
+
+    def _compact(
+        self, entries: Sequence[Entry], field: str
+    ) -> tuple[list[Entry], CompactionReport]:
+        values: list[str] = [getattr(entry, field) for entry in entries]
+        original = total = sum(len(value) for value in values)
+        compacted: set[int] = set()
+        older = range(max(len(values) - self.keep_latest, 0))
+
+        # First shorten the older entries to their head, then drop what is
+        # left of them, oldest first, until the history fits the budget.
+        for limit in (self.min_chars, 0):
+            for index in older:
+                if total <= self.budget:
+                    break
+                shortened = self._truncate(
+                    getattr(entries[index], field), limit
+                )
+                if len(shortened) >= len(values[index]):
+                    continue
+                total += len(shortened) - len(values[index])
+                values[index] = shortened
+                compacted.add(index)
+
+        report = CompactionReport(
+            original_chars=original,
+            compacted_chars=total,
+            compacted_entries=len(compacted),
+        )
+        if compacted:
+            logger.debug(
+                "Compacted %d %s entries, saved %d of %d characters",
+                report.compacted_entries,
+                field,
+                report.saved_chars,
+                report.original_chars,
+            )
+        return [
+            entry.model_copy(update={field: value})
+            if index in compacted
+            else entry
+            for index, (entry, value) in enumerate(
+                zip(entries, values, strict=True)
+            )
+        ], report
+
+    @staticmethod
+    def _truncate(value: str, limit: int) -> str:
+        omitted = len(value) - limit
+        return f"{value[:limit]}\n... [{omitted} characters omitted]"
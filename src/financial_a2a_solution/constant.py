@@ -0,0 +1,53 @@
+import json
+import os
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER") or "gemini"
+LLM_MODEL = os.getenv("LLM_MODEL") or "gemini-1.5-flash"
+LLM_CACHE = (os.getenv("LLM_CACHE") or "false").lower() in {"1", "true", "yes"}
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL") or 3600)
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES") or 1024)
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR") or None
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES") or 256 * 1024 * 1024)
+PROMPT_HISTORY_BUDGET = int(os.getenv("PROMPT_HISTORY_BUDGET") or 16000)
+PROMPT_HISTORY_KEEP_LATEST = int(os.getenv("PROMPT_HISTORY_KEEP_LATEST") or 2)
+PROMPT_HISTORY_MIN_CHARS = int(os.getenv("PROMPT_HISTORY_MIN_CHARS") or 200)
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE") or 4)
+MCP_POOL_IDLE_TIMEOUT = float(os.getenv("MCP_POOL_IDLE_TIMEOUT") or 300)
+MCP_HEALTH_CHECK_INTERVAL = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL") or 30)
+MCP_HEALTH_CHECK_TIMEOUT = float(os.getenv("MCP_HEALTH_CHECK_TIMEOUT") or 5)
+MCP_READ_TIMEOUT = float(os.getenv("MCP_READ_TIMEOUT") or 120)
+MCP_TOOLS_TTL = float(os.getenv("MCP_TOOLS_TTL") or 600)
+MCP_TOOL_CACHE = (os.getenv("MCP_TOOL_CACHE") or "false").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+MCP_TOOL_CACHE_TTL = float(os.getenv("MCP_TOOL_CACHE_TTL") or 3600)
+# JSON object mapping tool names to their TTL in seconds, e.g.
+# '{"get_financial_statement": 86400}'.
+MCP_TOOL_CACHE_TTLS: dict[str, float] = json.loads(
+    os.getenv("MCP_TOOL_CACHE_TTLS") or "{}"
+)
+# Comma separated tool name patterns, e.g. "get_*,back_test_*". When the
+# allow list is empty every tool not in the deny list is cached.
+MCP_TOOL_CACHE_ALLOW = [
+    pattern.strip()
+    for pattern in (os.getenv("MCP_TOOL_CACHE_ALLOW") or "").split(",")
+    if pattern.strip()
+]
+MCP_TOOL_CACHE_DENY = [
+    pattern.strip()
+    for pattern in (os.getenv("MCP_TOOL_CACHE_DENY") or "").split(",")
+    if pattern.strip()
+]
+MCP_TOOL_CACHE_MAX_ENTRIES = int(
+    os.getenv("MCP_TOOL_CACHE_MAX_ENTRIES") or 1024
+)
+MCP_TOOL_CACHE_DIR = os.getenv("MCP_TOOL_CACHE_DIR") or None
+MCP_MAX_CONCURRENCY = int(os.getenv("MCP_MAX_CONCURRENCY") or 16)
+MCP_MAX_CONCURRENCY_PER_SERVER = int(
+    os.getenv("MCP_MAX_CONCURRENCY_PER_SERVER") or MCP_POOL_SIZE
+)
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR") or None
+ARTIFACT_THRESHOLD = int(os.getenv("ARTIFACT_THRESHOLD") or 8000)
+ARTIFACT_SUMMARY_CHARS = int(os.getenv("ARTIFACT_SUMMARY_CHARS") or 1000)
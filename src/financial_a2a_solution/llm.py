@@ -0,0 +1,211 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, Callable, Mapping, Sequence
+
+import google.generativeai as genai
+
+from financial_a2a_solution.cache import (
+    DiskCache,
+    MemoryCache,
+    TieredCache,
+    make_key,
+)
+from financial_a2a_solution.constant import (
+    LLM_CACHE,
+    LLM_CACHE_DIR,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL,
+    LLM_MODEL,
+    LLM_PROVIDER,
+)
+
+
+class LLMProvider(ABC):
+    """Async streaming interface shared by every agent to talk to an LLM."""
+
+    model_name: str
+
+    @abstractmethod
+    def stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Stream the LLM response to a prompt.
+
+        Args:
+            prompt (str): The prompt to send to the LLM.
+
+        Returns:
+            AsyncGenerator[str, None]: The chunks of the LLM response.
+        """
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini provider.
+
+    The API is configured and the `GenerativeModel` is built once, on first
+    use, and the response is streamed with the async client so a generation
+    never blocks the event loop.
+    """
+
+    def __init__(self, model_name: str = LLM_MODEL, api_key: str | None = None):
+        self.model_name = model_name
+        self.api_key = api_key
+        self._model: genai.GenerativeModel | None = None
+
+    @property
+    def model(self) -> genai.GenerativeModel:
+        """The cached Gemini model client."""
+        if self._model is None:
+            # Falls back to the GEMINI_API_KEY / GOOGLE_API_KEY env variables.
+            genai.configure(api_key=self.api_key)
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    async def stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            yield chunk.text
+
+
+class FakeProvider(LLMProvider):
+    """Deterministic local provider for tests and offline runs.
+
+    Args:
+        responses (Sequence[str] | Mapping[str, str] | Callable[[str], str] | None): What to answer. A sequence is replayed in order (the last item is repeated once it is exhausted), a mapping answers with the value of the first key found in the prompt, and a callable is called with the prompt. Defaults to a plain answer with no tool or agent selection.
+        chunk_size (int): The number of characters per streamed chunk.
+        delay (float): Seconds to wait before each chunk, to mimic a network.
+    """  # noqa: E501
+
+    DEFAULT_RESPONSE = "<answer>\nThis is a fake answer.\n</answer>\n"
+
+    def __init__(
+        self,
+        responses: Sequence[str]
+        | Mapping[str, str]
+        | Callable[[str], str]
+        | None = None,
+        chunk_size: int = 16,
+        delay: float = 0.0,
+    ):
+        self.model_name = "fake"
+        self.responses = responses
+        self.chunk_size = chunk_size
+        self.delay = delay
+        self.prompts: list[str] = []
+
+    def respond(self, prompt: str) -> str:
+        """Return the full response to a prompt.
+
+        Args:
+            prompt (str): The prompt.
+
+        Returns:
+            str: The response.
+        """
+        index = len(self.prompts)
+        self.prompts.append(prompt)
+        if self.responses is None:
+            return self.DEFAULT_RESPONSE
+        if callable(self.responses):
+            return self.responses(prompt)
+        if isinstance(self.responses, Mapping):
+            for key, response in self.responses.items():
+                if key in prompt:
+                    return response
+            return self.DEFAULT_RESPONSE
+        if not self.responses:
+            return self.DEFAULT_RESPONSE
+        return self.responses[min(index, len(self.responses) - 1)]
+
+    async def stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        response = self.respond(prompt)
+        for start in range(0, len(response), self.chunk_size):
+            await asyncio.sleep(self.delay)
+            yield response[start : start + self.chunk_size]
+
+
+class CachedProvider(LLMProvider):
+    """Serve repeated prompts from a response cache.
+
+    Responses are keyed on a hash of the model name and the rendered prompt.
+    A hit is replayed as a stream without calling the wrapped provider; a
+    miss is streamed through and stored once it has completed.
+
+    Args:
+        provider (LLMProvider): The provider to call on a cache miss.
+        cache (TieredCache): The response cache.
+        chunk_size (int): The number of characters per replayed chunk.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        cache: TieredCache,
+        chunk_size: int = 256,
+    ):
+        self.provider = provider
+        self.model_name = provider.model_name
+        self.cache = cache
+        self.chunk_size = chunk_size
+
+    async def stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        key = make_key(self.model_name, prompt)
+        response = await asyncio.to_thread(self.cache.get, key)
+        if response is not None:
+            for start in range(0, len(response), self.chunk_size):
+                yield response[start : start + self.chunk_size]
+            return
+
+        chunks: list[str] = []
+        async for chunk in self.provider.stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+        await asyncio.to_thread(self.cache.set, key, "".join(chunks))
+
+
+def get_llm_cache() -> TieredCache:
+    """Build the LLM response cache from the `LLM_CACHE_*` env variables.
+
+    Returns:
+        TieredCache: An in-memory LRU tier, backed by a disk tier when `LLM_CACHE_DIR` is set.
+    """  # noqa: E501
+    disk = None
+    if LLM_CACHE_DIR:
+        disk = DiskCache(
+            LLM_CACHE_DIR, max_bytes=LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL
+        )
+    return TieredCache(
+        MemoryCache(max_entries=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL), disk
+    )
+
+
+_providers: dict[tuple[str, str, bool], LLMProvider] = {}
+
+
+def get_llm_provider(
+    name: str = LLM_PROVIDER,
+    model_name: str = LLM_MODEL,
+    cache: bool = LLM_CACHE,
+) -> LLMProvider:
+    """Return the process-wide LLM provider.
+
+    Args:
+        name (str): The provider, "gemini" or "fake". Defaults to the `LLM_PROVIDER` env variable.
+        model_name (str): The model to use. Defaults to the `LLM_MODEL` env variable.
+        cache (bool): Whether responses are cached. Defaults to the `LLM_CACHE` env variable.
+
+    Returns:
+        LLMProvider: The provider, shared by every agent in the process.
+    """  # noqa: E501
+    key = (name, model_name, cache)
+    if key not in _providers:
+        provider: LLMProvider
+        if name == "gemini":
+            provider = GeminiProvider(model_name)
+        elif name == "fake":
+            provider = FakeProvider()
+        else:
+            raise ValueError(f"Unknown LLM provider: {name}")
+        if cache:
+            provider = CachedProvider(provider, get_llm_cache())
+        _providers[key] = provider
+    return _providers[key]
@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from mcp.types import CallToolResult, TextContent
+
+from financial_a2a_solution.scheduler import ToolScheduler
+from financial_a2a_solution.the_solution import prompts  # type: ignore
+from financial_a2a_solution.types import Tool
+
+
+logger = logging.getLogger(__name__)
+
+LOCAL_SERVER = "local"
+"""The server name local tool calls are scheduled under."""
+
+
+@dataclass
+class LocalTool:
+    """An in-process tool.
+
+    Args:
+        tool (Tool): The description of the tool shown to the LLM.
+        function (Callable[..., Any]): Called with the arguments of the tool. Blocking functions run in a worker thread.
+    """  # noqa: E501
+
+    tool: Tool
+    function: Callable[..., Any]
+
+
+class LocalToolbox:
+    """Tools running in the agent process, offered next to the MCP tools.
+
+    A local tool is selected by the LLM like any MCP tool, but its call
+    skips the MCP transport. Calls are bounded by the shared
+    `ToolScheduler` like the MCP calls, and an exception raised by a tool
+    is returned as an error result.
+    """
+
+    def __init__(self):
+        self._tools: dict[str, LocalTool] = {}
+        self._prompt: str | None = None
+
+    def add(
+        self,
+        function: Callable[..., Any],
+        input_schema: dict[str, Any],
+        *,
+        name: str | None = None,
+        description: str | None = None,
+    ) -> None:
+        """Register a tool.
+
+        Args:
+            function (Callable[..., Any]): The tool, returning its result as text.
+            input_schema (dict[str, Any]): The JSON schema of the arguments.
+            name (str | None): The tool name. Defaults to the function name.
+            description (str | None): The tool description. Defaults to the function docstring.
+        """  # noqa: E501
+        name = name or function.__name__
+        tool = Tool(
+            name=name,
+            description=description or inspect.getdoc(function) or "",
+            inputSchema=json.dumps(input_schema),
+        )
+        self._tools[name] = LocalTool(tool, function)
+        self._prompt = None
+
+    def __contains__(self, name: str) -> bool:
+        """Whether a tool is registered under a name."""
+        return name in self._tools
+
+    @property
+    def tools(self) -> list[Tool]:
+        """The registered tools."""
+        return [local.tool for local in self._tools.values()]
+
+    def get_prompt(self) -> str:
+        """Return the rendered prompt describing the tools.
+
+        Returns:
+            str: The tool prompt, empty if no tool is registered.
+        """
+        if self._prompt is None:
+            self._prompt = (
+                prompts.get_tools_prompt(self.tools) if self._tools else ""
+            )
+        return self._prompt
+
+    async def call(
+        self, name: str, arguments: dict[str, Any] | None = None
+    ) -> CallToolResult:
+        """Call a tool.
+
+        Args:
+            name (str): The tool name.
+            arguments (dict[str, Any] | None): The arguments of the tool.
+
+        Returns:
+            CallToolResult: The result of the tool, or an error result if the tool is unknown or failed.
+        """  # noqa: E501
+        local = self._tools.get(name)
+        if local is None:
+            return error_result(f"Unknown tool: {name}")
+        try:
+            async with ToolScheduler.shared().slot(LOCAL_SERVER):
+                if inspect.iscoroutinefunction(local.function):
+                    text = await local.function(**(arguments or {}))
+                else:
+                    text = await asyncio.to_thread(
+                        local.function, **(arguments or {})
+                    )
+        except Exception as e:
+            logger.debug("Local tool %s failed", name, exc_info=True)
+            return error_result(f"{type(e).__name__}: {e}")
+        return CallToolResult(content=[TextContent(type="text", text=text)])
+
+
+def error_result(message: str) -> CallToolResult:
+    """Build the result of a failed tool call.
+
+    Args:
+        message (str): What went wrong.
+
+    Returns:
+        CallToolResult: The error result.
+    """
+    return CallToolResult(
+        content=[TextContent(type="text", text=message)], isError=True
+    )
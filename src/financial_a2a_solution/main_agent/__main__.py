@@ -6,6 +6,7 @@ import colorama
 from dotenv import load_dotenv
 
 from financial_a2a_solution.main_agent.agent import Agent
+from financial_a2a_solution.main_agent.pacing import OutputPacer
 
 
 @click.command()
@@ -18,11 +19,18 @@ from financial_a2a_solution.main_agent.agent import Agent
 @click.option("--mode", "mode", default="streaming")
 @click.option("--question", "question", required=True)
 @click.option("--env-file", "env_file", default=".env")
+@click.option(
+    "--fan-out-mode",
+    "fan_out_mode",
+    default="ordered",
+    type=click.Choice(["ordered", "interleaved"]),
+)
 async def a_main(
     host: list[str],
     mode: Literal["completion", "streaming"],
     question: str,
     env_file: str,
+    fan_out_mode: Literal["ordered", "interleaved"],
 ):
     """Main function to run the A2A Repo Agent client.
 
@@ -31,6 +39,7 @@ async def a_main(
         port (int): The port number to run the server on.
         mode (Literal['completion', 'streaming']): The mode to run the server on.
         question (str): The question to ask the Agent.
+        fan_out_mode (Literal['ordered', 'interleaved']): How the output of concurrently called agents is merged.
     """  # noqa: E501
     load_dotenv(env_file)
     agent = Agent(
@@ -38,15 +47,22 @@ async def a_main(
         token_stream_callback=None,
         agent_urls=host,
         agent_prompt="Act as a financial expert and answer the question in a formal, robust and convincing tone.",  # noqa: E501
+        fan_out_mode=fan_out_mode,
+        pacer=OutputPacer(mode="none"),
     )
 
-    async for chunk in agent.stream(question):
-        if chunk.startswith('<agent name="'):
-            print(cast(str, colorama.Fore.CYAN) + chunk, end="", flush=True)
-        elif chunk.startswith("</agent>"):
-            print(cast(str, colorama.Fore.RESET) + chunk, end="", flush=True)
-        else:
-            print(chunk, end="", flush=True)
+    try:
+        async for chunk in agent.stream(question):
+            if chunk.startswith('<agent name="'):
+                print(cast(str, colorama.Fore.CYAN) + chunk, end="", flush=True)
+            elif chunk.startswith("</agent>"):
+                print(
+                    cast(str, colorama.Fore.RESET) + chunk, end="", flush=True
+                )
+            else:
+                print(chunk, end="", flush=True)
+    finally:
+        await agent.close()
 
 
 def main() -> None:
@@ -1,13 +1,9 @@
 import asyncio
-import json
 import re
-from collections.abc import AsyncGenerator, Callable, Generator
+from collections.abc import AsyncGenerator, Callable
 from typing import Literal
 from uuid import uuid4
 
-import google.generativeai as genai
-import httpx
-from a2a.client import A2ACardResolver, A2AClient
 from a2a.types import (
     AgentCard,
     Message,
@@ -16,87 +12,103 @@ from a2a.types import (
     Role,
     SendStreamingMessageRequest,
     SendStreamingMessageSuccessResponse,
+    TaskState,
     TaskStatusUpdateEvent,
     TextPart,
 )
 from a2a.client.errors import A2AClientHTTPError
 
 
+from financial_a2a_solution.compaction import HistoryCompactor
+from financial_a2a_solution.llm import LLMProvider, get_llm_provider
+from financial_a2a_solution.main_agent.answer_cache import AgentAnswerCache
 from financial_a2a_solution.main_agent.constant import (
-    GOOGLE_API_KEY,
+    AGENT_ANSWER_CACHE,
+    AGENT_FAN_OUT_MODE,
+    AGENT_SPECULATIVE_DISPATCH,
     MAX_AGENTS_CALLS,
 )
-from financial_a2a_solution.the_solution import prompts
+from financial_a2a_solution.main_agent.client_pool import A2AClientPool
+from financial_a2a_solution.main_agent.multiplex import (
+    FanOutMode,
+    Prefetched,
+    multiplex,
+)
+from financial_a2a_solution.main_agent.pacing import OutputPacer
+from financial_a2a_solution.main_agent.registry import AgentRegistry
+from financial_a2a_solution.the_solution import prompts, utils
 from financial_a2a_solution.types import AgentAnswer
 
 
-def stream_llm(prompt: str) -> Generator[str]:
-    """Stream LLM response.
-
-    Args:
-        prompt (str): The prompt to send to the LLM.
-
-    Returns:
-        Generator[str, None, None]: A generator of the LLM response.
-    """
-    genai.configure(api_key=GOOGLE_API_KEY)
-    model = genai.GenerativeModel("gemini-1.5-flash")
-    for chunk in model.generate_content(prompt, stream=True):
-        yield chunk.text
-
-
 class Agent:
     """Agent for interacting with the Google Gemini LLM in different modes."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         mode: Literal["complete", "stream"] = "stream",
         token_stream_callback: Callable[[str], None] | None = None,
         agent_urls: list[str] | None = None,
         agent_prompt: str | None = None,
+        *,
+        registry: AgentRegistry | None = None,
+        client_pool: A2AClientPool | None = None,
+        fan_out_mode: FanOutMode = AGENT_FAN_OUT_MODE,
+        pacer: OutputPacer | None = None,
+        llm: LLMProvider | None = None,
+        speculative_dispatch: bool = AGENT_SPECULATIVE_DISPATCH,
+        answer_cache: AgentAnswerCache | None = None,
+        compactor: HistoryCompactor | None = None,
     ):
         self.mode = mode
         self.token_stream_callback = token_stream_callback
         self.agent_urls = agent_urls
-        self.agents_registry: dict[str, AgentCard] = {}
+        # The shared registry is stopped on close. Another agent using it
+        # restarts its refresh on the next `get`.
+        self._owns_registry = registry is None
+        self.registry = registry or AgentRegistry.shared(agent_urls)
+        self.client_pool = client_pool or A2AClientPool()
+        self.fan_out_mode = fan_out_mode
+        self.pacer = pacer or OutputPacer()
+        self.llm = llm or get_llm_provider()
+        self.speculative_dispatch = speculative_dispatch
+        if answer_cache is None and AGENT_ANSWER_CACHE:
+            answer_cache = AgentAnswerCache()
+        self.answer_cache = answer_cache
+        self.compactor = compactor or HistoryCompactor()
         self.agent_prompt = agent_prompt
 
+    async def close(self) -> None:
+        """Close the pooled connections to the sub-agents.
+
+        The background refresh of the agent registry is also stopped, unless
+        the registry was passed in by the caller.
+        """
+        await self.client_pool.close()
+        if self._owns_registry:
+            await self.registry.close()
+
     async def get_agents(self) -> tuple[dict[str, AgentCard], str]:
-        """Retrieve agent cards from all agent URLs and render the agent prompt.
+        """Retrieve agent cards from the registry and the rendered agent prompt.
+
+        The cards are resolved once and then kept fresh in the background by
+        the shared `AgentRegistry`, so this does not hit the network per call.
 
         Returns:
             tuple[dict[str, AgentCard], str]: A dictionary mapping agent names to AgentCard objects, and the rendered agent prompt string.
         """  # noqa: E501
-        async with httpx.AsyncClient() as httpx_client:
-            if self.agent_urls:
-                card_resolvers = [
-                    A2ACardResolver(httpx_client, url)
-                    for url in self.agent_urls
-                ]
-            else:
-                card_resolvers = []
-            agent_cards = await asyncio.gather(
-                *[
-                    card_resolver.get_agent_card()
-                    for card_resolver in card_resolvers
-                ]
-            )
-            agents_registry = {
-                agent_card.name: agent_card for agent_card in agent_cards
-            }
-            agent_prompt = prompts.get_available_agents_prompt(agent_cards)
-            return agents_registry, agent_prompt
+        return await self.registry.get()
 
-    def call_llm(self, prompt: str) -> Generator[str, None]:
-        """Call the LLM with the given prompt and return the response as a string or generator.
+    async def call_llm(self, prompt: str) -> AsyncGenerator[str, None]:
+        """Call the LLM with the given prompt and stream the response.
 
         Args:
             prompt (str): The prompt to send to the LLM.
 
-        Returns:
-            str or Generator[str]: The LLM response as a string or generator, depending on mode.
-        """  # noqa: E501
-        yield from stream_llm(prompt)
+        Yields:
+            str: The chunks of the LLM response.
+        """
+        async for chunk in self.llm.stream(prompt):
+            yield chunk
 
     async def decide(
         self,
@@ -112,11 +124,12 @@ class Agent:
             called_agents (list[dict] | None): Previously called agents and their answers.
 
         Returns:
-            Generator[str, None]: The LLM's response as a generator of strings.
+            AsyncGenerator[str, None]: The LLM's response as a generator of strings.
         """  # noqa: E501
         if called_agents:
-            call_agent_prompt = prompts.get_agent_answer_prompt(
-                py_called_agents=called_agents
+            called_agents, _ = self.compactor.compact_answers(called_agents)
+            call_agent_prompt = await asyncio.to_thread(
+                prompts.get_agent_answer_prompt, called_agents
             )
         else:
             call_agent_prompt = ""
@@ -126,7 +139,7 @@ class Agent:
             call_agent_prompt=call_agent_prompt,
             tone=self.agent_prompt,
         )
-        for chunk in self.call_llm(prompt):
+        async for chunk in self.call_llm(prompt):
             yield chunk
 
     def extract_agents(self, response: str) -> list[dict]:
@@ -135,17 +148,17 @@ class Agent:
         Args:
             response (str): The response from the LLM.
         """
-        pattern = r"```json\n(.*?)\n```"
-        match = re.search(pattern, response, re.DOTALL)
-        if match:
-            return json.loads(match.group(1))
-        return []
+        return utils.extract_json_block(response, "selected_agents") or []
 
     async def send_message_to_an_agent(
         self, agent_card: AgentCard, message: str
     ):
         """Send a message to a specific agent and yield the streaming response.
 
+        When an answer cache is configured, a cached response is replayed
+        instead of calling the agent, and a response is stored only when
+        the task ends in the completed state.
+
         Args:
             agent_card (AgentCard): The agent to send the message to.
             message (str): The message to send.
@@ -153,36 +166,146 @@ class Agent:
         Yields:
             str: The streaming response from the agent.
         """
-        async with httpx.AsyncClient() as httpx_client:
-            client = A2AClient(httpx_client, agent_card=agent_card)
-            message_send_params = MessageSendParams(
-                message=Message(
-                    role=Role.user,
-                    parts=[Part(TextPart(text=message))],
-                    messageId=uuid4().hex,
-                    taskId=uuid4().hex,
+        if self.answer_cache is not None:
+            cached = await self.answer_cache.get(agent_card, message)
+            if cached is not None:
+                yield cached
+                return
+
+        client = self.client_pool.get_client(agent_card)
+        message_send_params = MessageSendParams(
+            message=Message(
+                role=Role.user,
+                parts=[Part(TextPart(text=message))],
+                messageId=uuid4().hex,
+                taskId=uuid4().hex,
+            )
+        )
+
+        streaming_request = SendStreamingMessageRequest(
+            params=message_send_params
+        )
+        response = ""
+        last_status: TaskStatusUpdateEvent | None = None
+        try:
+            async for chunk in client.send_message_streaming(streaming_request):
+                if not isinstance(
+                    chunk.root, SendStreamingMessageSuccessResponse
+                ):
+                    # An error response means the task did not complete.
+                    last_status = None
+                    continue
+                if isinstance(chunk.root.result, TaskStatusUpdateEvent):
+                    last_status = chunk.root.result
+                    result_status_message = chunk.root.result.status.message
+
+                    if result_status_message is not None:
+                        # Tool progress is relayed but not cached as answer.
+                        is_progress = bool(
+                            (result_status_message.metadata or {}).get(
+                                "progress"
+                            )
+                        )
+                        for part in result_status_message.parts:
+                            if isinstance(part.root, TextPart):
+                                if not is_progress:
+                                    response += part.root.text
+                                yield part.root.text
+        except A2AClientHTTPError as e:
+            yield f"\nClient connection error: {e}"
+            return
+        completed = (
+            last_status is not None
+            and last_status.final
+            and last_status.status.state == TaskState.completed
+        )
+        if self.answer_cache is not None and response and completed:
+            await self.answer_cache.set(agent_card, message, response)
+
+    def dispatch_agents(
+        self, agents: list[dict], agents_registry: dict[str, AgentCard]
+    ) -> list[Prefetched]:
+        """Start calling the agents in the background.
+
+        Args:
+            agents (list[dict]): The agents selected by the decide step.
+            agents_registry (dict[str, AgentCard]): The known agent cards.
+
+        Returns:
+            list[Prefetched]: The already running streams of the agents.
+        """
+        return [
+            Prefetched(
+                self.pacer.pace(
+                    self.send_message_to_an_agent(
+                        agents_registry[agent["name"]], agent["prompt"]
+                    )
                 )
             )
+            for agent in agents
+        ]
+
+    async def call_agents(
+        self,
+        agents: list[dict],
+        agents_registry: dict[str, AgentCard],
+        agent_answers: list[AgentAnswer],
+        dispatched: list[Prefetched] | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """Call the selected agents concurrently and stream their answers.
+
+        Each agent's output is framed in `<agent name="...">` tags. In the
+        "ordered" fan-out mode the agents are framed one after the other in
+        the order they were selected; in the "interleaved" mode chunks are
+        relayed as they arrive and the frame is reopened whenever the source
+        agent changes.
+
+        Args:
+            agents (list[dict]): The agents selected by the decide step.
+            agents_registry (dict[str, AgentCard]): The known agent cards.
+            agent_answers (list[AgentAnswer]): Extended with the answer of every agent once they have all completed.
+            dispatched (list[Prefetched] | None): Streams already started by `dispatch_agents`. The agents are dispatched here if not given.
+
+        Yields:
+            str: The framed streaming output of the agents.
+        """  # noqa: E501
+        if dispatched is None:
+            dispatched = self.dispatch_agents(agents, agents_registry)
+        agent_responses = [""] * len(agents)
+        current: int | None = None
+        try:
+            async for index, chunk in multiplex(
+                dispatched, mode=self.fan_out_mode
+            ):
+                if index != current:
+                    if current is not None:
+                        yield "</agent>\n"
+                    yield f'<agent name="{agents[index]["name"]}">\n'
+                    current = index
+                if chunk is None:
+                    yield "</agent>\n"
+                    current = None
+                    continue
+                agent_responses[index] += chunk
+                if self.token_stream_callback:
+                    self.token_stream_callback(chunk)
+                yield chunk
+        finally:
+            for stream in dispatched:
+                await stream.aclose()
 
-            streaming_request = SendStreamingMessageRequest(
-                params=message_send_params
+        for agent, agent_response in zip(agents, agent_responses, strict=True):
+            match = re.search(
+                r"<Answer>(.*?)</Answer>", agent_response, re.DOTALL
+            )
+            answer = match.group(1).strip() if match else agent_response
+            agent_answers.append(
+                AgentAnswer(
+                    name=agent["name"],
+                    prompt=agent["prompt"],
+                    answer=answer,
+                )
             )
-            try:
-                async for chunk in client.send_message_streaming(
-                    streaming_request
-                ):
-                    if isinstance(
-                        chunk.root, SendStreamingMessageSuccessResponse
-                    ) and isinstance(chunk.root.result, TaskStatusUpdateEvent):
-                        result_status_message = chunk.root.result.status.message
-
-                        if result_status_message is not None:
-                            for part in result_status_message.parts:
-                                if isinstance(part.root, TextPart):
-                                    await asyncio.sleep(0.1)
-                                    yield part.root.text
-            except A2AClientHTTPError as e:
-                yield f"\nClient connection error: {e}"
 
     async def stream(self, question: str):
         """Stream the process of answering a question, possibly involving multiple agents.
@@ -194,46 +317,48 @@ class Agent:
             str: Streaming output, including agent responses and intermediate steps.
         """  # noqa: E501
         agent_answers: list[AgentAnswer] = []
+        agents_registry, agent_prompt = await self.get_agents()
         for _ in range(MAX_AGENTS_CALLS):
-            agents_registry, agent_prompt = await self.get_agents()
             response = ""
-            yield "<main_agent>\n"
-            async for chunk in self.decide(
-                question, agent_prompt, agent_answers
-            ):
-                response += chunk
-                if self.token_stream_callback:
-                    self.token_stream_callback(chunk)
-                yield chunk
-            yield "</main_agent>\n"
-
-            agents = self.extract_agents(response)
-            if agents:
-                for agent in agents:
-                    agent_response = ""
-                    agent_card = agents_registry[agent["name"]]
-                    yield f'<agent name="{agent["name"]}">\n'
-                    async for chunk in self.send_message_to_an_agent(
-                        agent_card, agent["prompt"]
+            agents: list[dict] = []
+            dispatched: list[Prefetched] | None = None
+            try:
+                yield "<main_agent>\n"
+                async for chunk in self.decide(
+                    question, agent_prompt, agent_answers
+                ):
+                    response += chunk
+                    if self.token_stream_callback:
+                        self.token_stream_callback(chunk)
+                    yield chunk
+                    # Start the agents as soon as the selected agents block is
+                    # closed instead of waiting for the rest of the response.
+                    if (
+                        self.speculative_dispatch
+                        and dispatched is None
+                        and "`" in chunk
                     ):
-                        agent_response += chunk
-                        if self.token_stream_callback:
-                            self.token_stream_callback(chunk)
-                        yield chunk
-                    yield "</agent>\n"
-                    match = re.search(
-                        r"<Answer>(.*?)</Answer>", agent_response, re.DOTALL
-                    )
-                    answer = match.group(1).strip() if match else agent_response
-                    agent_answers.append(
-                        AgentAnswer(
-                            name=agent["name"],
-                            prompt=agent["prompt"],
-                            answer=answer,
-                        )
-                    )
-            else:
-                return
+                        try:
+                            agents = self.extract_agents(response)
+                        except ValueError:
+                            agents = []
+                        if agents:
+                            dispatched = self.dispatch_agents(
+                                agents, agents_registry
+                            )
+                yield "</main_agent>\n"
+
+                if dispatched is None:
+                    agents = self.extract_agents(response)
+                if not agents:
+                    return
+                async for chunk in self.call_agents(
+                    agents, agents_registry, agent_answers, dispatched
+                ):
+                    yield chunk
+            finally:
+                for stream in dispatched or []:
+                    await stream.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import asyncio
+
+from a2a.types import AgentCard
+
+from financial_a2a_solution.cache import (
+    DiskCache,
+    MemoryCache,
+    TieredCache,
+    make_key,
+)
+from financial_a2a_solution.main_agent.constant import (
+    AGENT_ANSWER_CACHE_DIR,
+    AGENT_ANSWER_CACHE_MAX_ENTRIES,
+    AGENT_ANSWER_CACHE_TTL,
+    AGENT_ANSWER_CACHE_TTLS,
+)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize a prompt so trivially different phrasings share an entry.
+
+    Args:
+        prompt (str): The prompt sent to the agent.
+
+    Returns:
+        str: The prompt with collapsed whitespace, case folded.
+    """
+    return " ".join(prompt.split()).casefold()
+
+
+class AgentAnswerCache:
+    """Cache of sub-agent responses.
+
+    Entries are keyed by the agent card name, the card version and the
+    normalized prompt, so publishing a new version of an agent invalidates
+    its answers. The full response of the agent is stored, which lets a hit
+    be replayed through the same stream framing as a live call.
+
+    Args:
+        ttl (float): The default time to live of an answer in seconds.
+        agent_ttls (dict[str, float] | None): Per-agent TTLs keyed by card name. A TTL of 0 disables caching for that agent.
+        cache (TieredCache | None): The backing store. Defaults to an in-memory LRU, backed by disk when `AGENT_ANSWER_CACHE_DIR` is set.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        ttl: float = AGENT_ANSWER_CACHE_TTL,
+        agent_ttls: dict[str, float] | None = None,
+        cache: TieredCache | None = None,
+    ):
+        self.ttl = ttl
+        self.agent_ttls = (
+            AGENT_ANSWER_CACHE_TTLS if agent_ttls is None else agent_ttls
+        )
+        if cache is None:
+            disk = None
+            if AGENT_ANSWER_CACHE_DIR:
+                disk = DiskCache(AGENT_ANSWER_CACHE_DIR)
+            cache = TieredCache(
+                MemoryCache(max_entries=AGENT_ANSWER_CACHE_MAX_ENTRIES), disk
+            )
+        self.cache = cache
+
+    def ttl_for(self, agent_card: AgentCard) -> float:
+        """Return the TTL of the answers of an agent.
+
+        Args:
+            agent_card (AgentCard): The agent card.
+
+        Returns:
+            float: The TTL in seconds.
+        """
+        return self.agent_ttls.get(agent_card.name, self.ttl)
+
+    def key(self, agent_card: AgentCard, prompt: str) -> str:
+        """Build the cache key of an agent answer.
+
+        Args:
+            agent_card (AgentCard): The agent card.
+            prompt (str): The prompt sent to the agent.
+
+        Returns:
+            str: The cache key.
+        """
+        return make_key(
+            agent_card.name, agent_card.version, normalize_prompt(prompt)
+        )
+
+    async def get(self, agent_card: AgentCard, prompt: str) -> str | None:
+        """Return the cached response of an agent to a prompt.
+
+        Args:
+            agent_card (AgentCard): The agent card.
+            prompt (str): The prompt sent to the agent.
+
+        Returns:
+            str | None: The cached response, or None on a miss.
+        """
+        if self.ttl_for(agent_card) <= 0:
+            return None
+        return await asyncio.to_thread(
+            self.cache.get, self.key(agent_card, prompt)
+        )
+
+    async def set(
+        self, agent_card: AgentCard, prompt: str, response: str
+    ) -> None:
+        """Store the response of an agent to a prompt.
+
+        Args:
+            agent_card (AgentCard): The agent card.
+            prompt (str): The prompt sent to the agent.
+            response (str): The full response of the agent.
+        """
+        ttl = self.ttl_for(agent_card)
+        if ttl <= 0:
+            return
+        await asyncio.to_thread(
+            self.cache.set, self.key(agent_card, prompt), response, ttl
+        )
@@ -0,0 +1,104 @@
+import asyncio
+import importlib.util
+
+import httpx
+from a2a.client import A2AClient
+from a2a.types import AgentCard
+
+from financial_a2a_solution.main_agent.constant import (
+    A2A_HTTP2,
+    A2A_KEEPALIVE_EXPIRY,
+    A2A_MAX_CONNECTIONS,
+    A2A_MAX_KEEPALIVE_CONNECTIONS,
+    A2A_TIMEOUT,
+)
+
+
+class A2AClientPool:
+    """Pool of long-lived A2A clients, one per agent endpoint.
+
+    Every endpoint gets its own `httpx.AsyncClient` so TCP/TLS connections
+    are kept alive and reused across messages, iterations and concurrent
+    questions instead of being re-established for every message.
+
+    The clients are bound to the event loop they were created on. If the
+    pool is used from another loop (e.g. a new `asyncio.run`), the stale
+    clients are dropped and new ones are created lazily.
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = A2A_MAX_CONNECTIONS,
+        max_keepalive_connections: int | None = A2A_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float | None = A2A_KEEPALIVE_EXPIRY,
+        http2: bool = A2A_HTTP2,
+        timeout: float | None = A2A_TIMEOUT,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            raise ImportError(
+                "HTTP/2 support requires the `h2` package. "
+                "Install it with `pip install httpx[http2]`."
+            )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.timeout = timeout
+        self.httpx_clients: dict[str, httpx.AsyncClient] = {}
+        self.a2a_clients: dict[str, A2AClient] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self.httpx_clients.clear()
+            self.a2a_clients.clear()
+            self._loop = loop
+
+    def get_httpx_client(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled HTTP client for an endpoint.
+
+        Args:
+            url (str): The endpoint URL.
+
+        Returns:
+            httpx.AsyncClient: The client shared by every call to the endpoint.
+        """
+        self._check_loop()
+        origin = str(httpx.URL(url).copy_with(path="/", query=None))
+        if origin not in self.httpx_clients:
+            self.httpx_clients[origin] = httpx.AsyncClient(
+                limits=self.limits,
+                http2=self.http2,
+                timeout=self.timeout,
+            )
+        return self.httpx_clients[origin]
+
+    def get_client(self, agent_card: AgentCard) -> A2AClient:
+        """Return the pooled A2A client for an agent.
+
+        Args:
+            agent_card (AgentCard): The agent to talk to.
+
+        Returns:
+            A2AClient: The client shared by every call to this agent.
+        """
+        self._check_loop()
+        if agent_card.url not in self.a2a_clients:
+            self.a2a_clients[agent_card.url] = A2AClient(
+                self.get_httpx_client(agent_card.url), agent_card=agent_card
+            )
+        return self.a2a_clients[agent_card.url]
+
+    async def close(self) -> None:
+        """Close every pooled client."""
+        httpx_clients = list(self.httpx_clients.values())
+        self.httpx_clients.clear()
+        self.a2a_clients.clear()
+        if self._loop is not asyncio.get_running_loop():
+            return
+        await asyncio.gather(
+            *[httpx_client.aclose() for httpx_client in httpx_clients]
+        )
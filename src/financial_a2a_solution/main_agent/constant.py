@@ -1,4 +1,41 @@
+import json
 import os
+from typing import Literal, cast
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 MAX_AGENTS_CALLS = int(os.getenv("MAX_AGENTS_CALLS") or 3)
+AGENT_REGISTRY_TTL = float(os.getenv("AGENT_REGISTRY_TTL") or 300)
+A2A_MAX_CONNECTIONS = int(os.getenv("A2A_MAX_CONNECTIONS") or 100)
+A2A_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("A2A_MAX_KEEPALIVE_CONNECTIONS") or 20
+)
+A2A_KEEPALIVE_EXPIRY = float(os.getenv("A2A_KEEPALIVE_EXPIRY") or 30)
+A2A_HTTP2 = (os.getenv("A2A_HTTP2") or "false").lower() in {"1", "true", "yes"}
+A2A_TIMEOUT = float(os.getenv("A2A_TIMEOUT") or 30)
+AGENT_FAN_OUT_MODE = cast(
+    Literal["ordered", "interleaved"],
+    os.getenv("AGENT_FAN_OUT_MODE") or "ordered",
+)
+OUTPUT_PACING_MODE = cast(
+    Literal["none", "coalesce"], os.getenv("OUTPUT_PACING_MODE") or "coalesce"
+)
+OUTPUT_FLUSH_INTERVAL = float(os.getenv("OUTPUT_FLUSH_INTERVAL") or 0.05)
+OUTPUT_MAX_BYTES = int(os.getenv("OUTPUT_MAX_BYTES") or 512)
+AGENT_SPECULATIVE_DISPATCH = (
+    os.getenv("AGENT_SPECULATIVE_DISPATCH") or "true"
+).lower() in {"1", "true", "yes"}
+AGENT_ANSWER_CACHE = (os.getenv("AGENT_ANSWER_CACHE") or "false").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+AGENT_ANSWER_CACHE_TTL = float(os.getenv("AGENT_ANSWER_CACHE_TTL") or 3600)
+# JSON object mapping agent card names to their TTL in seconds, e.g.
+# '{"Financial Balance Sheet Agent": 86400}'. A TTL of 0 disables caching.
+AGENT_ANSWER_CACHE_TTLS: dict[str, float] = json.loads(
+    os.getenv("AGENT_ANSWER_CACHE_TTLS") or "{}"
+)
+AGENT_ANSWER_CACHE_MAX_ENTRIES = int(
+    os.getenv("AGENT_ANSWER_CACHE_MAX_ENTRIES") or 1024
+)
+AGENT_ANSWER_CACHE_DIR = os.getenv("AGENT_ANSWER_CACHE_DIR") or None
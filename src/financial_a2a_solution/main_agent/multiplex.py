@@ -0,0 +1,107 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Sequence
+from typing import Literal
+
+
+FanOutMode = Literal["ordered", "interleaved"]
+
+
+async def multiplex(
+    streams: Sequence[AsyncIterator[str]],
+    mode: FanOutMode = "ordered",
+) -> AsyncGenerator[tuple[int, str | None], None]:
+    """Consume several streams concurrently and merge them into one.
+
+    Every stream is drained by its own task as soon as `multiplex` starts, so
+    the total time is bounded by the slowest stream rather than their sum.
+
+    Args:
+        streams (Sequence[AsyncIterator[str]]): The streams to consume.
+        mode (FanOutMode): "ordered" yields every chunk of stream 0, then of stream 1, and so on, buffering the streams that are ahead. "interleaved" yields chunks in arrival order.
+
+    Yields:
+        tuple[int, str | None]: The index of the stream and its next chunk. `None` marks the end of that stream.
+    """  # noqa: E501
+    queue: asyncio.Queue[tuple[int, str | BaseException | None]] = (
+        asyncio.Queue()
+    )
+
+    async def pump(index: int, stream: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in stream:
+                await queue.put((index, chunk))
+        except Exception as e:
+            await queue.put((index, e))
+        await queue.put((index, None))
+
+    tasks = [
+        asyncio.create_task(pump(index, stream))
+        for index, stream in enumerate(streams)
+    ]
+    buffers: list[deque[str | None]] = [deque() for _ in streams]
+    head = 0
+    try:
+        remaining = len(streams)
+        while remaining:
+            index, item = await queue.get()
+            if isinstance(item, BaseException):
+                raise item
+            if item is None:
+                remaining -= 1
+
+            if mode == "interleaved":
+                yield index, item
+                continue
+
+            buffers[index].append(item)
+            # Release everything the head stream has produced; once it ends,
+            # the next stream becomes the head and its backlog is released.
+            while head < len(streams) and buffers[head]:
+                chunk = buffers[head].popleft()
+                yield head, chunk
+                if chunk is None:
+                    head += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class Prefetched:
+    """An async stream that starts being consumed as soon as it is created.
+
+    The wrapped stream is drained by a background task into a buffer, so
+    work such as a sub-agent call can start before anyone iterates over it.
+    """
+
+    def __init__(self, stream: AsyncIterator[str]):
+        self._queue: asyncio.Queue[str | BaseException | None] = asyncio.Queue()
+        self._task = asyncio.create_task(self._pump(stream))
+
+    async def _pump(self, stream: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in stream:
+                self._queue.put_nowait(chunk)
+        except Exception as e:
+            self._queue.put_nowait(e)
+        self._queue.put_nowait(None)
+
+    def __aiter__(self) -> "Prefetched":
+        """Return the stream itself."""
+        return self
+
+    async def __anext__(self) -> str:
+        """Return the next buffered chunk, waiting for it if needed."""
+        item = await self._queue.get()
+        if item is None:
+            self._queue.put_nowait(None)
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def aclose(self) -> None:
+        """Stop consuming the wrapped stream."""
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
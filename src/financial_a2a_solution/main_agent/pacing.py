@@ -0,0 +1,91 @@
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+from typing import Literal
+
+from financial_a2a_solution.main_agent.constant import (
+    OUTPUT_FLUSH_INTERVAL,
+    OUTPUT_MAX_BYTES,
+    OUTPUT_PACING_MODE,
+)
+
+
+PacingMode = Literal["none", "coalesce"]
+
+
+class OutputPacer:
+    """Coalesce streamed text into fewer, larger chunks.
+
+    In "coalesce" mode chunks are buffered and flushed together when the
+    buffer reaches `max_bytes` or when `flush_interval` seconds have passed
+    since the first buffered chunk, whichever comes first. In "none" mode
+    chunks are passed through untouched with no added delay, which is what
+    machine consumers and the CLI want.
+    """
+
+    def __init__(
+        self,
+        mode: PacingMode = OUTPUT_PACING_MODE,
+        flush_interval: float = OUTPUT_FLUSH_INTERVAL,
+        max_bytes: int = OUTPUT_MAX_BYTES,
+    ):
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+
+    async def pace(
+        self, stream: AsyncIterator[str]
+    ) -> AsyncGenerator[str, None]:
+        """Relay a stream through the pacing stage.
+
+        Args:
+            stream (AsyncIterator[str]): The stream to relay.
+
+        Yields:
+            str: The coalesced chunks.
+        """
+        if self.mode == "none":
+            async for chunk in stream:
+                yield chunk
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[str | BaseException | None] = asyncio.Queue()
+
+        async def pump() -> None:
+            try:
+                async for chunk in stream:
+                    await queue.put(chunk)
+            except Exception as e:
+                await queue.put(e)
+            await queue.put(None)
+
+        task = asyncio.create_task(pump())
+        buffer: list[str] = []
+        size = 0
+        deadline = 0.0
+        try:
+            while True:
+                timeout = deadline - loop.time() if buffer else None
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=timeout)
+                except TimeoutError:
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+                    continue
+
+                if isinstance(item, BaseException):
+                    raise item
+                if item is None:
+                    break
+                if not buffer:
+                    deadline = loop.time() + self.flush_interval
+                buffer.append(item)
+                size += len(item.encode())
+                if size >= self.max_bytes:
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+            if buffer:
+                yield "".join(buffer)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,207 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import ClassVar
+
+import httpx
+from a2a.client.errors import A2AClientHTTPError, A2AClientJSONError
+from a2a.types import AgentCard
+
+from financial_a2a_solution.main_agent.constant import AGENT_REGISTRY_TTL
+from financial_a2a_solution.the_solution import prompts
+
+
+logger = logging.getLogger(__name__)
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+
+@dataclass
+class CardEntry:
+    """A resolved agent card and the validators used to revalidate it.
+
+    Args:
+        card (AgentCard): The resolved agent card.
+        etag (str | None): The `ETag` header returned by the agent, if any.
+        digest (str): Hash of the raw card body, used when there is no ETag.
+    """
+
+    card: AgentCard
+    etag: str | None
+    digest: str
+
+
+class AgentRegistry:
+    """Long-lived registry of agent cards and the rendered agent prompt.
+
+    The first call to `get` resolves every agent card. After that the cards
+    are served from memory and revalidated in the background every `ttl`
+    seconds with conditional requests, so card discovery is not part of the
+    per-question latency. The agent prompt is only re-rendered when the ETag
+    (or, for agents that do not send one, the body hash) of a card changes.
+    """
+
+    _shared: ClassVar[dict[tuple[str, ...], "AgentRegistry"]] = {}
+
+    def __init__(
+        self,
+        agent_urls: list[str] | tuple[str, ...] | None = None,
+        ttl: float = AGENT_REGISTRY_TTL,
+        agent_card_path: str = AGENT_CARD_PATH,
+    ):
+        self.agent_urls = tuple(url.rstrip("/") for url in agent_urls or ())
+        self.ttl = ttl
+        self.agent_card_path = agent_card_path
+        self.entries: dict[str, CardEntry] = {}
+        self.agents_registry: dict[str, AgentCard] = {}
+        self.agent_prompt: str | None = None
+        self.refreshed_at: float = 0.0
+        self._locks: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Lock
+        ] = weakref.WeakKeyDictionary()
+        self._refresh_task: asyncio.Task | None = None
+
+    @classmethod
+    def shared(
+        cls, agent_urls: list[str] | tuple[str, ...] | None
+    ) -> "AgentRegistry":
+        """Return the process-wide registry for the given agent URLs.
+
+        Args:
+            agent_urls (list[str] | tuple[str, ...] | None): The agent URLs.
+
+        Returns:
+            AgentRegistry: The registry shared by every caller using the same URLs.
+        """  # noqa: E501
+        key = tuple(url.rstrip("/") for url in agent_urls or ())
+        if key not in cls._shared:
+            cls._shared[key] = cls(key)
+        return cls._shared[key]
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if loop not in self._locks:
+            self._locks[loop] = asyncio.Lock()
+        return self._locks[loop]
+
+    async def get(self) -> tuple[dict[str, AgentCard], str]:
+        """Return the agent cards and the rendered agent prompt.
+
+        Only the very first call waits for the agent cards to be fetched.
+        Later calls return the cached values immediately and make sure the
+        background refresh is running on the current event loop.
+
+        Returns:
+            tuple[dict[str, AgentCard], str]: A dictionary mapping agent names to AgentCard objects, and the rendered agent prompt string.
+        """  # noqa: E501
+        if self.agent_prompt is None:
+            async with self._lock():
+                if self.agent_prompt is None:
+                    async with httpx.AsyncClient() as httpx_client:
+                        await self.refresh(httpx_client)
+        self.start()
+        return self.agents_registry, self.agent_prompt or ""
+
+    def start(self) -> None:
+        """Start the background refresh on the running event loop."""
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._refresh_task = loop.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        """Stop the background refresh."""
+        task, self._refresh_task = self._refresh_task, None
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def _refresh_loop(self) -> None:
+        async with httpx.AsyncClient() as httpx_client:
+            while True:
+                delay = max(
+                    self.ttl - (time.monotonic() - self.refreshed_at), 0.0
+                )
+                await asyncio.sleep(delay)
+                try:
+                    async with self._lock():
+                        await self.refresh(httpx_client)
+                except (A2AClientHTTPError, A2AClientJSONError) as e:
+                    # Keep serving the last known cards until the agent is back.
+                    logger.warning("Agent card refresh failed: %s", e)
+                    self.refreshed_at = time.monotonic()
+
+    async def refresh(self, httpx_client: httpx.AsyncClient) -> bool:
+        """Revalidate every agent card and re-render the prompt on change.
+
+        Args:
+            httpx_client (httpx.AsyncClient): The client used for the requests.
+
+        Returns:
+            bool: True if any agent card changed.
+        """
+        results = await asyncio.gather(
+            *[self._fetch_card(httpx_client, url) for url in self.agent_urls]
+        )
+        changed = self.agent_prompt is None
+        for url, entry in zip(self.agent_urls, results, strict=True):
+            if entry is None:
+                continue
+            previous = self.entries.get(url)
+            if previous is None or previous.digest != entry.digest:
+                changed = True
+            self.entries[url] = entry
+
+        if changed:
+            agent_cards = [
+                self.entries[url].card
+                for url in self.agent_urls
+                if url in self.entries
+            ]
+            self.agents_registry = {
+                agent_card.name: agent_card for agent_card in agent_cards
+            }
+            self.agent_prompt = prompts.get_available_agents_prompt(agent_cards)
+        self.refreshed_at = time.monotonic()
+        return changed
+
+    async def _fetch_card(
+        self, httpx_client: httpx.AsyncClient, url: str
+    ) -> CardEntry | None:
+        """Fetch an agent card, returning None when it has not changed."""
+        previous = self.entries.get(url)
+        headers = {}
+        if previous is not None and previous.etag:
+            headers["If-None-Match"] = previous.etag
+        try:
+            response = await httpx_client.get(
+                f"{url}/{self.agent_card_path.lstrip('/')}", headers=headers
+            )
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                return None
+            response.raise_for_status()
+            card = AgentCard.model_validate(response.json())
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except ValueError as e:
+            raise A2AClientJSONError(str(e)) from e
+        except httpx.RequestError as e:
+            raise A2AClientHTTPError(
+                503, f"Network communication error: {e}"
+            ) from e
+        return CardEntry(
+            card=card,
+            etag=response.headers.get("ETag"),
+            digest=hashlib.sha256(response.content).hexdigest(),
+        )
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import time
+import weakref
+from typing import ClassVar
+
+from financial_a2a_solution.constant import MCP_TOOLS_TTL
+from financial_a2a_solution.mcp_pool import MCPSessionPool
+from financial_a2a_solution.the_solution import prompts  # type: ignore
+from financial_a2a_solution.types import Tool
+
+
+class ToolCatalog:
+    """Memoized tool list and rendered tool prompt of an MCP server.
+
+    The tools are listed once and reused until the server sends a
+    `tools/list_changed` notification or `ttl` seconds have passed, so the
+    decide step of every iteration can go straight to the LLM.
+
+    Args:
+        pool (MCPSessionPool): The session pool of the MCP server.
+        ttl (float): Seconds after which the tools are listed again.
+    """
+
+    _catalogs: ClassVar[
+        weakref.WeakKeyDictionary[MCPSessionPool, "ToolCatalog"]
+    ] = weakref.WeakKeyDictionary()
+
+    def __init__(self, pool: MCPSessionPool, ttl: float = MCP_TOOLS_TTL):
+        self.pool = pool
+        self.ttl = ttl
+        self.tools: list[Tool] = []
+        self.prompt = ""
+        self._version: int | None = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def shared(
+        cls, url: str | None = None, cmd: list[str] | None = None
+    ) -> "ToolCatalog":
+        """Return the catalog of an MCP server shared by the event loop.
+
+        Args:
+            url (str | None): The URL of an SSE MCP server.
+            cmd (list[str] | None): The command starting a stdio MCP server.
+
+        Returns:
+            ToolCatalog: The shared catalog.
+        """
+        pool = MCPSessionPool.shared(url=url, cmd=cmd)
+        if pool not in cls._catalogs:
+            cls._catalogs[pool] = cls(pool)
+        return cls._catalogs[pool]
+
+    @property
+    def stale(self) -> bool:
+        """Whether the tools have to be listed again."""
+        return (
+            self._version != self.pool.tools_version
+            or time.monotonic() >= self._expires_at
+        )
+
+    def invalidate(self) -> None:
+        """Force the tools to be listed again on next use."""
+        self._version = None
+
+    async def get_tools(self) -> list[Tool]:
+        """Return the tools of the MCP server.
+
+        Returns:
+            list[Tool]: The tools.
+        """
+        await self._refresh()
+        return self.tools
+
+    async def get_prompt(self) -> str:
+        """Return the rendered prompt describing the tools.
+
+        Returns:
+            str: The tool prompt.
+        """
+        await self._refresh()
+        return self.prompt
+
+    async def _refresh(self) -> None:
+        if not self.stale:
+            return
+        async with self._lock:
+            if not self.stale:
+                return
+            # Read the version first so a change notified while listing
+            # triggers another refresh.
+            version = self.pool.tools_version
+            resources = await self.pool.list_tools()
+            self.tools = [
+                Tool(
+                    name=tool.name,
+                    description=tool.description,
+                    inputSchema=json.dumps(tool.inputSchema),
+                )
+                for tool in resources.tools
+            ]
+            self.prompt = prompts.get_tools_prompt(self.tools)
+            self._version = version
+            self._expires_at = time.monotonic() + self.ttl
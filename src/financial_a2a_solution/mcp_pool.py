@@ -0,0 +1,498 @@
+import asyncio
+import contextlib
+import logging
+import time
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import timedelta
+from typing import Any, ClassVar, TypeVar
+
+import anyio
+from anyio.streams.memory import (
+    MemoryObjectReceiveStream,
+    MemoryObjectSendStream,
+)
+from mcp.client.session import ClientSession, MessageHandlerFnT
+from mcp.client.sse import sse_client
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.shared.message import SessionMessage
+from mcp.shared.session import ProgressFnT, RequestResponder
+from mcp.types import (
+    CallToolResult,
+    ClientResult,
+    ListToolsResult,
+    ServerNotification,
+    ServerRequest,
+    ToolListChangedNotification,
+)
+
+from financial_a2a_solution.constant import (
+    MCP_HEALTH_CHECK_INTERVAL,
+    MCP_HEALTH_CHECK_TIMEOUT,
+    MCP_POOL_IDLE_TIMEOUT,
+    MCP_POOL_SIZE,
+    MCP_READ_TIMEOUT,
+)
+from financial_a2a_solution.scheduler import ToolScheduler
+from financial_a2a_solution.tool_cache import (
+    ToolResultCache,
+    get_tool_result_cache,
+)
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class MCPSessionError(RuntimeError):
+    """The connection to an MCP server was lost."""
+
+
+class PooledSession:
+    """A long-lived, initialized MCP client session.
+
+    The transport and the `ClientSession` are entered and exited by a
+    dedicated task, as required by their anyio task groups, while requests
+    are sent from the tasks borrowing the session.
+
+    Args:
+        url (str | None): The URL of an SSE MCP server.
+        cmd (list[str] | None): The command starting a stdio MCP server.
+        read_timeout (float | None): The timeout of a request in seconds.
+        message_handler (MessageHandlerFnT | None): Called with the requests and notifications sent by the server.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        url: str | None = None,
+        cmd: list[str] | None = None,
+        read_timeout: float | None = MCP_READ_TIMEOUT,
+        message_handler: MessageHandlerFnT | None = None,
+    ):
+        self.url = url
+        self.cmd = cmd
+        self.read_timeout = read_timeout
+        self.message_handler = message_handler
+        self.session: ClientSession | None = None
+        self.last_used = time.monotonic()
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def name(self) -> str:
+        """The URL or the command of the MCP server."""
+        return self.url or " ".join(self.cmd or [])
+
+    @property
+    def alive(self) -> bool:
+        """Whether the connection to the MCP server is still open."""
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self) -> None:
+        """Start the MCP server connection and initialize the session."""
+        ready: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._run(ready))
+        try:
+            await ready
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _run(self, ready: asyncio.Future[None]) -> None:
+        if self.url:
+            transport = sse_client(self.url)
+        else:
+            command, *args = self.cmd or [""]
+            transport = stdio_client(
+                StdioServerParameters(command=command, args=args)
+            )
+        read_timeout = (
+            timedelta(seconds=self.read_timeout) if self.read_timeout else None
+        )
+        relay_writer, relay_reader = anyio.create_memory_object_stream[
+            SessionMessage | Exception
+        ]()
+        try:
+            async with (
+                transport as (read, write),
+                relay_reader,
+                ClientSession(
+                    relay_reader,
+                    write,
+                    read_timeout_seconds=read_timeout,
+                    message_handler=self.message_handler,
+                ) as session,
+            ):
+                relay = asyncio.create_task(self._relay(read, relay_writer))
+                try:
+                    await session.initialize()
+                    self.session = session
+                    ready.set_result(None)
+                    await self._closing.wait()
+                finally:
+                    relay.cancel()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not self._closing.is_set():
+                logger.warning("MCP server %s stopped: %s", self.name, e)
+        finally:
+            if not ready.done():
+                ready.set_exception(
+                    MCPSessionError(f"MCP server {self.name} did not start")
+                )
+
+    async def _relay(
+        self,
+        read: MemoryObjectReceiveStream[SessionMessage | Exception],
+        writer: MemoryObjectSendStream[SessionMessage | Exception],
+    ) -> None:
+        # `ClientSession` never fails the requests in flight when the server
+        # goes away, so watch the incoming stream and stop the session when
+        # it ends.
+        async with writer:
+            async for message in read:
+                await writer.send(message)
+        if not self._closing.is_set():
+            logger.warning("MCP server %s disconnected", self.name)
+            self._closing.set()
+
+    async def request(self, call: Callable[[ClientSession], Awaitable[T]]) -> T:
+        """Send a request on the session.
+
+        Args:
+            call (Callable[[ClientSession], Awaitable[T]]): Sends the request on the session.
+
+        Returns:
+            T: The result of the request.
+
+        Raises:
+            MCPSessionError: If the connection to the MCP server is lost before the response.
+        """  # noqa: E501
+        if self.session is None or self._task is None or not self.alive:
+            raise MCPSessionError(f"MCP server {self.name} is not running")
+        # A crashed server never answers, so wait on the connection as well.
+        request = asyncio.ensure_future(call(self.session))
+        try:
+            await asyncio.wait(
+                {request, self._task}, return_when=asyncio.FIRST_COMPLETED
+            )
+        except BaseException:
+            request.cancel()
+            raise
+        if not request.done():
+            request.cancel()
+            raise MCPSessionError(f"MCP server {self.name} stopped")
+        try:
+            result = request.result()
+        except (anyio.BrokenResourceError, anyio.ClosedResourceError) as e:
+            raise MCPSessionError(f"MCP server {self.name} stopped") from e
+        self.last_used = time.monotonic()
+        return result
+
+    async def ping(self, timeout: float = MCP_HEALTH_CHECK_TIMEOUT) -> bool:
+        """Check that the MCP server responds.
+
+        Args:
+            timeout (float): The time to wait for the response in seconds.
+
+        Returns:
+            bool: Whether the server responded in time.
+        """
+        try:
+            await asyncio.wait_for(
+                self.request(lambda session: session.send_ping()), timeout
+            )
+        except Exception:
+            return False
+        return True
+
+    async def close(self) -> None:
+        """Close the session and stop the MCP server."""
+        self._closing.set()
+        if self._task is not None:
+            if self.session is None:
+                # Still starting, so it is not waiting to be closed yet.
+                self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """Pool of initialized MCP sessions to one MCP server.
+
+    Sessions are started on demand, up to `size` at a time, and returned to
+    the pool after use so later calls skip the process spawn (or the SSE
+    connection) and the initialization handshake. A session that has been
+    idle for `health_check_interval` is pinged before being reused, a
+    session whose server crashed is replaced, and sessions idle for longer
+    than `idle_timeout` are closed in the background. `tools_version` is
+    bumped whenever the server notifies that its tool list has changed.
+
+    Args:
+        url (str | None): The URL of an SSE MCP server.
+        cmd (list[str] | None): The command starting a stdio MCP server.
+        size (int): The maximum number of concurrent sessions.
+        idle_timeout (float): Seconds after which an unused session is closed.
+        health_check_interval (float): Seconds of inactivity after which a session is pinged before reuse.
+        read_timeout (float | None): The timeout of a request in seconds.
+        result_cache (ToolResultCache | None): Caches the results of the tool calls.
+        scheduler (ToolScheduler | None): Bounds the tool calls running at once, across pools.
+    """  # noqa: E501
+
+    _pools: ClassVar[
+        weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            dict[tuple[str | None, tuple[str, ...] | None], "MCPSessionPool"],
+        ]
+    ] = weakref.WeakKeyDictionary()
+
+    def __init__(  # noqa: PLR0913
+        self,
+        url: str | None = None,
+        cmd: list[str] | None = None,
+        *,
+        size: int = MCP_POOL_SIZE,
+        idle_timeout: float = MCP_POOL_IDLE_TIMEOUT,
+        health_check_interval: float = MCP_HEALTH_CHECK_INTERVAL,
+        read_timeout: float | None = MCP_READ_TIMEOUT,
+        result_cache: ToolResultCache | None = None,
+        scheduler: ToolScheduler | None = None,
+    ):
+        if not url and not cmd:
+            raise ValueError("Either url or cmd must be provided")
+        if url and cmd:
+            raise ValueError("Only one of url or cmd must be provided")
+        self.url = url
+        self.cmd = cmd
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.read_timeout = read_timeout
+        self.result_cache = result_cache
+        self.scheduler = scheduler
+        self._idle: list[PooledSession] = []
+        self._sessions: set[PooledSession] = set()
+        self._semaphore = asyncio.Semaphore(size)
+        self._reaper: asyncio.Task | None = None
+        self.tools_version = 0
+
+    @classmethod
+    def shared(
+        cls, url: str | None = None, cmd: list[str] | None = None
+    ) -> "MCPSessionPool":
+        """Return the pool of an MCP server shared by the current event loop.
+
+        Args:
+            url (str | None): The URL of an SSE MCP server.
+            cmd (list[str] | None): The command starting a stdio MCP server.
+
+        Returns:
+            MCPSessionPool: The shared pool.
+        """
+        pools = cls._pools.setdefault(asyncio.get_running_loop(), {})
+        key = (url, tuple(cmd) if cmd else None)
+        if key not in pools:
+            pools[key] = cls(
+                url=url,
+                cmd=cmd,
+                result_cache=get_tool_result_cache(),
+                scheduler=ToolScheduler.shared(),
+            )
+        return pools[key]
+
+    @property
+    def name(self) -> str:
+        """The URL or the command of the MCP server."""
+        return self.url or " ".join(self.cmd or [])
+
+    @classmethod
+    async def close_all(cls) -> None:
+        """Close every pool shared by the current event loop."""
+        pools = cls._pools.pop(asyncio.get_running_loop(), {})
+        await asyncio.gather(*(pool.close() for pool in pools.values()))
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[PooledSession]:
+        """Borrow a session from the pool.
+
+        Yields:
+            PooledSession: A running session, returned to the pool on exit.
+        """
+        async with self._semaphore:
+            pooled = await self._acquire()
+            healthy = True
+            try:
+                yield pooled
+            except McpError:
+                raise
+            except BaseException:
+                # A cancelled request may still be running on the server,
+                # so its session is not handed out again.
+                healthy = False
+                raise
+            finally:
+                if healthy and pooled.alive:
+                    self._idle.append(pooled)
+                else:
+                    await self._discard(pooled)
+
+    async def request(self, call: Callable[[ClientSession], Awaitable[T]]) -> T:
+        """Send a request on a pooled session.
+
+        If the server crashes during the request, the session is replaced
+        and the request is sent once more.
+
+        Args:
+            call (Callable[[ClientSession], Awaitable[T]]): Sends the request on the session.
+
+        Returns:
+            T: The result of the request.
+        """  # noqa: E501
+        try:
+            async with self.session() as pooled:
+                return await pooled.request(call)
+        except MCPSessionError as e:
+            logger.warning("Restarting MCP session: %s", e)
+        async with self.session() as pooled:
+            return await pooled.request(call)
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any] | None = None,
+        progress_callback: ProgressFnT | None = None,
+    ) -> CallToolResult:
+        """Call a tool of the MCP server.
+
+        Args:
+            tool_name (str): The name of the tool.
+            arguments (dict[str, Any] | None): The arguments of the tool.
+            progress_callback (ProgressFnT | None): Called with the progress notifications of the call.
+
+        Returns:
+            CallToolResult: The result of the tool call.
+        """  # noqa: E501
+
+        async def call() -> CallToolResult:
+            async with (
+                self.scheduler.slot(self.name)
+                if self.scheduler
+                else contextlib.nullcontext()
+            ):
+                return await self.request(
+                    lambda session: session.call_tool(
+                        tool_name,
+                        arguments=arguments,
+                        progress_callback=progress_callback,
+                    )
+                )
+
+        if self.result_cache is None:
+            return await call()
+        return await self.result_cache.call(
+            self.name, tool_name, arguments, call
+        )
+
+    async def list_tools(self) -> ListToolsResult:
+        """List the tools of the MCP server.
+
+        Returns:
+            ListToolsResult: The tools.
+        """
+        return await self.request(lambda session: session.list_tools())
+
+    async def close(self) -> None:
+        """Close every session of the pool."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+        sessions = list(self._sessions)
+        self._idle.clear()
+        self._sessions.clear()
+        await asyncio.gather(*(pooled.close() for pooled in sessions))
+
+    async def _acquire(self) -> PooledSession:
+        while self._idle:
+            pooled = self._idle.pop()
+            if not pooled.alive:
+                await self._discard(pooled)
+                continue
+            idle = time.monotonic() - pooled.last_used
+            if idle > self.health_check_interval and not await pooled.ping():
+                logger.warning("MCP server %s is unresponsive", pooled.name)
+                await self._discard(pooled)
+                continue
+            return pooled
+
+        pooled = PooledSession(
+            self.url, self.cmd, self.read_timeout, self._handle_message
+        )
+        await pooled.start()
+        self._sessions.add(pooled)
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap())
+        return pooled
+
+    async def _handle_message(
+        self,
+        message: RequestResponder[ServerRequest, ClientResult]
+        | ServerNotification
+        | Exception,
+    ) -> None:
+        if isinstance(message, ServerNotification) and isinstance(
+            message.root, ToolListChangedNotification
+        ):
+            self.tools_version += 1
+
+    async def _discard(self, pooled: PooledSession) -> None:
+        self._sessions.discard(pooled)
+        with contextlib.suppress(ValueError):
+            self._idle.remove(pooled)
+        await pooled.close()
+
+    async def _reap(self) -> None:
+        while self._sessions:
+            await asyncio.sleep(self.idle_timeout / 2)
+            now = time.monotonic()
+            for pooled in list(self._idle):
+                if (
+                    not pooled.alive
+                    or now - pooled.last_used > self.idle_timeout
+                ):
+                    await self._discard(pooled)
+
+
+def mcp_pool_lifespan(
+    warm_up: Callable[[], Awaitable[None]] | None = None,
+    shutdown: Callable[[], Awaitable[None]] | None = None,
+) -> Callable[[Any], contextlib.AbstractAsyncContextManager[None]]:
+    """Build a server lifespan managing the shared MCP session pools.
+
+    Args:
+        warm_up (Callable[[], Awaitable[None]] | None): Called at startup, e.g. to start the MCP sessions and load the tool catalogs before the first request.
+        shutdown (Callable[[], Awaitable[None]] | None): Called on shutdown before the pools are closed, e.g. to stop worker processes.
+
+    Returns:
+        Callable[[Any], contextlib.AbstractAsyncContextManager[None]]: The lifespan, which closes the pools on shutdown.
+    """  # noqa: E501
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Any) -> AsyncIterator[None]:  # noqa: ANN401
+        if warm_up is not None:
+            try:
+                await warm_up()
+            except Exception as e:
+                logger.warning("MCP warm-up failed: %s", e)
+        yield
+        if shutdown is not None:
+            await shutdown()
+        await MCPSessionPool.close_all()
+
+    return lifespan
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import weakref
+from collections.abc import Mapping
+from typing import Any, ClassVar
+
+from mcp.shared.session import ProgressFnT
+from mcp.types import CallToolResult
+
+from financial_a2a_solution.mcp_catalog import ToolCatalog
+from financial_a2a_solution.mcp_pool import MCPSessionPool
+from financial_a2a_solution.the_solution import prompts  # type: ignore
+from financial_a2a_solution.types import Tool
+
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE_SEPARATOR = "."
+
+ServerKey = tuple[tuple[str, str | None, tuple[str, ...] | None], ...]
+
+
+class MCPRouter:
+    """Expose the tools of several MCP servers as one namespaced catalog.
+
+    Every tool is published as `<server>.<tool>`, where `<server>` is the
+    name the server is registered under, and calls are routed back to the
+    pooled sessions of the owning server.
+
+    Args:
+        servers (Mapping[str, Mapping[str, Any]]): The servers by name, each given as the `url` or the `cmd` of the server.
+    """  # noqa: E501
+
+    _routers: ClassVar[
+        weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[ServerKey, "MCPRouter"]
+        ]
+    ] = weakref.WeakKeyDictionary()
+
+    def __init__(self, servers: Mapping[str, Mapping[str, Any]]):
+        if not servers:
+            raise ValueError("At least one MCP server must be provided")
+        for name in servers:
+            if NAMESPACE_SEPARATOR in name:
+                raise ValueError(
+                    f"MCP server name {name!r} must not contain "
+                    f"{NAMESPACE_SEPARATOR!r}"
+                )
+        self.servers = {
+            name: {"url": server.get("url"), "cmd": server.get("cmd")}
+            for name, server in servers.items()
+        }
+        self._tools: list[Tool] = []
+        self._prompt = ""
+        self._rendered_from: list[list[Tool]] | None = None
+
+    @classmethod
+    def shared(cls, servers: Mapping[str, Mapping[str, Any]]) -> "MCPRouter":
+        """Return the router of a set of servers shared by the event loop.
+
+        Args:
+            servers (Mapping[str, Mapping[str, Any]]): The servers by name, each given as the `url` or the `cmd` of the server.
+
+        Returns:
+            MCPRouter: The shared router.
+        """  # noqa: E501
+        key = tuple(
+            sorted(
+                (
+                    name,
+                    server.get("url"),
+                    tuple(server["cmd"]) if server.get("cmd") else None,
+                )
+                for name, server in servers.items()
+            )
+        )
+        routers = cls._routers.setdefault(asyncio.get_running_loop(), {})
+        if key not in routers:
+            routers[key] = cls(servers)
+        return routers[key]
+
+    def _catalog(self, name: str) -> ToolCatalog:
+        return ToolCatalog.shared(**self.servers[name])
+
+    async def get_tools(self) -> list[Tool]:
+        """Discover the tools of every server in parallel.
+
+        A server that cannot be reached is logged and left out.
+
+        Returns:
+            list[Tool]: The namespaced tools of every reachable server.
+        """
+        names = list(self.servers)
+        results = await asyncio.gather(
+            *(self._catalog(name).get_tools() for name in names),
+            return_exceptions=True,
+        )
+        catalogs: list[list[Tool]] = []
+        for name, result in zip(names, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning("MCP server %s is unavailable: %s", name, result)
+                catalogs.append([])
+            else:
+                catalogs.append(result)
+
+        # The catalogs hand out the same lists until they refresh, so the
+        # merged tools and their prompt are rebuilt only on a change.
+        if self._rendered_from is None or any(
+            tools is not rendered
+            for tools, rendered in zip(
+                catalogs, self._rendered_from, strict=True
+            )
+        ):
+            self._tools = [
+                tool.model_copy(
+                    update={"name": f"{name}{NAMESPACE_SEPARATOR}{tool.name}"}
+                )
+                for name, tools in zip(names, catalogs, strict=True)
+                for tool in tools
+            ]
+            self._prompt = prompts.get_tools_prompt(self._tools)
+            self._rendered_from = catalogs
+        return self._tools
+
+    async def get_prompt(self) -> str:
+        """Return the rendered prompt describing the tools of every server.
+
+        Returns:
+            str: The tool prompt.
+        """
+        await self.get_tools()
+        return self._prompt
+
+    def route(self, tool_name: str) -> tuple[MCPSessionPool, str]:
+        """Find the server owning a namespaced tool.
+
+        Args:
+            tool_name (str): The namespaced tool name, `<server>.<tool>`.
+
+        Returns:
+            tuple[MCPSessionPool, str]: The session pool of the server and the tool name on that server.
+
+        Raises:
+            ValueError: If the tool does not belong to a known server.
+        """  # noqa: E501
+        name, separator, tool = tool_name.partition(NAMESPACE_SEPARATOR)
+        if not separator or name not in self.servers:
+            raise ValueError(f"Unknown MCP tool: {tool_name}")
+        return MCPSessionPool.shared(**self.servers[name]), tool
+
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any] | None = None,
+        progress_callback: ProgressFnT | None = None,
+    ) -> CallToolResult:
+        """Call a namespaced tool on the server owning it.
+
+        Args:
+            tool_name (str): The namespaced tool name, `<server>.<tool>`.
+            arguments (dict[str, Any] | None): The arguments of the tool.
+            progress_callback (ProgressFnT | None): Called with the progress notifications of the call.
+
+        Returns:
+            CallToolResult: The result of the tool call.
+        """  # noqa: E501
+        pool, tool = self.route(tool_name)
+        return await pool.call_tool(
+            tool, arguments=arguments, progress_callback=progress_callback
+        )
@@ -0,0 +1,86 @@
+import asyncio
+import contextlib
+from collections.abc import AsyncGenerator
+
+from mcp.shared.session import ProgressFnT
+
+
+def format_progress(
+    tool_name: str, progress: float, total: float | None, message: str | None
+) -> str:
+    """Describe a progress notification of a tool call in one line.
+
+    Args:
+        tool_name (str): The tool reporting progress.
+        progress (float): The progress thus far.
+        total (float | None): The total progress, if known.
+        message (str | None): The human readable message of the notification.
+
+    Returns:
+        str: The progress line.
+    """
+    amount = f"{progress:g}/{total:g}" if total else f"{progress:g}"
+    if message:
+        return f"[{tool_name}] {message} ({amount})\n"
+    return f"[{tool_name}] {amount}\n"
+
+
+class ProgressRelay:
+    """Relay the progress notifications of running tool calls.
+
+    Every tool call gets a callback from `callback`, and `updates` streams
+    the notifications of all of them, as they arrive, until the calls are
+    done.
+    """
+
+    def __init__(self):
+        self._updates: asyncio.Queue[str] = asyncio.Queue()
+
+    def callback(self, tool_name: str) -> ProgressFnT:
+        """Build the progress callback of a tool call.
+
+        Args:
+            tool_name (str): The tool being called.
+
+        Returns:
+            ProgressFnT: The callback to pass to the MCP session.
+        """
+
+        async def report(
+            progress: float, total: float | None, message: str | None
+        ) -> None:
+            self._updates.put_nowait(
+                format_progress(tool_name, progress, total, message)
+            )
+
+        return report
+
+    async def updates(self, calls: asyncio.Future) -> AsyncGenerator[str, None]:
+        """Stream the progress of the tool calls until they are done.
+
+        The calls are cancelled if the stream is closed before they are done.
+
+        Args:
+            calls (asyncio.Future): The running tool calls.
+
+        Yields:
+            str: A line describing each progress notification.
+        """
+        try:
+            while not calls.done():
+                update = asyncio.ensure_future(self._updates.get())
+                try:
+                    await asyncio.wait(
+                        {calls, update}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    update.cancel()
+                if update.done() and not update.cancelled():
+                    yield update.result()
+            while not self._updates.empty():
+                yield self._updates.get_nowait()
+        finally:
+            if not calls.done():
+                calls.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await calls
@@ -0,0 +1,58 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import override
+
+from a2a.server.events import Event
+from a2a.server.request_handlers.default_request_handler import (
+    DefaultRequestHandler,
+)
+from a2a.types import MessageSendParams, Task
+
+
+class CancellingRequestHandler(DefaultRequestHandler):
+    """Request handler that stops the agent when a streaming client leaves.
+
+    `DefaultRequestHandler` lets the agent execution run to completion even
+    after the client of a `message/stream` request has disconnected. This
+    handler cancels the execution instead, which propagates through
+    `Agent.stream` to the LLM stream and to the MCP sessions in flight, and
+    it releases the task queue of executions that were cancelled.
+    """
+
+    @override
+    async def on_message_send_stream(
+        self, params: MessageSendParams
+    ) -> AsyncGenerator[Event]:
+        stream = super().on_message_send_stream(params)
+        task_id: str | None = None
+        completed = False
+        try:
+            async for event in stream:
+                if isinstance(event, Task):
+                    task_id = event.id
+                else:
+                    task_id = event.taskId or task_id
+                yield event
+            completed = True
+        finally:
+            # Cancel before closing the stream: closing it waits for the
+            # execution, and the surrounding request may already be cancelled
+            # so nothing after the first await is guaranteed to run.
+            if not completed and task_id:
+                producer_task = self._running_agents.get(task_id)
+                if producer_task:
+                    producer_task.cancel()
+            await stream.aclose()
+
+    @override
+    async def _cleanup_producer(
+        self, producer_task: asyncio.Task, task_id: str
+    ) -> None:
+        try:
+            await producer_task
+        except asyncio.CancelledError:
+            if not producer_task.cancelled():
+                raise
+        await self._queue_manager.close(task_id)
+        async with self._running_agents_lock:
+            self._running_agents.pop(task_id, None)
@@ -0,0 +1,165 @@
+import asyncio
+import contextlib
+import logging
+import weakref
+from collections import Counter, OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import ClassVar
+
+from financial_a2a_solution.constant import (
+    MCP_MAX_CONCURRENCY,
+    MCP_MAX_CONCURRENCY_PER_SERVER,
+)
+
+
+logger = logging.getLogger(__name__)
+
+tool_call_owner: ContextVar[str] = ContextVar(
+    "tool_call_owner", default="default"
+)
+"""The request on behalf of which tools are called, used for fairness."""
+
+
+@dataclass
+class _Waiter:
+    server: str
+    future: asyncio.Future[None]
+
+
+class ToolScheduler:
+    """Bound the number of tool calls running at once.
+
+    At most `max_concurrency` calls run in total and at most
+    `max_per_server` per MCP server. Calls over the limits wait in one queue
+    per owner (see `tool_call_owner`), and free slots are handed out to the
+    owners in turn, so a request selecting many tools cannot starve the
+    others.
+
+    Args:
+        max_concurrency (int): The maximum number of running calls.
+        max_per_server (int): The maximum number of running calls per server.
+    """
+
+    _schedulers: ClassVar[
+        weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, "ToolScheduler"]
+    ] = weakref.WeakKeyDictionary()
+
+    def __init__(
+        self,
+        max_concurrency: int = MCP_MAX_CONCURRENCY,
+        max_per_server: int = MCP_MAX_CONCURRENCY_PER_SERVER,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_server = max_per_server
+        self.running = 0
+        self.running_per_server: Counter[str] = Counter()
+        self._queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+
+    @classmethod
+    def shared(cls) -> "ToolScheduler":
+        """Return the scheduler shared by the current event loop.
+
+        Returns:
+            ToolScheduler: The shared scheduler.
+        """
+        loop = asyncio.get_running_loop()
+        if loop not in cls._schedulers:
+            cls._schedulers[loop] = cls()
+        return cls._schedulers[loop]
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of calls waiting for a slot."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    def queue_depths(self) -> dict[str, int]:
+        """Return the number of waiting calls of every owner.
+
+        Returns:
+            dict[str, int]: The queue depth by owner.
+        """
+        return {owner: len(queue) for owner, queue in self._queues.items()}
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, server: str, owner: str | None = None
+    ) -> AsyncIterator[None]:
+        """Wait for a free slot and hold it.
+
+        Args:
+            server (str): The MCP server the call is sent to.
+            owner (str | None): The request making the call. Defaults to `tool_call_owner`.
+        """  # noqa: E501
+        # With capacity left for this server no call to it can be waiting,
+        # since slots are handed out as soon as they are released.
+        if self._has_capacity(server):
+            self._acquire(server)
+        else:
+            owner = owner or tool_call_owner.get()
+            waiter = _Waiter(server, asyncio.get_running_loop().create_future())
+            self._queues.setdefault(owner, deque()).append(waiter)
+            logger.debug(
+                "Tool call to %s queued, %d waiting", server, self.queue_depth
+            )
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self._release(server)
+                else:
+                    self._remove(owner, waiter)
+                raise
+        try:
+            yield
+        finally:
+            self._release(server)
+
+    def _has_capacity(self, server: str) -> bool:
+        return (
+            self.running < self.max_concurrency
+            and self.running_per_server[server] < self.max_per_server
+        )
+
+    def _acquire(self, server: str) -> None:
+        self.running += 1
+        self.running_per_server[server] += 1
+
+    def _release(self, server: str) -> None:
+        self.running -= 1
+        self.running_per_server[server] -= 1
+        if not self.running_per_server[server]:
+            del self.running_per_server[server]
+        self._dispatch()
+
+    def _remove(self, owner: str, waiter: _Waiter) -> None:
+        queue = self._queues.get(owner)
+        if queue is None:
+            return
+        with contextlib.suppress(ValueError):
+            queue.remove(waiter)
+        if not queue:
+            del self._queues[owner]
+
+    def _dispatch(self) -> None:
+        granted = True
+        while granted and self.running < self.max_concurrency:
+            granted = False
+            # Owners are visited in turn: the one served goes to the back.
+            for owner, queue in self._queues.items():
+                waiter = next(
+                    (w for w in queue if self._has_capacity(w.server)), None
+                )
+                if waiter is None:
+                    continue
+                self._remove(owner, waiter)
+                if owner in self._queues:
+                    self._queues.move_to_end(owner)
+                if waiter.future.done():
+                    granted = True
+                    break
+                self._acquire(waiter.server)
+                waiter.future.set_result(None)
+                granted = True
+                break
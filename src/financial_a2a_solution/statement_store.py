@@ -0,0 +1,370 @@
+import threading
+from collections.abc import Iterator, Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+from financial_a2a_solution.local_tools import LocalToolbox
+
+
+STATEMENT_TOOL = "get_financial_statement"
+"""The `set-mcp` tool whose results fill the store."""
+
+
+class StatementRow(NamedTuple):
+    """One value of a financial statement."""
+
+    statement: str
+    code: str
+    name: str
+    period: str
+    value: float
+
+
+def parse_financial_statement(text: str) -> Iterator[StatementRow]:
+    """Parse the text returned by `get_financial_statement`.
+
+    Every statement is a title line such as "Balance Sheet:" followed by a
+    `accountCode|accountName|<period>...` header and one row per line item.
+    Heading rows without a value are skipped.
+
+    Args:
+        text (str): The tool result.
+
+    Yields:
+        StatementRow: The values of every statement.
+    """
+    statement = ""
+    periods: list[str] = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if "|" not in line:
+            if line.endswith(":"):
+                statement = line[:-1]
+                periods = []
+            continue
+        cells = line.split("|")
+        if cells[0] == "accountCode":
+            periods = cells[2:]
+            continue
+        if not periods or len(cells) < 2:  # noqa: PLR2004
+            continue
+        code, name = cells[0], cells[1]
+        for period, cell in zip(periods, cells[2:], strict=False):
+            try:
+                value = float(cell)
+            except ValueError:
+                continue
+            yield StatementRow(statement, code, name, period, value)
+
+
+class StatementStore:
+    """Columnar in-process store of SET financial statements.
+
+    Values are kept in one `symbol x period x line item` float array, NaN
+    where unknown, which grows as statements of new symbols, periods or
+    line items are ingested. Line items are keyed by their account code.
+
+    The store is filled from the results of `get_financial_statement` and
+    registers query tools, so comparisons across companies and periods are
+    answered without fetching the statements again.
+    """
+
+    def __init__(self):
+        self.symbols: list[str] = []
+        self.periods: list[str] = []
+        self.items: list[str] = []
+        self.item_names: dict[str, str] = {}
+        self.item_statements: dict[str, str] = {}
+        self._indexes: tuple[dict[str, int], ...] = ({}, {}, {})
+        self._values = np.full((4, 4, 64), np.nan)
+        self._lock = threading.Lock()
+
+    @property
+    def values(self) -> np.ndarray:
+        """The `symbol x period x line item` values, NaN where unknown."""
+        return self._values[
+            : len(self.symbols), : len(self.periods), : len(self.items)
+        ]
+
+    def _index(self, axis: int, label: str) -> int:
+        index = self._indexes[axis]
+        if label in index:
+            return index[label]
+        labels = (self.symbols, self.periods, self.items)[axis]
+        position = index[label] = len(labels)
+        labels.append(label)
+        if position >= self._values.shape[axis]:
+            # Capacity doubles so appending stays amortized constant time.
+            shape = list(self._values.shape)
+            shape[axis] *= 2
+            values = np.full(shape, np.nan)
+            values[tuple(slice(0, size) for size in self._values.shape)] = (
+                self._values
+            )
+            self._values = values
+        return position
+
+    def ingest(self, symbol: str, text: str) -> int:
+        """Add or update the statements of a company.
+
+        Args:
+            symbol (str): The symbol of the company.
+            text (str): The result of `get_financial_statement`.
+
+        Returns:
+            int: The number of values stored.
+        """
+        rows = list(parse_financial_statement(text))
+        if not rows:
+            return 0
+        with self._lock:
+            symbol_index = self._index(0, symbol.upper())
+            period_indexes = np.empty(len(rows), dtype=np.intp)
+            item_indexes = np.empty(len(rows), dtype=np.intp)
+            for position, row in enumerate(rows):
+                period_indexes[position] = self._index(1, row.period)
+                item_indexes[position] = self._index(2, row.code)
+                self.item_names[row.code] = row.name
+                self.item_statements[row.code] = row.statement
+            self._values[symbol_index, period_indexes, item_indexes] = [
+                row.value for row in rows
+            ]
+        return len(rows)
+
+    def resolve_item(self, item: str) -> str:
+        """Find a line item by account code or name.
+
+        Args:
+            item (str): An account code, a line item name or a part of it.
+
+        Returns:
+            str: The account code.
+
+        Raises:
+            KeyError: If no line item matches.
+        """
+        if item in self._indexes[2]:
+            return item
+        lowered = item.casefold()
+        matches = [
+            code
+            for code in self.items
+            if lowered in self.item_names[code].casefold()
+        ]
+        if not matches:
+            raise KeyError(f"Unknown line item: {item}")
+        # The shortest name is the closest match, e.g. a total over its parts.
+        return min(matches, key=lambda code: len(self.item_names[code]))
+
+    def _select(
+        self, axis: int, labels: Sequence[str] | None
+    ) -> tuple[list[str], np.ndarray]:
+        known = (self.symbols, self.periods, self.items)[axis]
+        if not labels:
+            selected = sorted(known) if axis == 1 else list(known)
+        elif axis == 0:
+            selected = [label.upper() for label in labels]
+        elif axis == 2:  # noqa: PLR2004
+            selected = [self.resolve_item(label) for label in labels]
+        else:
+            selected = list(labels)
+        index = self._indexes[axis]
+        missing = [label for label in selected if label not in index]
+        if missing:
+            raise KeyError(f"Not in the store: {', '.join(missing)}")
+        return selected, np.array(
+            [index[label] for label in selected], dtype=np.intp
+        )
+
+    def query(
+        self,
+        symbols: Sequence[str] | None = None,
+        items: Sequence[str] | None = None,
+        periods: Sequence[str] | None = None,
+    ) -> tuple[list[str], list[str], list[str], np.ndarray]:
+        """Slice the store.
+
+        Args:
+            symbols (Sequence[str] | None): The companies. Defaults to every stored company.
+            items (Sequence[str] | None): The line items, by code or name. Defaults to every item.
+            periods (Sequence[str] | None): The periods. Defaults to every period, in order.
+
+        Returns:
+            tuple[list[str], list[str], list[str], np.ndarray]: The symbols, the periods and the account codes selected, and their `symbol x period x item` values.
+        """  # noqa: E501
+        with self._lock:
+            symbols, symbol_indexes = self._select(0, symbols)
+            periods, period_indexes = self._select(1, periods)
+            items, item_indexes = self._select(2, items)
+            values = self._values[
+                np.ix_(symbol_indexes, period_indexes, item_indexes)
+            ]
+        return symbols, periods, items, values
+
+    def growth(
+        self,
+        symbols: Sequence[str] | None,
+        item: str,
+        periods: Sequence[str] | None = None,
+    ) -> tuple[list[str], list[str], np.ndarray]:
+        """Compute the period-over-period growth of a line item.
+
+        Args:
+            symbols (Sequence[str] | None): The companies. Defaults to every stored company.
+            item (str): The line item, by code or name.
+            periods (Sequence[str] | None): The periods, in order. Defaults to every period.
+
+        Returns:
+            tuple[list[str], list[str], np.ndarray]: The symbols, the periods and the `symbol x period` growth rates, NaN for the first period or where a value is missing.
+        """  # noqa: E501
+        symbols, periods, _, values = self.query(symbols, [item], periods)
+        series = values[:, :, 0]
+        growth = np.full_like(series, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth[:, 1:] = series[:, 1:] / np.abs(series[:, :-1]) - np.sign(
+                series[:, :-1]
+            )
+        growth[~np.isfinite(growth)] = np.nan
+        return symbols, periods, growth
+
+    def register(self, toolbox: LocalToolbox) -> None:
+        """Register the query tools of the store.
+
+        Args:
+            toolbox (LocalToolbox): The toolbox of the agent.
+        """
+        string_list = {"type": "array", "items": {"type": "string"}}
+        toolbox.add(
+            self.list_statements,
+            {"type": "object", "properties": {}},
+            description=(
+                "List the companies, periods and line items of the financial "
+                f"statements already fetched with {STATEMENT_TOOL}."
+            ),
+        )
+        toolbox.add(
+            self.query_statements,
+            {
+                "type": "object",
+                "properties": {
+                    "symbols": string_list,
+                    "items": string_list,
+                    "periods": string_list,
+                },
+                "required": ["items"],
+            },
+            description=(
+                "Return line items, by account code or name, of the stored "
+                "financial statements of several companies and periods. "
+                "Omit symbols or periods to get all of them."
+            ),
+        )
+        toolbox.add(
+            self.statement_growth,
+            {
+                "type": "object",
+                "properties": {
+                    "symbols": string_list,
+                    "item": {"type": "string"},
+                    "periods": string_list,
+                },
+                "required": ["item"],
+            },
+            description=(
+                "Return the period-over-period growth rate of a line item, "
+                "by account code or name, for several companies."
+            ),
+        )
+
+    def list_statements(self) -> str:
+        """Describe the content of the store.
+
+        Returns:
+            str: The stored companies, periods and line items.
+        """
+        with self._lock:
+            if not self.symbols:
+                return f"No statement stored, call {STATEMENT_TOOL} first."
+            lines = [
+                f"Symbols: {', '.join(self.symbols)}",
+                f"Periods: {', '.join(sorted(self.periods))}",
+                "accountCode|accountName|statement",
+            ]
+            lines.extend(
+                f"{code}|{self.item_names[code]}|{self.item_statements[code]}"
+                for code in self.items
+            )
+        return "\n".join(lines)
+
+    def query_statements(
+        self,
+        items: list[str],
+        symbols: list[str] | None = None,
+        periods: list[str] | None = None,
+    ) -> str:
+        """Render a slice of the store as a table.
+
+        Args:
+            items (list[str]): The line items, by code or name.
+            symbols (list[str] | None): The companies. Defaults to every stored company.
+            periods (list[str] | None): The periods. Defaults to every period.
+
+        Returns:
+            str: One `symbol|accountCode|accountName|<period>...` row per company and line item.
+        """  # noqa: E501
+        symbols, periods, codes, values = self.query(symbols, items, periods)
+        lines = ["symbol|accountCode|accountName|" + "|".join(periods)]
+        for s, symbol in enumerate(symbols):
+            for i, code in enumerate(codes):
+                cells = "|".join(format_value(v) for v in values[s, :, i])
+                lines.append(f"{symbol}|{code}|{self.item_names[code]}|{cells}")
+        return "\n".join(lines)
+
+    def statement_growth(
+        self,
+        item: str,
+        symbols: list[str] | None = None,
+        periods: list[str] | None = None,
+    ) -> str:
+        """Render the growth rates of a line item as a table.
+
+        Args:
+            item (str): The line item, by code or name.
+            symbols (list[str] | None): The companies. Defaults to every stored company.
+            periods (list[str] | None): The periods. Defaults to every period.
+
+        Returns:
+            str: One `symbol|<period>...` row of growth rates per company.
+        """  # noqa: E501
+        symbols, periods, growth = self.growth(symbols, item, periods)
+        code = self.resolve_item(item)
+        lines = [
+            f"Growth of {code}|{self.item_names[code]}",
+            "symbol|" + "|".join(periods),
+        ]
+        for symbol, rates in zip(symbols, growth, strict=True):
+            cells = "|".join(
+                "" if np.isnan(rate) else f"{rate:.2%}" for rate in rates
+            )
+            lines.append(f"{symbol}|{cells}")
+        return "\n".join(lines)
+
+
+def format_value(value: float) -> str:
+    """Format a stored value, empty when it is unknown.
+
+    Values are written in full, without an exponent, and with the fewest
+    digits that read back as the same float.
+
+    Args:
+        value (float): The value.
+
+    Returns:
+        str: The value as text.
+    """
+    if np.isnan(value):
+        return ""
+    return np.format_float_positional(value, trim="-")
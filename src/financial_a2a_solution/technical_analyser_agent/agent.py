@@ -1,47 +1,41 @@
 import asyncio
-import re
-from collections.abc import AsyncGenerator, Callable, Generator
+from collections.abc import AsyncGenerator, Callable
 
 from typing import Literal
 
-import commentjson as json
-import google.generativeai as genai
 
 from mcp.types import CallToolResult
 from pydantic import BaseModel
 
-from financial_a2a_solution.technical_analyser_agent.constant import (
-    GOOGLE_API_KEY,
+from financial_a2a_solution.artifact_store import (
+    ArtifactStore,
+    get_artifact_store,
 )
+from financial_a2a_solution.compaction import HistoryCompactor
+from financial_a2a_solution.llm import LLMProvider, get_llm_provider
+from financial_a2a_solution.local_tools import LocalToolbox
+from financial_a2a_solution.progress import ProgressRelay
 from financial_a2a_solution.technical_analyser_agent.mcp import (
     call_mcp_tool,
     get_mcp_tool_prompt,
 )
-from financial_a2a_solution.the_solution import prompts  # type: ignore
+from financial_a2a_solution.the_solution import prompts, utils  # type: ignore
 from financial_a2a_solution.types import CalledTool
 
 
 class StreamChunk(BaseModel):
-    """Stream chunk."""
+    """Stream chunk.
+
+    `is_progress` marks the progress of the tools being called, which is
+    not part of the answer, and `artifacts` lists the handles of the tool
+    results stored in the artifact store to publish along with the chunk.
+    """
 
     is_task_complete: bool
     require_user_input: bool
     content: str
-
-
-def stream_llm(prompt: str) -> Generator[str, None]:
-    """Stream LLM response.
-
-    Args:
-        prompt (str): The prompt to send to the LLM.
-
-    Returns:
-        Generator[str, None, None]: A generator of the LLM response.
-    """
-    genai.configure(api_key=GOOGLE_API_KEY)
-    model = genai.GenerativeModel("gemini-1.5-flash")
-    for chunk in model.generate_content(prompt, stream=True):
-        yield chunk.text
+    is_progress: bool = False
+    artifacts: list[str] = []
 
 
 class MCPParameters(BaseModel):
@@ -50,10 +44,12 @@ class MCPParameters(BaseModel):
     Args:
         url (str | None): The URL of the MCP server.
         cmd (list[str] | None): The command to run the MCP server.
-    """
+        servers (dict[str, MCPParameters] | None): Several MCP servers by name, used together instead of `url` or `cmd`. Their tools are namespaced as `<server>.<tool>`.
+    """  # noqa: E501
 
     url: str | None = None
     cmd: list[str] | None = None
+    servers: dict[str, "MCPParameters"] | None = None
 
 
 class Agent:
@@ -63,48 +59,97 @@ class Agent:
     token_stream_callback: Callable[[str], None] | None
     mcp_parameters: MCPParameters | None
     role: str | None = None
+    llm: LLMProvider
+    compactor: HistoryCompactor
+    artifact_store: ArtifactStore
+    local_tools: LocalToolbox
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         mode: Literal["complete", "stream"] = "stream",
         token_stream_callback: Callable[[str], None] | None = None,
         mcp_parameters: MCPParameters | None = None,
         role: str | None = None,
+        *,
+        llm: LLMProvider | None = None,
+        compactor: HistoryCompactor | None = None,
+        artifact_store: ArtifactStore | None = None,
+        local_tools: LocalToolbox | None = None,
     ):
         self.mode = mode
         self.token_stream_callback = token_stream_callback
         self.mcp_parameters = mcp_parameters
         self.role = role
+        self.llm = llm or get_llm_provider()
+        self.compactor = compactor or HistoryCompactor()
+        self.artifact_store = artifact_store or get_artifact_store()
+        self.local_tools = local_tools or LocalToolbox()
+
+    async def warm_up(self) -> None:
+        """Start the MCP session and load the tool catalog before use."""
+        if self.mcp_parameters is not None:
+            await get_mcp_tool_prompt(**self.mcp_parameters.model_dump())
+
+    async def open_session(self, question: str) -> prompts.ToolPromptSession:
+        """Start the tool decide prompt of a question.
+
+        Args:
+            question (str): The question to answer.
+
+        Returns:
+            prompts.ToolPromptSession: The prompt, without called tools yet.
+        """
+        tool_prompt = ""
+        if self.mcp_parameters is not None:
+            tool_prompt = await get_mcp_tool_prompt(
+                **self.mcp_parameters.model_dump()
+            )
+        tool_prompt += self.local_tools.get_prompt()
+        return prompts.ToolPromptSession(
+            question=question, tool_prompt=tool_prompt
+        )
+
+    async def update_session(
+        self, session: prompts.ToolPromptSession, called_tools: list[CalledTool]
+    ) -> str:
+        """Bring the history of a prompt session up to date.
+
+        The history is compacted first. Only the new calls, and the older
+        ones that compaction shortened, are rendered.
+
+        Args:
+            session (prompts.ToolPromptSession): The prompt to update.
+            called_tools (list[CalledTool]): The tools called so far.
+
+        Returns:
+            str: The called tools history.
+        """
+        called_tools, _ = self.compactor.compact_tools(called_tools)
+        await asyncio.to_thread(session.update, called_tools)
+        return session.history()
 
     async def decide(
-        self, question: str, called_tools: list[CalledTool] | None = None
+        self,
+        question: str,
+        called_tools: list[CalledTool] | None = None,
+        session: prompts.ToolPromptSession | None = None,
     ) -> AsyncGenerator[str, None]:
         """Decide which tool to use to answer the question.
 
         Args:
             question (str): The question to answer.
             called_tools (list[dict]): The tools that have been called.
-        """
-        if self.mcp_parameters is None:
-            for chunk in stream_llm(question):
+            session (prompts.ToolPromptSession | None): The prompt kept up to date by the caller. Built from `called_tools` when omitted.
+        """  # noqa: E501
+        if self.mcp_parameters is None and not self.local_tools.tools:
+            async for chunk in self.llm.stream(question):
                 yield chunk
             return
-        tool_prompt = await get_mcp_tool_prompt(
-            **self.mcp_parameters.model_dump()
-        )
-        if called_tools:
-            called_tools_prompt = prompts.get_called_tools_history_prompt(
-                called_tools
-            )
-        else:
-            called_tools_prompt = ""
-
-        prompt = prompts.get_tool_decide_prompt(
-            question=question,
-            tool_prompt=tool_prompt,
-            called_tools=called_tools_prompt,
-        )
-        for chunk in stream_llm(prompt):
+        if session is None:
+            session = await self.open_session(question)
+            if called_tools:
+                await self.update_session(session, called_tools)
+        async for chunk in self.llm.stream(session.prompt()):
             yield chunk
 
     def extract_tools(self, response: str) -> list[dict]:
@@ -113,29 +158,57 @@ class Agent:
         Args:
             response (str): The response from the LLM.
         """
-        pattern = r"```json\n(.*?)\n```"
-        match = re.search(pattern, response, re.DOTALL)
-        if match:
-            return json.loads(match.group(1))
-        return []
+        return utils.extract_json_block(response, "selected_tools") or []
 
-    async def call_tool(self, tools: list[dict]) -> tuple[CallToolResult, ...]:
+    async def call_tool(
+        self, tools: list[dict], progress: ProgressRelay | None = None
+    ) -> tuple[CallToolResult, ...]:
         """Call the tool.
 
         Args:
             tools (list[dict]): The tools to call.
+            progress (ProgressRelay | None): Relays the progress of the calls.
         """
-        if self.mcp_parameters is None:
+        if self.mcp_parameters is None and not self.local_tools.tools:
             return ()
         return await asyncio.gather(
-            *[
-                call_mcp_tool(
-                    **self.mcp_parameters.model_dump(),
-                    tool_name=tool["name"],
-                    arguments=tool["arguments"],
-                )
-                for tool in tools
-            ]
+            *[self._call_tool(tool, progress) for tool in tools]
+        )
+
+    async def _call_tool(
+        self, tool: dict, progress: ProgressRelay | None
+    ) -> CallToolResult:
+        if tool["name"] in self.local_tools or self.mcp_parameters is None:
+            return await self.local_tools.call(tool["name"], tool["arguments"])
+        return await call_mcp_tool(
+            **self.mcp_parameters.model_dump(),
+            tool_name=tool["name"],
+            arguments=tool["arguments"],
+            progress_callback=progress.callback(tool["name"])
+            if progress
+            else None,
+        )
+
+    async def record_call(
+        self, tool: dict, result: CallToolResult
+    ) -> CalledTool:
+        """Record a tool call, moving a large result to the artifact store.
+
+        Args:
+            tool (dict): The tool that was called.
+            result (CallToolResult): The result of the call.
+
+        Returns:
+            CalledTool: The call, with the handle and a summary of the result if it was stored.
+        """  # noqa: E501
+        text = getattr(result.content[0], "text", "")
+        stored = await asyncio.to_thread(self.artifact_store.spill, text)
+        return CalledTool(
+            name=tool["name"],
+            arguments=str(tool["arguments"]),
+            isError=result.isError,
+            result=stored.summary if stored else text,
+            artifact=stored.handle if stored else None,
         )
 
     async def stream(self, question: str) -> AsyncGenerator[StreamChunk, None]:
@@ -148,10 +221,11 @@ class Agent:
             dict: Streaming output, including intermediate steps and final result.
         """  # noqa: E501
         called_tools: list[CalledTool] = []
+        session = await self.open_session(question)
 
         for _ in range(10):
             response = ""
-            async for chunk in self.decide(question, called_tools):
+            async for chunk in self.decide(question, called_tools, session):
                 response += chunk
                 yield StreamChunk(
                     is_task_complete=False,
@@ -161,27 +235,36 @@ class Agent:
             tools = self.extract_tools(response)
             if not tools:
                 break
-            results = await self.call_tool(tools)
-
-            called_tools.extend(
-                [
-                    CalledTool(
-                        name=tool["name"],
-                        arguments=str(tool["arguments"]),
-                        isError=result.isError,
-                        result=getattr(result.content[0], "text", ""),
-                    )
+            # Long tools report their progress while the others run.
+            progress = ProgressRelay()
+            calls = asyncio.ensure_future(self.call_tool(tools, progress))
+            async for update in progress.updates(calls):
+                yield StreamChunk(
+                    is_task_complete=False,
+                    require_user_input=False,
+                    content=update,
+                    is_progress=True,
+                )
+            results = await calls
+
+            new_calls = await asyncio.gather(
+                *(
+                    self.record_call(tool, result)
                     for tool, result in zip(tools, results, strict=True)
-                ]
+                )
             )
-            called_tools_history = prompts.get_called_tools_history_prompt(
-                called_tools
+            called_tools.extend(new_calls)
+            called_tools_history = await self.update_session(
+                session, called_tools
             )
 
             yield StreamChunk(
                 is_task_complete=False,
                 require_user_input=False,
                 content=called_tools_history,
+                artifacts=[
+                    call.artifact for call in new_calls if call.artifact
+                ],
             )
 
         yield StreamChunk(
@@ -1,24 +1,65 @@
+import asyncio
 from typing import override
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.types import (
     TaskArtifactUpdateEvent,
+    TaskNotCancelableError,
+    TaskNotFoundError,
     TaskState,
     TaskStatus,
     TaskStatusUpdateEvent,
 )
 from a2a.utils import new_agent_text_message, new_task, new_text_artifact
+from a2a.utils.errors import ServerError
 
+from financial_a2a_solution.local_tools import LocalToolbox
+from financial_a2a_solution.scheduler import tool_call_owner
 from financial_a2a_solution.technical_analyser_agent.agent import (
     Agent,
     MCPParameters,
 )
+from financial_a2a_solution.technical_analyser_agent.backtest import (
+    CSVPriceLoader,
+    register_backtest_tools,
+)
+from financial_a2a_solution.technical_analyser_agent.constant import (
+    get_agent_request_timeout,
+    get_price_data_dir,
+)
+from financial_a2a_solution.technical_analyser_agent.sweep import (
+    ParameterSweep,
+    register_sweep_tool,
+)
+
+TERMINAL_STATES = {
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+}
 
 
 class TechnicalAnalyserAgentExecutor(AgentExecutor):
     """Test AgentProxy Implementation."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        timeout: float | None = None,
+        price_data_dir: str | None = None,
+    ):
+        # Without a timeout, `AGENT_REQUEST_TIMEOUT` applies. 0 disables it.
+        if timeout is None:
+            timeout = get_agent_request_timeout()
+        self.timeout = timeout or None
+        local_tools = LocalToolbox()
+        self.sweep: ParameterSweep | None = None
+        price_data_dir = price_data_dir or get_price_data_dir()
+        if price_data_dir:
+            loader = CSVPriceLoader(price_data_dir)
+            register_backtest_tools(local_tools, loader)
+            self.sweep = ParameterSweep()
+            register_sweep_tool(local_tools, loader, self.sweep)
         self.agent = Agent(
             mode="stream",
             token_stream_callback=lambda token: print(
@@ -34,8 +75,18 @@ class TechnicalAnalyserAgentExecutor(AgentExecutor):
                     "technical-backtesting-mcp",
                 ]
             ),
+            local_tools=local_tools,
         )
 
+    async def warm_up(self) -> None:
+        """Prepare the agent ahead of the first request."""
+        await self.agent.warm_up()
+
+    async def shutdown(self) -> None:
+        """Stop the sweep worker processes."""
+        if self.sweep is not None:
+            await asyncio.to_thread(self.sweep.shutdown)
+
     @override
     async def execute(
         self,
@@ -52,65 +103,127 @@ class TechnicalAnalyserAgentExecutor(AgentExecutor):
             task = new_task(context.message)
             event_queue.enqueue_event(task)
 
-        async for event in self.agent.stream(query):
-            if event.is_task_complete:
-                event_queue.enqueue_event(
-                    TaskArtifactUpdateEvent(
-                        append=False,
-                        contextId=task.contextId,
-                        taskId=task.id,
-                        lastChunk=True,
-                        artifact=new_text_artifact(
-                            name="current_result",
-                            description="Result of request to agent.",
-                            text=event.content,
-                        ),
-                    )
-                )
-                event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        status=TaskStatus(state=TaskState.completed),
-                        final=True,
-                        contextId=task.contextId,
-                        taskId=task.id,
-                    )
-                )
-            elif event.require_user_input:
-                event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        status=TaskStatus(
-                            state=TaskState.input_required,
-                            message=new_agent_text_message(
-                                event.content,
-                                task.contextId,
-                                task.id,
-                            ),
-                        ),
-                        final=True,
-                        contextId=task.contextId,
-                        taskId=task.id,
-                    )
-                )
-            else:
-                event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        append=True,
-                        status=TaskStatus(
-                            state=TaskState.working,
-                            message=new_agent_text_message(
-                                event.content,
-                                task.contextId,
-                                task.id,
-                            ),
+        # Tool calls beyond the concurrency limits are queued per task.
+        tool_call_owner.set(task.id)
+
+        # Cancelling the execution, on a deadline, a `tasks/cancel` request
+        # or a client disconnect, stops the LLM stream and closes the MCP
+        # sessions in flight.
+        deadline = asyncio.timeout(self.timeout)
+        try:
+            async with deadline:
+                async for event in self.agent.stream(query):
+                    if event.is_task_complete:
+                        event_queue.enqueue_event(
+                            TaskArtifactUpdateEvent(
+                                append=False,
+                                contextId=task.contextId,
+                                taskId=task.id,
+                                lastChunk=True,
+                                artifact=new_text_artifact(
+                                    name="current_result",
+                                    description="Result of request to agent.",
+                                    text=event.content,
+                                ),
+                            )
+                        )
+                        event_queue.enqueue_event(
+                            TaskStatusUpdateEvent(
+                                status=TaskStatus(state=TaskState.completed),
+                                final=True,
+                                contextId=task.contextId,
+                                taskId=task.id,
+                            )
+                        )
+                    elif event.require_user_input:
+                        event_queue.enqueue_event(
+                            TaskStatusUpdateEvent(
+                                status=TaskStatus(
+                                    state=TaskState.input_required,
+                                    message=new_agent_text_message(
+                                        event.content,
+                                        task.contextId,
+                                        task.id,
+                                    ),
+                                ),
+                                final=True,
+                                contextId=task.contextId,
+                                taskId=task.id,
+                            )
+                        )
+                    else:
+                        # Large tool results are published once, in full,
+                        # while the status messages only carry a summary.
+                        for handle in event.artifacts:
+                            text = await asyncio.to_thread(
+                                self.agent.artifact_store.get, handle
+                            )
+                            event_queue.enqueue_event(
+                                TaskArtifactUpdateEvent(
+                                    append=False,
+                                    contextId=task.contextId,
+                                    taskId=task.id,
+                                    lastChunk=True,
+                                    artifact=new_text_artifact(
+                                        name=handle,
+                                        description="Full tool result.",
+                                        text=text,
+                                    ),
+                                )
+                            )
+                        message = new_agent_text_message(
+                            event.content, task.contextId, task.id
+                        )
+                        if event.is_progress:
+                            message.metadata = {"progress": True}
+                        event_queue.enqueue_event(
+                            TaskStatusUpdateEvent(
+                                append=True,
+                                status=TaskStatus(
+                                    state=TaskState.working,
+                                    message=message,
+                                ),
+                                final=False,
+                                contextId=task.contextId,
+                                taskId=task.id,
+                            )
+                        )
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            event_queue.enqueue_event(
+                TaskStatusUpdateEvent(
+                    status=TaskStatus(
+                        state=TaskState.failed,
+                        message=new_agent_text_message(
+                            f"Deadline of {self.timeout} seconds exceeded.",
+                            task.contextId,
+                            task.id,
                         ),
-                        final=False,
-                        contextId=task.contextId,
-                        taskId=task.id,
-                    )
+                    ),
+                    final=True,
+                    contextId=task.contextId,
+                    taskId=task.id,
                 )
+            )
 
     @override
     async def cancel(
         self, context: RequestContext, event_queue: EventQueue
     ) -> None:
-        raise Exception("cancel not supported")
+        task = context.current_task
+        if not task:
+            raise ServerError(error=TaskNotFoundError())
+        if task.status.state in TERMINAL_STATES:
+            raise ServerError(error=TaskNotCancelableError())
+
+        # The request handler cancels the running execution once the
+        # canceled status has been published.
+        event_queue.enqueue_event(
+            TaskStatusUpdateEvent(
+                status=TaskStatus(state=TaskState.canceled),
+                final=True,
+                contextId=task.contextId,
+                taskId=task.id,
+            )
+        )
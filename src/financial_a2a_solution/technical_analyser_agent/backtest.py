@@ -0,0 +1,300 @@
+import csv
+import functools
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from financial_a2a_solution.local_tools import LocalToolbox
+
+
+@dataclass
+class PriceHistory:
+    """Daily bars of an asset, oldest first.
+
+    Args:
+        dates (list[str]): The date of every bar.
+        open (np.ndarray): The opening prices.
+        close (np.ndarray): The closing prices.
+    """
+
+    dates: list[str]
+    open: np.ndarray
+    close: np.ndarray
+
+
+@dataclass
+class BacktestResult:
+    """The outcome of a backtest.
+
+    Args:
+        equity (np.ndarray): The equity at the close of every bar.
+        trade_returns (np.ndarray): The return of every trade, net of commissions.
+        exposure (float): The fraction of the bars with an open position.
+        buy_and_hold_return (float): The return of holding the asset over the period.
+    """  # noqa: E501
+
+    equity: np.ndarray
+    trade_returns: np.ndarray
+    exposure: float
+    buy_and_hold_return: float
+
+    @property
+    def total_return(self) -> float:
+        """The return of the strategy over the period."""
+        return float(self.equity[-1] / self.equity[0] - 1)
+
+    @property
+    def max_drawdown(self) -> float:
+        """The largest fall of the equity from a previous peak."""
+        peaks = np.maximum.accumulate(self.equity)
+        return float((self.equity / peaks - 1).min())
+
+
+def sma(values: np.ndarray, n: int) -> np.ndarray:
+    """Compute a simple moving average.
+
+    Args:
+        values (np.ndarray): The series.
+        n (int): The window length.
+
+    Returns:
+        np.ndarray: The average of the last `n` values, NaN for the first `n - 1` bars.
+    """  # noqa: E501
+    averages = np.full(len(values), np.nan)
+    if n <= len(values):
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        averages[n - 1 :] = (sums[n:] - sums[:-n]) / n
+    return averages
+
+
+def backtest_cross_moving_average(  # noqa: PLR0913
+    prices: PriceHistory,
+    n1: int,
+    n2: int,
+    cash: float = 10000,
+    commission: float = 0.002,
+    *,
+    short: bool = True,
+) -> BacktestResult:
+    """Backtest a moving average crossover strategy.
+
+    A long position is opened when the `n1`-bar average crosses above the
+    `n2`-bar average and reversed into a short one (or closed, without
+    `short`) when it crosses below. Orders are filled at the open of the
+    next bar with every unit the equity can buy, and `commission` is
+    charged on the value of every fill. A position still open at the end
+    is valued at the last close, without a closing commission.
+
+    The signals, the fills and the equity curve are computed on whole
+    arrays; only the sizing, which depends on the equity left by the
+    previous trade, is done per trade.
+
+    Args:
+        prices (PriceHistory): The bars to trade.
+        n1 (int): The window of the fast moving average.
+        n2 (int): The window of the slow moving average.
+        cash (float): The initial cash.
+        commission (float): The commission as a fraction of the traded value.
+        short (bool): Whether a cross below opens a short position.
+
+    Returns:
+        BacktestResult: The equity curve and the trades.
+    """
+    if not 0 < n1 < n2:
+        raise ValueError("The windows must satisfy 0 < n1 < n2")
+    close = prices.close
+    bars = len(close)
+    if bars < 2:  # noqa: PLR2004
+        raise ValueError("At least two bars are needed")
+
+    spread = sma(close, n1) - sma(close, n2)
+    above, below = spread > 0, spread < 0
+    crosses = np.flatnonzero(
+        (above[1:] & below[:-1]) | (below[1:] & above[:-1])
+    )
+    # A signal at the close of a bar is filled at the open of the next one.
+    fills = crosses + 2
+    directions = np.where(above[crosses + 1], 1, -1 if short else 0)
+    keep = fills < bars
+    fills, directions = fills[keep], directions[keep]
+
+    entries = prices.open[fills]
+    exits = np.append(prices.open[fills[1:]], close[-1])
+    # Like the equity curve, the trade still open at the end is valued at
+    # the last close without the commission of closing it.
+    exit_commissions = np.full(len(fills), commission)
+    exit_commissions[-1:] = 0.0
+    units = np.zeros(len(fills))
+    trade_returns = np.zeros(len(fills))
+    starts = np.zeros(len(fills))
+    equity = float(cash)
+    for trade, (direction, entry, exit_, exit_commission) in enumerate(
+        zip(directions, entries, exits, exit_commissions, strict=True)
+    ):
+        starts[trade] = equity
+        if direction == 0:
+            continue
+        units[trade] = math.floor(equity / (entry * (1 + commission)))
+        profit = units[trade] * (
+            direction * (exit_ - entry)
+            - entry * commission
+            - exit_ * exit_commission
+        )
+        trade_returns[trade] = profit / equity
+        equity += profit
+
+    curve = np.full(bars, float(cash))
+    if len(fills):
+        # The trade open at every bar, -1 before the first fill.
+        trade_of_bar = np.searchsorted(fills, np.arange(bars), side="right") - 1
+        held = trade_of_bar >= 0
+        trade = trade_of_bar[held]
+        curve[held] = (
+            starts[trade]
+            - units[trade] * entries[trade] * commission
+            + directions[trade] * units[trade] * (close[held] - entries[trade])
+        )
+        exposure = float(np.count_nonzero(directions[trade] != 0) / bars)
+    else:
+        exposure = 0.0
+    traded = directions != 0
+    return BacktestResult(
+        equity=curve,
+        trade_returns=trade_returns[traded],
+        exposure=exposure,
+        buy_and_hold_return=float(close[-1] / close[0] - 1),
+    )
+
+
+def format_result(
+    symbol: str, prices: PriceHistory, result: BacktestResult
+) -> str:
+    """Describe a backtest in a few lines.
+
+    Args:
+        symbol (str): The traded asset.
+        prices (PriceHistory): The traded bars.
+        result (BacktestResult): The outcome of the backtest.
+
+    Returns:
+        str: The statistics of the backtest.
+    """
+    trades = result.trade_returns
+    lines = [
+        f"Symbol: {symbol}",
+        f"Start: {prices.dates[0]}",
+        f"End: {prices.dates[-1]}",
+        f"Bars: {len(prices.dates)}",
+        f"Exposure Time: {result.exposure:.2%}",
+        f"Equity Final: {result.equity[-1]:.2f}",
+        f"Equity Peak: {result.equity.max():.2f}",
+        f"Return: {result.total_return:.2%}",
+        f"Buy & Hold Return: {result.buy_and_hold_return:.2%}",
+        f"Max. Drawdown: {result.max_drawdown:.2%}",
+        f"# Trades: {len(trades)}",
+    ]
+    if len(trades):
+        lines += [
+            f"Win Rate: {np.count_nonzero(trades > 0) / len(trades):.2%}",
+            f"Best Trade: {trades.max():.2%}",
+            f"Worst Trade: {trades.min():.2%}",
+            f"Avg. Trade: {trades.mean():.2%}",
+        ]
+    return "\n".join(lines)
+
+
+class CSVPriceLoader:
+    """Load daily bars from `<directory>/<symbol>.csv` files.
+
+    The files need a date column ("Date" or "Datetime"), an "Open" and a
+    "Close" column, in any case, and are read once per symbol. The ":" of a
+    symbol such as "SET:KBANK" is replaced by "_" in the file name.
+
+    Args:
+        directory (str | Path): The directory of the price files.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.load = functools.lru_cache(maxsize=64)(self._load)
+
+    def __call__(self, symbol: str) -> PriceHistory:
+        """Return the bars of an asset.
+
+        Args:
+            symbol (str): The asset, e.g. "SET:KBANK".
+
+        Returns:
+            PriceHistory: The bars, oldest first.
+        """
+        return self.load(symbol.upper())
+
+    def _load(self, symbol: str) -> PriceHistory:
+        path = self.directory / f"{symbol.replace(':', '_')}.csv"
+        if not path.exists():
+            raise FileNotFoundError(f"No price data for {symbol}")
+        with path.open(newline="", encoding="utf-8") as file:
+            rows = list(csv.reader(file))
+        header = [column.strip().lower() for column in rows[0]]
+        date = header.index("date" if "date" in header else "datetime")
+        open_, close = header.index("open"), header.index("close")
+        bars = sorted(
+            (row[date], float(row[open_]), float(row[close]))
+            for row in rows[1:]
+            if row
+        )
+        return PriceHistory(
+            dates=[bar[0] for bar in bars],
+            open=np.array([bar[1] for bar in bars]),
+            close=np.array([bar[2] for bar in bars]),
+        )
+
+
+def register_backtest_tools(
+    toolbox: LocalToolbox, loader: CSVPriceLoader
+) -> None:
+    """Register the in-process backtest tool.
+
+    Args:
+        toolbox (LocalToolbox): The toolbox of the agent.
+        loader (CSVPriceLoader): Loads the bars of a symbol.
+    """
+
+    def backtest_moving_average_crossover(  # noqa: PLR0913
+        *,
+        symbol: str,
+        n1: int,
+        n2: int,
+        cash: float = 10000,
+        commission: float = 0.002,
+        short: bool = True,
+    ) -> str:
+        prices = loader(symbol)
+        result = backtest_cross_moving_average(
+            prices, int(n1), int(n2), cash, commission, short=short
+        )
+        return format_result(symbol, prices, result)
+
+    toolbox.add(
+        backtest_moving_average_crossover,
+        {
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string"},
+                "n1": {"type": "integer"},
+                "n2": {"type": "integer"},
+                "cash": {"type": "number", "default": 10000},
+                "commission": {"type": "number", "default": 0.002},
+                "short": {"type": "boolean", "default": True},
+            },
+            "required": ["symbol", "n1", "n2"],
+        },
+        description=(
+            "Backtest a strategy going long when the n1-day moving average "
+            "crosses above the n2-day one and short when it crosses below, "
+            "on the daily prices of a symbol such as SET:KBANK. Runs "
+            "in-process in milliseconds."
+        ),
+    )
@@ -1,3 +1,45 @@
 import os
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+
+
+def get_agent_request_timeout() -> float | None:
+    """Return the deadline of a request.
+
+    The environment is read on each call, so the variable may come from the
+    env file loaded by `main`.
+
+    Returns:
+        float | None: `AGENT_REQUEST_TIMEOUT` in seconds, 300 by default, or None for no deadline when it is 0.
+    """  # noqa: E501
+    return float(os.getenv("AGENT_REQUEST_TIMEOUT") or 300) or None
+
+
+def get_price_data_dir() -> str | None:
+    """Return the directory of the bars used by the in-process backtest tool.
+
+    The environment is read on each call, so the variable may come from the
+    env file loaded by `main`.
+
+    Returns:
+        str | None: `PRICE_DATA_DIR`, holding one `<symbol>.csv` of daily bars per symbol, or None if the tool is disabled.
+    """  # noqa: E501
+    return os.getenv("PRICE_DATA_DIR") or None
+
+
+def get_sweep_workers() -> int | None:
+    """Return the number of worker processes of the parameter sweep tool.
+
+    Returns:
+        int | None: `SWEEP_WORKERS`, or None for one per CPU when it is unset or 0.
+    """  # noqa: E501
+    return int(os.getenv("SWEEP_WORKERS") or 0) or None
+
+
+def get_sweep_max_combinations() -> int:
+    """Return the largest grid accepted by the parameter sweep tool.
+
+    Returns:
+        int: `SWEEP_MAX_COMBINATIONS`, 2500 by default.
+    """
+    return int(os.getenv("SWEEP_MAX_COMBINATIONS") or 2500)
@@ -0,0 +1,295 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from financial_a2a_solution.local_tools import LocalToolbox
+from financial_a2a_solution.technical_analyser_agent.backtest import (
+    CSVPriceLoader,
+    PriceHistory,
+    backtest_cross_moving_average,
+)
+from financial_a2a_solution.technical_analyser_agent.constant import (
+    get_sweep_max_combinations,
+    get_sweep_workers,
+)
+
+
+@dataclass
+class SweepResult:
+    """The outcome of the backtest of one parameter combination.
+
+    Args:
+        n1 (int): The window of the fast moving average.
+        n2 (int): The window of the slow moving average.
+        total_return (float): The return over the period.
+        max_drawdown (float): The largest fall from a previous peak.
+        trades (int): The number of trades.
+        win_rate (float): The fraction of the trades with a profit.
+    """
+
+    n1: int
+    n2: int
+    total_return: float
+    max_drawdown: float
+    trades: int
+    win_rate: float
+
+
+def parameter_grid(
+    n1_values: list[int], n2_values: list[int]
+) -> list[tuple[int, int]]:
+    """Build the combinations of windows to backtest.
+
+    Args:
+        n1_values (list[int]): The windows of the fast moving average.
+        n2_values (list[int]): The windows of the slow moving average.
+
+    Returns:
+        list[tuple[int, int]]: Every `(n1, n2)` pair with `0 < n1 < n2`.
+    """
+    return [
+        (n1, n2)
+        for n1 in sorted(set(n1_values))
+        for n2 in sorted(set(n2_values))
+        if 0 < n1 < n2
+    ]
+
+
+def _attach(name: str) -> SharedMemory:
+    try:
+        return SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        # Before Python 3.13 attaching registers the block for removal when
+        # the worker exits, while the parent still owns it.
+        shared = SharedMemory(name=name)
+        resource_tracker.unregister(shared._name, "shared_memory")  # type: ignore[attr-defined]  # noqa: SLF001
+        return shared
+
+
+def _sweep_chunk(  # noqa: PLR0913, PLR0917
+    name: str,
+    bars: int,
+    pairs: list[tuple[int, int]],
+    cash: float,
+    commission: float,
+    short: bool,
+) -> list[SweepResult]:
+    shared = _attach(name)
+    try:
+        data = np.ndarray((2, bars), dtype=np.float64, buffer=shared.buf)
+        prices = PriceHistory(dates=[], open=data[0], close=data[1])
+        results = []
+        for n1, n2 in pairs:
+            result = backtest_cross_moving_average(
+                prices, n1, n2, cash, commission, short=short
+            )
+            trades = result.trade_returns
+            results.append(
+                SweepResult(
+                    n1=n1,
+                    n2=n2,
+                    total_return=result.total_return,
+                    max_drawdown=result.max_drawdown,
+                    trades=len(trades),
+                    win_rate=float(np.mean(trades > 0)) if len(trades) else 0.0,
+                )
+            )
+        # The views must be released before the block is closed.
+        del data, prices
+        return results
+    finally:
+        shared.close()
+
+
+class ParameterSweep:
+    """Backtest a grid of strategy parameters on a pool of processes.
+
+    The bars are copied once per sweep into a shared memory block that the
+    workers read in place, and the grid is split in one chunk per worker.
+    The pool is started on first use and kept for the later sweeps.
+
+    Args:
+        workers (int | None): The number of worker processes. Defaults to `SWEEP_WORKERS`, or one per CPU.
+        max_combinations (int | None): The largest grid accepted in one sweep. Defaults to `SWEEP_MAX_COMBINATIONS`.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        max_combinations: int | None = None,
+    ):
+        self.workers = (
+            workers or get_sweep_workers() or multiprocessing.cpu_count()
+        )
+        self.max_combinations = max_combinations or get_sweep_max_combinations()
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """The worker processes."""
+        if self._pool is None:
+            # Forking a process running the event loop threads is unsafe.
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    async def run(
+        self,
+        prices: PriceHistory,
+        pairs: list[tuple[int, int]],
+        cash: float = 10000,
+        commission: float = 0.002,
+        *,
+        short: bool = True,
+    ) -> list[SweepResult]:
+        """Backtest every parameter combination.
+
+        Args:
+            prices (PriceHistory): The bars to trade.
+            pairs (list[tuple[int, int]]): The `(n1, n2)` windows to backtest.
+            cash (float): The initial cash.
+            commission (float): The commission as a fraction of the traded value.
+            short (bool): Whether a cross below opens a short position.
+
+        Returns:
+            list[SweepResult]: The results, best return first.
+        """  # noqa: E501
+        if not pairs:
+            raise ValueError("No combination with 0 < n1 < n2 to backtest")
+        if len(pairs) > self.max_combinations:
+            raise ValueError(
+                f"{len(pairs)} combinations exceed the limit of "
+                f"{self.max_combinations}"
+            )
+        bars = len(prices.close)
+        shared = SharedMemory(create=True, size=2 * bars * 8)
+        try:
+            data = np.ndarray((2, bars), dtype=np.float64, buffer=shared.buf)
+            data[0], data[1] = prices.open, prices.close
+            del data
+            chunks = [pairs[i :: self.workers] for i in range(self.workers)]
+            futures = [
+                self.pool.submit(
+                    _sweep_chunk,
+                    shared.name,
+                    bars,
+                    chunk,
+                    cash,
+                    commission,
+                    short,
+                )
+                for chunk in chunks
+                if chunk
+            ]
+            try:
+                results = await asyncio.gather(
+                    *(asyncio.wrap_future(future) for future in futures)
+                )
+            except BaseException:
+                # On a cancellation or a failed chunk, the queued chunks are
+                # dropped and the running ones must end before the block
+                # they read is removed.
+                for future in futures:
+                    future.cancel()
+                await asyncio.to_thread(wait, futures)
+                raise
+        finally:
+            shared.close()
+            shared.unlink()
+        return sorted(
+            (result for chunk in results for result in chunk),
+            key=lambda result: result.total_return,
+            reverse=True,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+def format_sweep(
+    symbol: str, bars: int, results: list[SweepResult], top: int
+) -> str:
+    """Summarize a sweep as a ranked table.
+
+    Args:
+        symbol (str): The traded asset.
+        bars (int): The number of bars backtested.
+        results (list[SweepResult]): The results, best first.
+        top (int): The number of combinations listed.
+
+    Returns:
+        str: The best combinations.
+    """
+    shown = min(top, len(results))
+    title = (
+        f"Swept {len(results)} combinations on {bars} bars of {symbol}, "
+        f"top {shown} by return:"
+    )
+    lines = [title, "rank|n1|n2|return|max_drawdown|trades|win_rate"]
+    lines.extend(
+        f"{rank}|{r.n1}|{r.n2}|{r.total_return:.2%}|{r.max_drawdown:.2%}|"
+        f"{r.trades}|{r.win_rate:.2%}"
+        for rank, r in enumerate(results[:top], start=1)
+    )
+    return "\n".join(lines)
+
+
+def register_sweep_tool(
+    toolbox: LocalToolbox, loader: CSVPriceLoader, sweep: ParameterSweep
+) -> None:
+    """Register the parameter sweep tool.
+
+    Args:
+        toolbox (LocalToolbox): The toolbox of the agent.
+        loader (CSVPriceLoader): Loads the bars of a symbol.
+        sweep (ParameterSweep): Runs the backtests.
+    """
+
+    async def sweep_moving_average_crossover(  # noqa: PLR0913
+        *,
+        symbol: str,
+        n1: list[int],
+        n2: list[int],
+        cash: float = 10000,
+        commission: float = 0.002,
+        short: bool = True,
+        top: int = 10,
+    ) -> str:
+        prices = await asyncio.to_thread(loader, symbol)
+        pairs = parameter_grid([int(n) for n in n1], [int(n) for n in n2])
+        results = await sweep.run(prices, pairs, cash, commission, short=short)
+        return format_sweep(symbol, len(prices.close), results, int(top))
+
+    windows = {"type": "array", "items": {"type": "integer"}}
+    toolbox.add(
+        sweep_moving_average_crossover,
+        {
+            "type": "object",
+            "properties": {
+                "symbol": {"type": "string"},
+                "n1": windows,
+                "n2": windows,
+                "cash": {"type": "number", "default": 10000},
+                "commission": {"type": "number", "default": 0.002},
+                "short": {"type": "boolean", "default": True},
+                "top": {"type": "integer", "default": 10},
+            },
+            "required": ["symbol", "n1", "n2"],
+        },
+        description=(
+            "Backtest the moving average crossover strategy for every "
+            "combination of the given n1 and n2 windows (n1 < n2) on the "
+            "daily prices of a symbol such as SET:KBANK, in one call, and "
+            "return the best combinations ranked by return. Use it instead "
+            "of backtesting the combinations one by one."
+        ),
+    )
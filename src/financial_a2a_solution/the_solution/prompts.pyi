@@ -18,3 +18,22 @@ def get_agent_decide_prompt(
     agent_prompt: str,
     tone: str | None = None,
 ) -> str: ...
+def get_tools_prompts(py_batch: list[list[Tool]]) -> list[str]: ...
+def get_called_tools_history_prompts(
+    py_batch: list[list[CalledTool]],
+) -> list[str]: ...
+def get_agent_answer_prompts(
+    py_batch: list[list[AgentAnswer]],
+) -> list[str]: ...
+def get_available_agents_prompts(
+    py_batch: list[list[AgentCard]] | list[tuple[AgentCard, ...]],
+) -> list[str]: ...
+
+class ToolPromptSession:
+    def __init__(
+        self, question: str, tool_prompt: str, tone: str | None = None
+    ) -> None: ...
+    def update(self, py_called_tools: list[CalledTool]) -> int: ...
+    def history(self) -> str: ...
+    def prompt(self) -> str: ...
+    def __len__(self) -> int: ...
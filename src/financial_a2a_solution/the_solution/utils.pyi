@@ -1,5 +1,67 @@
-from financial_a2a_solution.types import Tag
+from financial_a2a_solution.types import Tag, TagEvent
 
 
 def parse_streamed_tags(stream: str) -> list[Tag]:
     pass
+
+
+def extract_json_block(
+    stream: str, tag: str | None = None
+) -> list | dict | str | int | float | bool | None:
+    pass
+
+
+def parse_last_tag(stream: str) -> Tag | None:
+    pass
+
+
+def parse_tag_spans(stream: str) -> list[TagSpan]:
+    pass
+
+
+class TagSpan:
+    @property
+    def tag(self) -> str:
+        pass
+
+    @property
+    def attributes(self) -> dict[str, str]:
+        pass
+
+    @property
+    def start(self) -> int:
+        pass
+
+    @property
+    def content_start(self) -> int:
+        pass
+
+    @property
+    def content_end(self) -> int:
+        pass
+
+    @property
+    def end(self) -> int:
+        pass
+
+    @property
+    def is_complete(self) -> bool:
+        pass
+
+    def content(self, stream: str) -> str:
+        pass
+
+
+class TagParser:
+    def __init__(self) -> None:
+        pass
+
+    def feed(self, chunk: str) -> list[TagEvent]:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+    @property
+    def tag_count(self) -> int:
+        pass
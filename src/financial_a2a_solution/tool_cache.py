@@ -0,0 +1,154 @@
+import asyncio
+import fnmatch
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from mcp.types import CallToolResult
+
+from financial_a2a_solution.cache import (
+    DiskCache,
+    MemoryCache,
+    TieredCache,
+    make_key,
+)
+from financial_a2a_solution.constant import (
+    MCP_TOOL_CACHE,
+    MCP_TOOL_CACHE_ALLOW,
+    MCP_TOOL_CACHE_DENY,
+    MCP_TOOL_CACHE_DIR,
+    MCP_TOOL_CACHE_MAX_ENTRIES,
+    MCP_TOOL_CACHE_TTL,
+    MCP_TOOL_CACHE_TTLS,
+)
+
+
+def canonicalize_arguments(arguments: dict[str, Any] | None) -> str:
+    """Serialize tool arguments so equal arguments give the same string.
+
+    Args:
+        arguments (dict[str, Any] | None): The arguments of a tool call.
+
+    Returns:
+        str: The arguments as compact JSON with sorted keys.
+    """
+    return json.dumps(
+        arguments or {}, sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+class ToolResultCache:
+    """Cache of MCP tool results.
+
+    Results are keyed by the server, the tool name and the canonicalized
+    arguments. Only successful results are stored. A tool is cached when it
+    matches no pattern of the deny list and, if an allow list is given, one
+    of its patterns.
+
+    Args:
+        ttl (float): The default time to live of a result in seconds.
+        tool_ttls (dict[str, float] | None): Per-tool TTLs keyed by tool name. A TTL of 0 disables caching for that tool.
+        allow (list[str] | None): Glob patterns of the tools to cache. Every tool is allowed when empty.
+        deny (list[str] | None): Glob patterns of the tools never cached.
+        cache (TieredCache | None): The backing store. Defaults to an in-memory LRU, backed by disk when `MCP_TOOL_CACHE_DIR` is set.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        ttl: float = MCP_TOOL_CACHE_TTL,
+        tool_ttls: dict[str, float] | None = None,
+        allow: list[str] | None = None,
+        deny: list[str] | None = None,
+        cache: TieredCache | None = None,
+    ):
+        self.ttl = ttl
+        self.tool_ttls = MCP_TOOL_CACHE_TTLS if tool_ttls is None else tool_ttls
+        self.allow = MCP_TOOL_CACHE_ALLOW if allow is None else allow
+        self.deny = MCP_TOOL_CACHE_DENY if deny is None else deny
+        if cache is None:
+            disk = None
+            if MCP_TOOL_CACHE_DIR:
+                disk = DiskCache(MCP_TOOL_CACHE_DIR)
+            cache = TieredCache(
+                MemoryCache(max_entries=MCP_TOOL_CACHE_MAX_ENTRIES), disk
+            )
+        self.cache = cache
+
+    def ttl_for(self, tool_name: str) -> float:
+        """Return the TTL of the results of a tool, 0 if it is not cached.
+
+        Args:
+            tool_name (str): The tool name.
+
+        Returns:
+            float: The TTL in seconds.
+        """
+        if any(fnmatch.fnmatchcase(tool_name, p) for p in self.deny):
+            return 0
+        if self.allow and not any(
+            fnmatch.fnmatchcase(tool_name, p) for p in self.allow
+        ):
+            return 0
+        return self.tool_ttls.get(tool_name, self.ttl)
+
+    def key(
+        self, server: str, tool_name: str, arguments: dict[str, Any] | None
+    ) -> str:
+        """Build the cache key of a tool call.
+
+        Args:
+            server (str): The URL or the command of the MCP server.
+            tool_name (str): The tool name.
+            arguments (dict[str, Any] | None): The arguments of the call.
+
+        Returns:
+            str: The cache key.
+        """
+        return make_key(server, tool_name, canonicalize_arguments(arguments))
+
+    async def call(
+        self,
+        server: str,
+        tool_name: str,
+        arguments: dict[str, Any] | None,
+        call: Callable[[], Awaitable[CallToolResult]],
+    ) -> CallToolResult:
+        """Return the cached result of a tool call, or make the call.
+
+        Args:
+            server (str): The URL or the command of the MCP server.
+            tool_name (str): The tool name.
+            arguments (dict[str, Any] | None): The arguments of the call.
+            call (Callable[[], Awaitable[CallToolResult]]): Makes the call on a cache miss.
+
+        Returns:
+            CallToolResult: The result of the tool call.
+        """  # noqa: E501
+        ttl = self.ttl_for(tool_name)
+        if ttl <= 0:
+            return await call()
+        key = self.key(server, tool_name, arguments)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return CallToolResult.model_validate(cached)
+        result = await call()
+        if not result.isError:
+            await asyncio.to_thread(
+                self.cache.set, key, result.model_dump(mode="json"), ttl
+            )
+        return result
+
+
+_tool_result_cache: ToolResultCache | None = None
+
+
+def get_tool_result_cache() -> ToolResultCache | None:
+    """Return the process-wide tool result cache.
+
+    Returns:
+        ToolResultCache | None: The cache, or None unless the `MCP_TOOL_CACHE` env variable is set.
+    """  # noqa: E501
+    global _tool_result_cache  # noqa: PLW0603
+    if MCP_TOOL_CACHE and _tool_result_cache is None:
+        _tool_result_cache = ToolResultCache()
+    return _tool_result_cache
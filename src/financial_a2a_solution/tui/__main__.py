@@ -80,7 +80,21 @@ class DataKarateChatApp(App):
         yield Footer()
 
     def on_mount(self) -> None:
-        """Called when the application is mounted. Currently does nothing."""
+        """Create the client agent shared by every prompt of the session."""
+        load_dotenv(".env")
+        self.client_agent = ClientAgent(
+            mode="stream",
+            token_stream_callback=None,
+            agent_urls=[
+                "http://localhost:9999",  # Balance sheet agent
+                "http://localhost:9998",  # Technical analyser agent
+            ],
+            agent_prompt="Act as a financial expert and answer the question in a formal, robust and convincing tone.",  # noqa: E501
+        )
+
+    async def on_unmount(self) -> None:
+        """Close the pooled connections of the client agent."""
+        await self.client_agent.close()
 
     @on(Input.Submitted)
     async def on_input(self, event: Input.Submitted) -> None:
@@ -142,22 +156,21 @@ class DataKarateChatApp(App):
             .replace("</selected_agents>", "")
         )
 
-    @work(thread=True)
+    @work()
     async def send_prompt(self, prompt: str) -> None:
         """Send the user's prompt to the agent, stream the response, and update the UI accordingly.
 
         Args:
             prompt (str): The user's input prompt.
         """  # noqa: E501
-        response_content = ""
+        parser = utils.TagParser()
         if prompt == "/exit":
             self.exit()
-        llm_response = stream_from_a2a(prompt)
+        llm_response = stream_from_a2a(self.client_agent, prompt)
         agent_blocks: list[MainAgent | Agent] = []
         active_agent_name: str | None = None
         async for chunk in llm_response:
-            response_content += chunk
-            streamed_tags = utils.parse_streamed_tags(response_content)
+            streamed_tags = parser.feed(chunk)
             if streamed_tags:
                 last_tag = streamed_tags[-1]
 
@@ -173,15 +186,12 @@ class DataKarateChatApp(App):
 
                     if create_new_main_agent_block_flag:
                         # Set the active agent name
-                        main_agent = self.call_from_thread(
-                            self.mount_main_agent,
-                        )
+                        main_agent = await self.mount_main_agent()
                         agent_blocks.append(main_agent)
                         active_agent_name = "Main Agent"
 
                     main_agent.anchor()
-                    self.call_from_thread(
-                        main_agent.update,
+                    await main_agent.update(
                         self.render_content(last_tag["content"]),
                     )
 
@@ -199,8 +209,7 @@ class DataKarateChatApp(App):
 
                     if create_new_agent_block_flag:
                         active_agent_name = agent_name
-                        agent = self.call_from_thread(
-                            self.mount_agent,
+                        agent = await self.mount_agent(
                             border_title=last_tag["attributes"].get(
                                 "name", "Agent"
                             ),
@@ -209,35 +218,23 @@ class DataKarateChatApp(App):
 
                     # Update the agent block with the new content
                     agent.anchor()
-                    self.call_from_thread(
-                        agent.update,
+                    await agent.update(
                         self.render_content(last_tag["content"]),
                     )
 
 
 async def stream_from_a2a(
-    prompt: str
+    agent: ClientAgent, prompt: str
 ) -> AsyncGenerator[str, None]:
     """Stream the response from the A2A agent for a given prompt.
 
     Args:
+        agent (ClientAgent): The client agent shared by the session.
         prompt (str): The user's input prompt.
 
     Yields:
         str: Chunks of the agent's response as they are received.
     """
-    balance_sheet_agent_url = "http://localhost:9999"
-    technical_analyser_agent_url = "http://localhost:9998"
-    env_file = ".env"
-
-    load_dotenv(env_file)
-    agent = ClientAgent(
-        mode="stream",
-        token_stream_callback=None,
-        agent_urls=[balance_sheet_agent_url, technical_analyser_agent_url],
-        agent_prompt="Act as a financial expert and answer the question in a formal, robust and convincing tone.",  # noqa: E501
-    )
-
     async for chunk in agent.stream(prompt):
         yield chunk
 
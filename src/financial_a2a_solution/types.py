@@ -9,6 +9,10 @@ class Tag(TypedDict):
     is_complete: bool
 
 
+class TagEvent(Tag):
+    index: int
+
+
 class Tool(BaseModel):
     name: str
     description: str
@@ -20,6 +24,7 @@ class CalledTool(BaseModel):
     arguments: str
     isError: bool
     result: str
+    artifact: str | None = None
 
 
 class AgentAnswer(BaseModel):
@@ -3,33 +3,95 @@ mod utils;
 
 use once_cell::sync::Lazy;
 use prompts::get_tera;
-use prompts::{Tool, CalledTool, AgentAnswer, AgentCard};
+use prompts::{Tool, CalledTool, AgentAnswer, AgentCard, ToolPromptSession};
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
+use serde::Serialize;
+use std::thread;
 use tera::{Context, Tera};
-use utils::parse_streamed_tags;
+use utils::{extract_json_block, parse_last_tag, parse_streamed_tags, parse_tag_spans, TagParser, TagSpan};
 
 static TERA: Lazy<Tera> = Lazy::new(get_tera);
 
+/// Render a template with the GIL released, so other Python threads keep
+/// running while Tera works
+fn render(py: Python<'_>, template: &str, context: Context) -> PyResult<String> {
+    py.allow_threads(|| TERA.render(template, &context))
+        .map_err(|err| PyValueError::new_err(err.to_string()))
+}
+
+/// Render a template for every context in parallel, one scoped thread per
+/// core, with the GIL released
+fn render_all(py: Python<'_>, template: &str, contexts: Vec<Context>) -> PyResult<Vec<String>> {
+    py.allow_threads(|| {
+        let threads = thread::available_parallelism().map_or(1, |n| n.get());
+        let chunk_size = contexts.len().div_ceil(threads).max(1);
+        thread::scope(|scope| {
+            let workers: Vec<_> = contexts
+                .chunks(chunk_size)
+                .map(|chunk| {
+                    scope.spawn(move || {
+                        chunk
+                            .iter()
+                            .map(|context| TERA.render(template, context))
+                            .collect::<Result<Vec<_>, _>>()
+                    })
+                })
+                .collect();
+            workers
+                .into_iter()
+                .map(|worker| worker.join().expect("prompt rendering thread panicked"))
+                .collect::<Result<Vec<_>, _>>()
+        })
+        .map(|chunks| chunks.into_iter().flatten().collect())
+    })
+    .map_err(|err| PyValueError::new_err(err.to_string()))
+}
+
+/// Convert a batch of inputs to contexts, holding the GIL only for that
+fn contexts<T: Serialize>(batch: Vec<Vec<T>>, key: &str) -> Vec<Context> {
+    batch
+        .iter()
+        .map(|items| {
+            let mut context = Context::new();
+            context.insert(key, items);
+            context
+        })
+        .collect()
+}
+
 #[pyfunction]
-pub fn get_tools_prompt(py_tools: Bound<'_, PyAny>) -> PyResult<String> {
+pub fn get_tools_prompt(py: Python<'_>, py_tools: Bound<'_, PyAny>) -> PyResult<String> {
     let tools: Vec<Tool> = py_tools.extract()?;
     let mut context = Context::new();
 
     context.insert("tools", &tools);
-    Ok(TERA.render("tools", &context).unwrap())
+    render(py, "tools", context)
+}
+
+#[pyfunction]
+pub fn get_tools_prompts(py: Python<'_>, py_batch: Bound<'_, PyAny>) -> PyResult<Vec<String>> {
+    let batch: Vec<Vec<Tool>> = py_batch.extract()?;
+    render_all(py, "tools", contexts(batch, "tools"))
 }
 
 #[pyfunction]
-pub fn get_called_tools_history_prompt(py_called_tools: Bound<'_, PyAny>) -> PyResult<String> {
+pub fn get_called_tools_history_prompt(py: Python<'_>, py_called_tools: Bound<'_, PyAny>) -> PyResult<String> {
     let called_tools: Vec<CalledTool> = py_called_tools.extract()?;
     let mut context = Context::new();
     context.insert("called_tools", &called_tools);
-    Ok(TERA.render("called_tools_history", &context).unwrap())
+    render(py, "called_tools_history", context)
+}
+
+#[pyfunction]
+pub fn get_called_tools_history_prompts(py: Python<'_>, py_batch: Bound<'_, PyAny>) -> PyResult<Vec<String>> {
+    let batch: Vec<Vec<CalledTool>> = py_batch.extract()?;
+    render_all(py, "called_tools_history", contexts(batch, "called_tools"))
 }
 
 #[pyfunction]
 #[pyo3(signature = (question, called_tools, tool_prompt, tone=None))]
-pub fn get_tool_decide_prompt(question: &str, called_tools: &str, tool_prompt: &str, tone: Option<&str>) -> PyResult<String> {
+pub fn get_tool_decide_prompt(py: Python<'_>, question: &str, called_tools: &str, tool_prompt: &str, tone: Option<&str>) -> PyResult<String> {
     let mut context = Context::new();
     context.insert("question", question);
     context.insert("called_tools", called_tools);
@@ -37,28 +99,40 @@ pub fn get_tool_decide_prompt(question: &str, called_tools: &str, tool_prompt: &
     if let Some(tone) = tone {
         context.insert("tone", tone);
     }
-    Ok(TERA.render("tool_decide", &context).unwrap())
+    render(py, "tool_decide", context)
 }
 
 #[pyfunction]
-pub fn get_available_agents_prompt(py_agent_cards: Bound<'_, PyAny>) -> PyResult<String> {
+pub fn get_available_agents_prompt(py: Python<'_>, py_agent_cards: Bound<'_, PyAny>) -> PyResult<String> {
     let agent_cards: Vec<AgentCard> = py_agent_cards.extract()?;
     let mut context = Context::new();
     context.insert("agent_cards", &agent_cards);
-    Ok(TERA.render("available_agents", &context).unwrap())
+    render(py, "available_agents", context)
 }
 
 #[pyfunction]
-pub fn get_agent_answer_prompt(py_called_agents: Bound<'_, PyAny>) -> PyResult<String> {
+pub fn get_available_agents_prompts(py: Python<'_>, py_batch: Bound<'_, PyAny>) -> PyResult<Vec<String>> {
+    let batch: Vec<Vec<AgentCard>> = py_batch.extract()?;
+    render_all(py, "available_agents", contexts(batch, "agent_cards"))
+}
+
+#[pyfunction]
+pub fn get_agent_answer_prompt(py: Python<'_>, py_called_agents: Bound<'_, PyAny>) -> PyResult<String> {
     let called_agents: Vec<AgentAnswer> = py_called_agents.extract()?;
     let mut context = Context::new();
     context.insert("called_agents", &called_agents);
-    Ok(TERA.render("agent_answer", &context).unwrap())
+    render(py, "agent_answer", context)
+}
+
+#[pyfunction]
+pub fn get_agent_answer_prompts(py: Python<'_>, py_batch: Bound<'_, PyAny>) -> PyResult<Vec<String>> {
+    let batch: Vec<Vec<AgentAnswer>> = py_batch.extract()?;
+    render_all(py, "agent_answer", contexts(batch, "called_agents"))
 }
 
 #[pyfunction]
 #[pyo3(signature = (question, call_agent_prompt, agent_prompt, tone=None))]
-pub fn get_agent_decide_prompt(question: &str, call_agent_prompt: &str, agent_prompt: &str, tone: Option<&str>) -> PyResult<String> {
+pub fn get_agent_decide_prompt(py: Python<'_>, question: &str, call_agent_prompt: &str, agent_prompt: &str, tone: Option<&str>) -> PyResult<String> {
     let mut context = Context::new();
     context.insert("question", question);
     context.insert("call_agent_prompt", call_agent_prompt);
@@ -66,12 +140,17 @@ pub fn get_agent_decide_prompt(question: &str, call_agent_prompt: &str, agent_pr
     if let Some(tone) = tone {
         context.insert("tone", tone);
     }
-    Ok(TERA.render("agent_decide", &context).unwrap())
+    render(py, "agent_decide", context)
 }
 
 fn register_utils_module(parent_module: &Bound<'_, PyModule>) -> PyResult<()> {
     let utils_module = PyModule::new_bound(parent_module.py(), "utils")?;
     utils_module.add_function(wrap_pyfunction!(parse_streamed_tags, &utils_module)?)?;
+    utils_module.add_function(wrap_pyfunction!(parse_last_tag, &utils_module)?)?;
+    utils_module.add_function(wrap_pyfunction!(parse_tag_spans, &utils_module)?)?;
+    utils_module.add_function(wrap_pyfunction!(extract_json_block, &utils_module)?)?;
+    utils_module.add_class::<TagParser>()?;
+    utils_module.add_class::<TagSpan>()?;
     parent_module.add_submodule(&utils_module)?;
     Ok(())
 }
@@ -84,6 +163,11 @@ fn register_prompts_module(parent_module: &Bound<'_, PyModule>) -> PyResult<()>
     prompts_module.add_function(wrap_pyfunction!(get_agent_answer_prompt, &prompts_module)?)?;
     prompts_module.add_function(wrap_pyfunction!(get_available_agents_prompt, &prompts_module)?)?;
     prompts_module.add_function(wrap_pyfunction!(get_agent_decide_prompt, &prompts_module)?)?;
+    prompts_module.add_function(wrap_pyfunction!(get_tools_prompts, &prompts_module)?)?;
+    prompts_module.add_function(wrap_pyfunction!(get_called_tools_history_prompts, &prompts_module)?)?;
+    prompts_module.add_function(wrap_pyfunction!(get_agent_answer_prompts, &prompts_module)?)?;
+    prompts_module.add_function(wrap_pyfunction!(get_available_agents_prompts, &prompts_module)?)?;
+    prompts_module.add_class::<ToolPromptSession>()?;
     parent_module.add_submodule(&prompts_module)?;
     Ok(())
 }
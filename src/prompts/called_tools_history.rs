@@ -3,26 +3,46 @@ use pyo3::prelude::*;
 use serde::Serialize;
 
 
-#[derive(FromPyObject,Serialize,Debug)]
+#[derive(FromPyObject,Serialize,Debug,Clone,PartialEq)]
 pub struct CalledTool {
     pub name: String,
     pub arguments: String,
     pub result: String,
 }
 
-const TEMPLATE: &str = r#"
-Previous tools have been called. {% for tool in called_tools %}
+macro_rules! header {
+    () => {
+        "\nPrevious tools have been called. "
+    };
+}
+
+/// The text before the first entry of a non-empty history
+pub const HEADER: &str = header!();
+
+// One entry of the history, shared by the history template and the
+// `called_tool` template used to render entries one at a time.
+macro_rules! entry {
+    () => {
+        r#"
 - Tool: {{ tool.name }}
 - Arguments: {{ tool.arguments }}
 - Result:
 ```
 {{ tool.result }}
-```
-{%- endfor -%}
-"#;
+```"#
+    };
+}
+
+const TEMPLATE: &str = concat!(
+    header!(),
+    "{% for tool in called_tools %}",
+    entry!(),
+    "\n{%- endfor -%}\n"
+);
 
 #[allow(dead_code)]
 pub fn get_called_tools_history_prompt(tera: &mut Tera) {
     let template = TEMPLATE;
     tera.add_raw_template("called_tools_history", template).unwrap();
+    tera.add_raw_template("called_tool", entry!()).unwrap();
 }
\ No newline at end of file
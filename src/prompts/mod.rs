@@ -4,9 +4,11 @@ mod tool_decide;
 mod agent_answer;
 mod available_agents;
 mod agent_decide;
+mod session;
 use tera::Tera;
 
 pub use tools::Tool;
+pub use session::ToolPromptSession;
 #[allow(unused_imports)]
 pub use called_tools_history::CalledTool;
 #[allow(unused_imports)]
@@ -0,0 +1,120 @@
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use tera::Context;
+
+use super::called_tools_history::HEADER;
+use super::CalledTool;
+use crate::TERA;
+
+/// The tool decide prompt of one question, kept rendered across the turns
+/// of the tool-calling loop.
+///
+/// The text before and after the called tools history is rendered once.
+/// History entries are rendered when first seen and appended, so a turn
+/// only renders the new calls. When compaction rewrites older entries, the
+/// history is re-rendered from the first entry that changed. The text
+/// before it stays as it was, which keeps a stable prompt prefix for
+/// prefix caching on the LLM side.
+#[pyclass]
+pub struct ToolPromptSession {
+    head: String,
+    tail: String,
+    entries: Vec<CalledTool>,
+    /// Offset of every entry in the history
+    offsets: Vec<usize>,
+    history: String,
+}
+
+impl ToolPromptSession {
+    fn sync(&mut self, called_tools: Vec<CalledTool>) -> tera::Result<usize> {
+        let kept = self
+            .entries
+            .iter()
+            .zip(&called_tools)
+            .take_while(|(entry, tool)| entry == tool)
+            .count();
+        let end = self
+            .offsets
+            .get(kept)
+            .copied()
+            .unwrap_or(self.history.len());
+        self.history.truncate(end);
+        self.offsets.truncate(kept);
+        if called_tools.is_empty() {
+            self.history.clear();
+        } else if self.history.is_empty() {
+            self.history.push_str(HEADER);
+        }
+        for tool in &called_tools[kept..] {
+            let mut context = Context::new();
+            context.insert("tool", tool);
+            self.offsets.push(self.history.len());
+            self.history
+                .push_str(&TERA.render("called_tool", &context)?);
+        }
+        self.entries = called_tools;
+        Ok(kept)
+    }
+}
+
+#[pymethods]
+impl ToolPromptSession {
+    #[new]
+    #[pyo3(signature = (question, tool_prompt, tone=None))]
+    fn new(
+        py: Python<'_>,
+        question: &str,
+        tool_prompt: &str,
+        tone: Option<&str>,
+    ) -> PyResult<Self> {
+        let mut context = Context::new();
+        context.insert("question", question);
+        context.insert("tool_prompt", tool_prompt);
+        if let Some(tone) = tone {
+            context.insert("tone", tone);
+        }
+        let (head, tail) = py
+            .allow_threads(|| {
+                Ok::<_, tera::Error>((
+                    TERA.render("tool_decide_head", &context)?,
+                    TERA.render("tool_decide_tail", &context)?,
+                ))
+            })
+            .map_err(|err| PyValueError::new_err(err.to_string()))?;
+        Ok(Self {
+            head,
+            tail,
+            entries: Vec::new(),
+            offsets: Vec::new(),
+            history: String::new(),
+        })
+    }
+
+    /// Bring the history in line with the called tools, rendering only the
+    /// entries that are new or changed. Returns the number of entries kept.
+    fn update(&mut self, py: Python<'_>, py_called_tools: Bound<'_, PyAny>) -> PyResult<usize> {
+        let called_tools: Vec<CalledTool> = py_called_tools.extract()?;
+        py.allow_threads(|| self.sync(called_tools))
+            .map_err(|err| PyValueError::new_err(err.to_string()))
+    }
+
+    /// The called tools history, as `get_called_tools_history_prompt`
+    /// renders it, or an empty string before the first call
+    fn history(&self) -> &str {
+        &self.history
+    }
+
+    /// The full tool decide prompt
+    fn prompt(&self) -> String {
+        [
+            self.head.as_str(),
+            self.history.as_str(),
+            self.tail.as_str(),
+        ]
+        .concat()
+    }
+
+    fn __len__(&self) -> usize {
+        self.entries.len()
+    }
+}
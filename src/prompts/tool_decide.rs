@@ -1,12 +1,23 @@
 use tera::Tera;
 
 
-const TEMPLATE: &str = r#"You duty is to decide which tool to use to answer the question.
+// The template is split around the called tools history, so a prompt
+// session can render the parts before and after it once and append the
+// history entries in between.
+macro_rules! head {
+    () => {
+        r#"You duty is to decide which tool to use to answer the question.
 The question is:
 
 {{ question }}
 
-{{ called_tools }}
+"#
+    };
+}
+
+macro_rules! tail {
+    () => {
+        r#"
 
 {{ tool_prompt }}
 
@@ -48,9 +59,15 @@ Note:
 {%- if tone -%}
 Answer tone: {{tone}}
 {%- endif -%}
-"#;
+"#
+    };
+}
+
+const TEMPLATE: &str = concat!(head!(), "{{ called_tools }}", tail!());
 
 #[allow(dead_code)]
 pub fn get_tool_decide_prompt(tera: &mut Tera) {
     tera.add_raw_template("tool_decide", TEMPLATE).unwrap();
-}
\ No newline at end of file
+    tera.add_raw_template("tool_decide_head", head!()).unwrap();
+    tera.add_raw_template("tool_decide_tail", tail!()).unwrap();
+}
@@ -0,0 +1,169 @@
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::{PyDict, PyList};
+use serde_json::Value;
+
+use super::scan_tags;
+
+/// Remove the comments (`//`, `#` and `/* */`) and the trailing commas
+/// outside of strings, so lenient JSON can be read by serde_json
+fn strip_lenient(text: &str) -> String {
+    let mut out = String::with_capacity(text.len());
+    let mut chars = text.chars().peekable();
+    let mut in_string = false;
+    // Offset in `out` of a comma that is trailing if a bracket comes next
+    let mut pending_comma: Option<usize> = None;
+    while let Some(c) = chars.next() {
+        if in_string {
+            out.push(c);
+            match c {
+                '\\' => out.extend(chars.next()),
+                '"' => in_string = false,
+                _ => {}
+            }
+            continue;
+        }
+        match c {
+            '/' if chars.peek() == Some(&'*') => {
+                chars.next();
+                let mut previous = ' ';
+                for c in chars.by_ref() {
+                    if previous == '*' && c == '/' {
+                        break;
+                    }
+                    previous = c;
+                }
+            }
+            '#' | '/' if c == '#' || chars.peek() == Some(&'/') => {
+                for c in chars.by_ref() {
+                    if c == '\n' {
+                        out.push(c);
+                        break;
+                    }
+                }
+            }
+            ',' => {
+                pending_comma = Some(out.len());
+                out.push(c);
+            }
+            '}' | ']' => {
+                if let Some(offset) = pending_comma.take() {
+                    out.remove(offset);
+                }
+                out.push(c);
+            }
+            c if c.is_whitespace() => out.push(c),
+            _ => {
+                in_string = c == '"';
+                pending_comma = None;
+                out.push(c);
+            }
+        }
+    }
+    out
+}
+
+/// A fenced code block, possibly still streamed
+struct Fence<'a> {
+    language: &'a str,
+    content: &'a str,
+    is_complete: bool,
+}
+
+/// Find the first fenced code block of `text`
+fn fenced_block(text: &str) -> Option<Fence<'_>> {
+    let open = text.find("```")?;
+    let rest = text[open + 3..].trim_start_matches([' ', '\t']);
+    let language_len = rest
+        .find(|c: char| !c.is_ascii_alphanumeric())
+        .unwrap_or(rest.len());
+    let (language, content) = rest.split_at(language_len);
+    Some(match content.find("```") {
+        Some(close) => Fence {
+            language,
+            content: &content[..close],
+            is_complete: true,
+        },
+        None => Fence {
+            language,
+            content,
+            is_complete: false,
+        },
+    })
+}
+
+fn to_py(py: Python<'_>, value: &Value) -> PyResult<PyObject> {
+    Ok(match value {
+        Value::Null => py.None(),
+        Value::Bool(value) => (*value).into_py(py),
+        Value::Number(number) => match (number.as_i64(), number.as_u64()) {
+            (Some(value), _) => value.into_py(py),
+            (_, Some(value)) => value.into_py(py),
+            _ => number.as_f64().unwrap_or(f64::NAN).into_py(py),
+        },
+        Value::String(value) => value.as_str().into_py(py),
+        Value::Array(items) => {
+            let list = PyList::empty_bound(py);
+            for item in items {
+                list.append(to_py(py, item)?)?;
+            }
+            list.into()
+        }
+        Value::Object(map) => {
+            let dict = PyDict::new_bound(py);
+            for (key, item) in map {
+                dict.set_item(key, to_py(py, item)?)?;
+            }
+            dict.into()
+        }
+    })
+}
+
+/// Extract the JSON of the fenced block in a streamed response.
+///
+/// With `tag`, the block is looked for in the first top-level `<tag>` of
+/// the stream, or in the whole stream if there is no such tag. The JSON
+/// may hold comments and trailing commas. A complete tag without a fence
+/// is read as JSON itself.
+///
+/// Returns None while the block is not complete, so the function can be
+/// called on a partial stream as it grows, and None if there is no block.
+/// Raises ValueError if a complete block is not valid JSON.
+#[pyfunction]
+#[pyo3(signature = (stream, tag=None))]
+pub fn extract_json_block(
+    py: Python<'_>,
+    stream: &str,
+    tag: Option<&str>,
+) -> PyResult<Option<PyObject>> {
+    let element = tag.and_then(|tag| scan_tags(stream).find(|raw| raw.tag == tag));
+    let block = match &element {
+        Some(raw) => {
+            let content = &stream[raw.content_start..raw.content_end];
+            fenced_block(content).or(Some(Fence {
+                language: "",
+                content,
+                is_complete: raw.is_complete,
+            }))
+        }
+        // Outside of the tag, only a JSON fence is taken for the block.
+        None => fenced_block(stream).filter(|fence| {
+            fence.language.is_empty() || fence.language.eq_ignore_ascii_case("json")
+        }),
+    };
+    let Some(Fence {
+        content: json,
+        is_complete: true,
+        ..
+    }) = block
+    else {
+        return Ok(None);
+    };
+    if json.trim().is_empty() {
+        return Ok(None);
+    }
+    let value: Value = py
+        .allow_threads(|| serde_json::from_str(&strip_lenient(json)))
+        .map_err(|err| PyValueError::new_err(format!("Invalid JSON block: {}", err)))?;
+    to_py(py, &value).map(Some)
+}
@@ -1,7 +1,22 @@
+mod json_block;
+mod tag_parser;
+mod tag_span;
+
+use once_cell::sync::Lazy;
 use pyo3::prelude::*;
 use pyo3::types::PyDict;
 use regex::Regex;
 
+pub use json_block::extract_json_block;
+pub use tag_parser::TagParser;
+pub use tag_span::TagSpan;
+
+/// Matches an opening tag and its attributes, compiled once
+pub(crate) static TAG_OPEN_RE: Lazy<Regex> =
+    Lazy::new(|| Regex::new(r"<(?P<tag>\w+)(?P<attr>[^>]*)>").unwrap());
+/// Matches one `name="value"` attribute, compiled once
+pub(crate) static ATTR_RE: Lazy<Regex> = Lazy::new(|| Regex::new(r#"(\w+)="(.*?)""#).unwrap());
+
 /// Helper function to find the closing tag position (handles nested tags)
 fn find_closing_tag(stream: &str, start_pos: usize, tag: &str) -> Option<usize> {
     let open_tag = format!("<{}", tag);
@@ -30,49 +45,86 @@ fn find_closing_tag(stream: &str, start_pos: usize, tag: &str) -> Option<usize>
     Some(pos)
 }
 
-/// Parse streamed XML-like data into a Python list of dicts
-#[pyfunction]
-pub fn parse_streamed_tags(py: Python<'_>, stream: &str) -> PyResult<Vec<PyObject>> {
-    let tag_open_re = Regex::new(r"<(?P<tag>\w+)(?P<attr>[^>]*)>").unwrap();
-    let attr_re = Regex::new(r#"(\w+)="(.*?)""#).unwrap();
+/// A top-level tag found in a stream, as offsets into the stream
+pub(crate) struct RawTag<'a> {
+    pub tag: &'a str,
+    pub attr: &'a str,
+    pub start: usize,
+    pub content_start: usize,
+    pub content_end: usize,
+    pub end: usize,
+    pub is_complete: bool,
+}
 
+/// Iterate over the top-level tags of a stream without allocating
+pub(crate) fn scan_tags<'a>(stream: &'a str) -> impl Iterator<Item = RawTag<'a>> + 'a {
     let mut pos = 0;
-    let mut result = Vec::new();
-
-    while let Some(cap) = tag_open_re.captures(&stream[pos..]) {
+    std::iter::from_fn(move || {
+        let cap = TAG_OPEN_RE.captures(&stream[pos..])?;
         let whole_match = cap.get(0).unwrap();
         let tag = cap.name("tag").unwrap().as_str();
-        let attr_str = cap.name("attr").map_or("", |m| m.as_str()).trim();
-
-        let attributes = PyDict::new_bound(py);
-        for attr_cap in attr_re.captures_iter(attr_str) {
-            attributes.set_item(attr_cap[1].to_string(), attr_cap[2].to_string())?;
-        }
-
+        let attr = cap.name("attr").map_or("", |m| m.as_str()).trim();
+        let start = pos + whole_match.start();
         let content_start = pos + whole_match.end();
-        let content_end;
-
-        let is_complete;
-        if let Some(end) = find_closing_tag(stream, content_start, tag) {
-            content_end = end - format!("</{}>", tag).len();
-            is_complete = true;
-            pos = end;
-        } else {
-            content_end = stream.len();
-            is_complete = false;
-            pos = stream.len();
-        }
 
-        let content = stream[content_start..content_end].trim().to_string();
+        let (content_end, end, is_complete) = match find_closing_tag(stream, content_start, tag) {
+            // The content ends before `</tag>`.
+            Some(end) => (end - tag.len() - 3, end, true),
+            None => (stream.len(), stream.len(), false),
+        };
+        pos = end;
 
-        let py_dict = PyDict::new_bound(py);
-        py_dict.set_item("tag", tag)?;
-        py_dict.set_item("attributes", attributes)?;
-        py_dict.set_item("content", content)?;
-        py_dict.set_item("is_complete", is_complete)?;
+        Some(RawTag {
+            tag,
+            attr,
+            start,
+            content_start,
+            content_end,
+            end,
+            is_complete,
+        })
+    })
+}
 
-        result.push(py_dict.into());
+/// Parse the attributes of an opening tag into a Python dict
+pub(crate) fn attributes_dict<'py>(py: Python<'py>, attr: &str) -> PyResult<Bound<'py, PyDict>> {
+    let attributes = PyDict::new_bound(py);
+    for attr_cap in ATTR_RE.captures_iter(attr) {
+        attributes.set_item(attr_cap[1].to_string(), attr_cap[2].to_string())?;
     }
+    Ok(attributes)
+}
+
+fn tag_dict(py: Python<'_>, stream: &str, raw: &RawTag) -> PyResult<PyObject> {
+    let content = stream[raw.content_start..raw.content_end].trim();
+
+    let py_dict = PyDict::new_bound(py);
+    py_dict.set_item("tag", raw.tag)?;
+    py_dict.set_item("attributes", attributes_dict(py, raw.attr)?)?;
+    py_dict.set_item("content", content)?;
+    py_dict.set_item("is_complete", raw.is_complete)?;
+    Ok(py_dict.into())
+}
 
-    Ok(result)
+/// Parse streamed XML-like data into a Python list of dicts
+#[pyfunction]
+pub fn parse_streamed_tags(py: Python<'_>, stream: &str) -> PyResult<Vec<PyObject>> {
+    scan_tags(stream).map(|raw| tag_dict(py, stream, &raw)).collect()
+}
+
+/// Parse streamed XML-like data and return only the last top-level tag.
+/// Only that tag is converted to a Python dict.
+#[pyfunction]
+pub fn parse_last_tag(py: Python<'_>, stream: &str) -> PyResult<Option<PyObject>> {
+    scan_tags(stream)
+        .last()
+        .map(|raw| tag_dict(py, stream, &raw))
+        .transpose()
+}
+
+/// Parse streamed XML-like data into spans of the stream. The attributes
+/// and the content of a span are only converted when they are read.
+#[pyfunction]
+pub fn parse_tag_spans(stream: &str) -> Vec<TagSpan> {
+    scan_tags(stream).map(TagSpan::from).collect()
 }
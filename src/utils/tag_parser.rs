@@ -0,0 +1,198 @@
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use super::{ATTR_RE, TAG_OPEN_RE};
+
+/// The top-level tag being streamed
+struct OpenTag {
+    index: usize,
+    tag: String,
+    attributes: Vec<(String, String)>,
+    open_marker: String,
+    close_marker: String,
+    /// Offset of the content in the buffer
+    content_start: usize,
+    /// Number of nested tags with the same name still open, itself included
+    depth: usize,
+}
+
+/// Incremental parser of streamed XML-like tags.
+///
+/// Chunks are fed one at a time. The parser keeps its scan position and
+/// the tag being streamed, so each chunk is scanned once, and it drops the
+/// text of the tags already completed. `feed` returns only the tags that
+/// changed: the tags completed by the chunk and the tag still open.
+#[pyclass]
+pub struct TagParser {
+    /// Text not consumed yet, starting at the open tag if there is one
+    buffer: String,
+    /// Offset in the buffer up to which the text has been scanned
+    scan: usize,
+    current: Option<OpenTag>,
+    /// Length of the buffer when the open tag was last returned
+    emitted_len: usize,
+    tag_count: usize,
+}
+
+/// Largest char boundary of `text` at or before `pos`
+fn floor_boundary(text: &str, mut pos: usize) -> usize {
+    while !text.is_char_boundary(pos) {
+        pos -= 1;
+    }
+    pos
+}
+
+impl TagParser {
+    /// Drop the text before the scan position
+    fn compact(&mut self) {
+        self.buffer.drain(..self.scan);
+        self.scan = 0;
+    }
+
+    /// Look for the next opening tag. Returns false when more text is needed.
+    fn open_next(&mut self) -> bool {
+        let found = TAG_OPEN_RE.captures(&self.buffer[self.scan..]).map(|cap| {
+            let tag = cap.name("tag").unwrap().as_str().to_string();
+            let attr_str = cap.name("attr").map_or("", |m| m.as_str()).trim();
+            let attributes: Vec<(String, String)> = ATTR_RE
+                .captures_iter(attr_str)
+                .map(|attr_cap| (attr_cap[1].to_string(), attr_cap[2].to_string()))
+                .collect();
+            (tag, attributes, cap.get(0).unwrap().end())
+        });
+        let Some((tag, attributes, end)) = found else {
+            // Only a `<` after the last `>` can still become an opening tag.
+            let rest = &self.buffer[self.scan..];
+            let after_gt = rest.rfind('>').map_or(0, |i| i + 1);
+            let resume = rest[after_gt..]
+                .find('<')
+                .map_or(rest.len(), |i| after_gt + i);
+            self.scan += resume;
+            self.compact();
+            return false;
+        };
+        let content_start = self.scan + end;
+        self.current = Some(OpenTag {
+            index: self.tag_count,
+            open_marker: format!("<{}", tag),
+            close_marker: format!("</{}>", tag),
+            tag,
+            attributes,
+            content_start,
+            depth: 1,
+        });
+        self.tag_count += 1;
+        self.scan = content_start;
+        self.emitted_len = 0;
+        true
+    }
+
+    /// Look for the end of the open tag. Returns the offset of its closing
+    /// tag, or None when more text is needed.
+    fn close_current(&mut self) -> Option<usize> {
+        let open = self.current.as_mut().unwrap();
+        loop {
+            let rest = &self.buffer[self.scan..];
+            let next_open = rest.find(&open.open_marker);
+            let next_close = rest.find(&open.close_marker);
+            match (next_open, next_close) {
+                (Some(o), Some(c)) if o < c => {
+                    open.depth += 1;
+                    self.scan += o + open.open_marker.len();
+                }
+                (_, Some(c)) => {
+                    let close_start = self.scan + c;
+                    open.depth -= 1;
+                    self.scan = close_start + open.close_marker.len();
+                    if open.depth == 0 {
+                        return Some(close_start);
+                    }
+                }
+                (Some(o), None) => {
+                    open.depth += 1;
+                    self.scan += o + open.open_marker.len();
+                }
+                (None, None) => {
+                    // Keep the tail that may hold the start of a marker.
+                    let keep = open.open_marker.len().max(open.close_marker.len()) - 1;
+                    let pos = self.buffer.len().saturating_sub(keep).max(self.scan);
+                    self.scan = floor_boundary(&self.buffer, pos);
+                    return None;
+                }
+            }
+        }
+    }
+
+    fn to_dict(
+        py: Python<'_>,
+        open: &OpenTag,
+        content: &str,
+        is_complete: bool,
+    ) -> PyResult<PyObject> {
+        let attributes = PyDict::new_bound(py);
+        for (name, value) in &open.attributes {
+            attributes.set_item(name, value)?;
+        }
+        let py_dict = PyDict::new_bound(py);
+        py_dict.set_item("tag", &open.tag)?;
+        py_dict.set_item("attributes", attributes)?;
+        py_dict.set_item("content", content.trim())?;
+        py_dict.set_item("is_complete", is_complete)?;
+        py_dict.set_item("index", open.index)?;
+        Ok(py_dict.into())
+    }
+}
+
+#[pymethods]
+impl TagParser {
+    #[new]
+    fn new() -> Self {
+        Self {
+            buffer: String::new(),
+            scan: 0,
+            current: None,
+            emitted_len: 0,
+            tag_count: 0,
+        }
+    }
+
+    /// Feed the next chunk of the stream and return the tags it changed
+    fn feed(&mut self, py: Python<'_>, chunk: &str) -> PyResult<Vec<PyObject>> {
+        self.buffer.push_str(chunk);
+        let mut result = Vec::new();
+        loop {
+            if self.current.is_none() && !self.open_next() {
+                break;
+            }
+            match self.close_current() {
+                Some(close_start) => {
+                    let open = self.current.take().unwrap();
+                    let content = &self.buffer[open.content_start..close_start];
+                    result.push(Self::to_dict(py, &open, content, true)?);
+                    self.compact();
+                }
+                None => {
+                    let open = self.current.as_ref().unwrap();
+                    if self.buffer.len() != self.emitted_len {
+                        let content = &self.buffer[open.content_start..];
+                        result.push(Self::to_dict(py, open, content, false)?);
+                        self.emitted_len = self.buffer.len();
+                    }
+                    break;
+                }
+            }
+        }
+        Ok(result)
+    }
+
+    /// Forget everything fed so far
+    fn reset(&mut self) {
+        *self = Self::new();
+    }
+
+    /// The number of top-level tags seen so far
+    #[getter]
+    fn tag_count(&self) -> usize {
+        self.tag_count
+    }
+}
@@ -0,0 +1,70 @@
+use pyo3::exceptions::PyValueError;
+use pyo3::prelude::*;
+use pyo3::types::PyDict;
+
+use super::{attributes_dict, RawTag};
+
+/// A top-level tag of a stream, held as UTF-8 byte offsets into it.
+///
+/// Only the tag name and the raw attribute text are copied. The attributes
+/// are parsed when read and the content is sliced from the stream by
+/// `content`, so spans that are never inspected cost a few integers.
+#[pyclass(frozen)]
+pub struct TagSpan {
+    #[pyo3(get)]
+    tag: String,
+    attr: String,
+    /// Offset of the opening tag
+    #[pyo3(get)]
+    start: usize,
+    #[pyo3(get)]
+    content_start: usize,
+    #[pyo3(get)]
+    content_end: usize,
+    /// Offset after the closing tag, or the end of the stream
+    #[pyo3(get)]
+    end: usize,
+    #[pyo3(get)]
+    is_complete: bool,
+}
+
+impl From<RawTag<'_>> for TagSpan {
+    fn from(raw: RawTag<'_>) -> Self {
+        Self {
+            tag: raw.tag.to_string(),
+            attr: raw.attr.to_string(),
+            start: raw.start,
+            content_start: raw.content_start,
+            content_end: raw.content_end,
+            end: raw.end,
+            is_complete: raw.is_complete,
+        }
+    }
+}
+
+#[pymethods]
+impl TagSpan {
+    /// The attributes of the opening tag
+    #[getter]
+    fn attributes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        attributes_dict(py, &self.attr)
+    }
+
+    /// The trimmed content of the tag, sliced from the parsed stream
+    fn content(&self, stream: &str) -> PyResult<String> {
+        stream
+            .get(self.content_start..self.content_end)
+            .map(|content| content.trim().to_string())
+            .ok_or_else(|| PyValueError::new_err("The span is not in this stream"))
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "TagSpan(tag={:?}, start={}, end={}, is_complete={})",
+            self.tag,
+            self.start,
+            self.end,
+            if self.is_complete { "True" } else { "False" }
+        )
+    }
+}
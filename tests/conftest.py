@@ -0,0 +1,60 @@
+import sys
+import textwrap
+
+import pytest
+
+
+MCP_SERVER = textwrap.dedent(
+    """
+    import os
+
+    import anyio
+    from mcp.server.fastmcp import Context, FastMCP
+
+    mcp = FastMCP("test")
+
+
+    @mcp.tool()
+    def pid() -> str:
+        return str(os.getpid())
+
+
+    @mcp.tool()
+    def crash() -> str:
+        os._exit(1)
+
+
+    @mcp.tool()
+    async def sleep(seconds: float) -> str:
+        await anyio.sleep(seconds)
+        return "slept"
+
+
+    @mcp.tool()
+    async def progress(ctx: Context, steps: int = 3) -> str:
+        for step in range(1, steps + 1):
+            await ctx.report_progress(step, steps, f"step {step}")
+        return "done"
+
+
+    @mcp.tool()
+    async def add_tool(ctx: Context) -> str:
+        def extra() -> str:
+            return "extra"
+
+        mcp.add_tool(extra)
+        await ctx.session.send_tool_list_changed()
+        return "added"
+
+
+    mcp.run()
+    """
+)
+
+
+@pytest.fixture
+def mcp_cmd(tmp_path) -> list[str]:
+    """Command starting a local stdio MCP server used by the tests."""
+    server = tmp_path / "server.py"
+    server.write_text(MCP_SERVER)
+    return [sys.executable, str(server)]
@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+
+from financial_a2a_solution.main_agent.agent import Agent
+from financial_a2a_solution.main_agent.registry import AgentRegistry
+
+
+def card_json(name: str, description: str = "description") -> dict:
+    return {
+        "name": name,
+        "description": description,
+        "url": "http://agent/",
+        "version": "1.0.0",
+        "capabilities": {"streaming": True},
+        "defaultInputModes": ["text"],
+        "defaultOutputModes": ["text"],
+        "skills": [
+            {
+                "id": "skill",
+                "name": "Skill",
+                "description": "Skill description",
+                "examples": ["Example"],
+                "tags": ["tag"],
+            }
+        ],
+    }
+
+
+def test_refresh_uses_etag_and_keeps_cards():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json=card_json("Agent 1"), headers={"ETag": '"v1"'}
+        )
+
+    async def run():
+        registry = AgentRegistry(["http://agent-1/"], ttl=60)
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            first = await registry.refresh(client)
+            second = await registry.refresh(client)
+        return registry, first, second
+
+    registry, first, second = asyncio.run(run())
+
+    assert first is True
+    assert second is False
+    assert requests[0].url == "http://agent-1/.well-known/agent.json"
+    assert "If-None-Match" not in requests[0].headers
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+    assert list(registry.agents_registry) == ["Agent 1"]
+    assert registry.agent_prompt
+
+
+def test_refresh_rerenders_prompt_when_card_changes():
+    descriptions = iter(["first", "first", "second"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, json=card_json("Agent 1", next(descriptions))
+        )
+
+    async def run():
+        registry = AgentRegistry(["http://agent-1"], ttl=60)
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            return [await registry.refresh(client) for _ in range(3)]
+
+    assert asyncio.run(run()) == [True, False, True]
+
+
+def test_shared_registry_is_reused_for_same_urls():
+    registry = AgentRegistry.shared(["http://localhost:9999/"])
+    assert registry is AgentRegistry.shared(["http://localhost:9999"])
+    assert registry is not AgentRegistry.shared(["http://localhost:9998"])
+
+
+def test_agent_close_stops_its_registry_refresh():
+    async def run():
+        agent = Agent(agent_urls=["http://localhost:9997"], llm=object())
+        given = AgentRegistry(["http://localhost:9997"])
+        other = Agent(registry=given, llm=object())
+        agent.registry.start()
+        (task,) = asyncio.all_tasks() - {asyncio.current_task()}
+        given.start()
+        (given_task,) = asyncio.all_tasks() - {asyncio.current_task(), task}
+        await agent.close()
+        await other.close()
+        assert task.cancelled()
+        assert not given_task.done()
+        await given.close()
+
+    asyncio.run(run())
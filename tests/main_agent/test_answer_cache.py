@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    JSONRPCError,
+    JSONRPCErrorResponse,
+    Message,
+    Part,
+    Role,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+from financial_a2a_solution.cache import MemoryCache, TieredCache
+from financial_a2a_solution.llm import FakeProvider
+from financial_a2a_solution.main_agent.agent import Agent
+from financial_a2a_solution.main_agent.answer_cache import AgentAnswerCache
+from financial_a2a_solution.main_agent.pacing import OutputPacer
+
+
+def make_card(name: str, version: str = "1.0.0") -> AgentCard:
+    return AgentCard(
+        name=name,
+        description="",
+        url="http://localhost:9999/",
+        version=version,
+        capabilities=AgentCapabilities(streaming=True),
+        defaultInputModes=["text"],
+        defaultOutputModes=["text"],
+        skills=[],
+    )
+
+
+class FakeClient:
+    def __init__(
+        self, state: TaskState = TaskState.completed, *, error: bool = False
+    ):
+        self.calls = 0
+        self.state = state
+        self.error = error
+
+    async def send_message_streaming(self, request):
+        self.calls += 1
+        yield SendStreamingMessageResponse(
+            root=SendStreamingMessageSuccessResponse(
+                id="1",
+                result=TaskStatusUpdateEvent(
+                    taskId="task",
+                    contextId="context",
+                    final=True,
+                    status=TaskStatus(
+                        state=self.state,
+                        message=Message(
+                            role=Role.agent,
+                            parts=[
+                                Part(TextPart(text="<Answer>Fine</Answer>"))
+                            ],
+                            messageId="message",
+                        ),
+                    ),
+                ),
+            )
+        )
+        if self.error:
+            yield SendStreamingMessageResponse(
+                root=JSONRPCErrorResponse(
+                    id="1", error=JSONRPCError(code=-32603, message="Boom")
+                )
+            )
+
+
+class FakePool:
+    def __init__(self, client: FakeClient | None = None):
+        self.client = client or FakeClient()
+
+    def get_client(self, agent_card):
+        return self.client
+
+    async def close(self):
+        pass
+
+
+def make_agent(client: FakeClient | None = None, **kwargs) -> Agent:
+    return Agent(
+        agent_urls=[],
+        client_pool=FakePool(client),
+        llm=FakeProvider(),
+        pacer=OutputPacer(mode="none"),
+        answer_cache=AgentAnswerCache(
+            cache=TieredCache(MemoryCache()), **kwargs
+        ),
+    )
+
+
+async def ask(agent: Agent, card: AgentCard, prompt: str) -> str:
+    chunks = []
+    async for chunk in agent.send_message_to_an_agent(card, prompt):
+        chunks.append(chunk)
+    return "".join(chunks)
+
+
+def test_answers_are_replayed_from_the_cache():
+    agent = make_agent()
+    card = make_card("Balance Sheet Agent")
+
+    async def run():
+        first = await ask(agent, card, "How is KBANK?")
+        second = await ask(agent, card, "  how is   kbank? ")
+        return first, second
+
+    assert asyncio.run(run()) == ("<Answer>Fine</Answer>",) * 2
+    assert agent.client_pool.client.calls == 1
+
+
+def test_answers_are_keyed_by_card_version():
+    agent = make_agent()
+
+    async def run():
+        await ask(agent, make_card("Balance Sheet Agent"), "How is KBANK?")
+        await ask(
+            agent, make_card("Balance Sheet Agent", "1.1.0"), "How is KBANK?"
+        )
+
+    asyncio.run(run())
+    assert agent.client_pool.client.calls == 2
+
+
+def test_a_zero_ttl_disables_caching_for_an_agent():
+    agent = make_agent(agent_ttls={"Technical Agent": 0})
+    card = make_card("Technical Agent")
+
+    async def run():
+        await ask(agent, card, "Is PTT trending?")
+        await ask(agent, card, "Is PTT trending?")
+
+    asyncio.run(run())
+    assert agent.client_pool.client.calls == 2
+
+
+@pytest.mark.parametrize(
+    "client",
+    [
+        FakeClient(TaskState.failed),
+        FakeClient(TaskState.input_required),
+        FakeClient(error=True),
+    ],
+    ids=["failed", "input_required", "error_response"],
+)
+def test_unfinished_answers_are_not_cached(client):
+    agent = make_agent(client)
+    card = make_card("Balance Sheet Agent")
+
+    async def run():
+        await ask(agent, card, "How is KBANK?")
+        await ask(agent, card, "How is KBANK?")
+
+    asyncio.run(run())
+    assert client.calls == 2  # noqa: PLR2004
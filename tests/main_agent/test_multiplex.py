@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from financial_a2a_solution.main_agent.multiplex import multiplex
+
+
+async def delayed(chunks: list[str], delay: float):
+    for chunk in chunks:
+        await asyncio.sleep(delay)
+        yield chunk
+
+
+async def collect(mode: str) -> list[tuple[int, str | None]]:
+    streams = [
+        delayed(["a1", "a2"], 0.02),
+        delayed(["b1", "b2"], 0.005),
+    ]
+    return [item async for item in multiplex(streams, mode=mode)]
+
+
+def test_ordered_mode_keeps_selection_order():
+    assert asyncio.run(collect("ordered")) == [
+        (0, "a1"),
+        (0, "a2"),
+        (0, None),
+        (1, "b1"),
+        (1, "b2"),
+        (1, None),
+    ]
+
+
+def test_interleaved_mode_yields_in_arrival_order():
+    result = asyncio.run(collect("interleaved"))
+    assert result[:3] == [(1, "b1"), (1, "b2"), (1, None)]
+    assert result[3:] == [(0, "a1"), (0, "a2"), (0, None)]
+
+
+def test_streams_run_concurrently():
+    async def run() -> float:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        streams = [delayed(["x"] * 5, 0.02) for _ in range(4)]
+        async for _ in multiplex(streams):
+            pass
+        return loop.time() - start
+
+    assert asyncio.run(run()) < 0.3
+
+
+def test_stream_errors_are_raised():
+    async def failing():
+        yield "ok"
+        raise RuntimeError("boom")
+
+    async def run():
+        return [item async for item in multiplex([failing()])]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(run())
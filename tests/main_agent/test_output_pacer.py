@@ -0,0 +1,33 @@
+import asyncio
+
+from financial_a2a_solution.main_agent.pacing import OutputPacer
+
+
+async def chunks(items: list[str], delay: float = 0.0):
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+async def collect(pacer: OutputPacer, stream) -> list[str]:
+    return [chunk async for chunk in pacer.pace(stream)]
+
+
+def test_none_mode_passes_chunks_through():
+    pacer = OutputPacer(mode="none")
+    result = asyncio.run(collect(pacer, chunks(["a", "b", "c"])))
+    assert result == ["a", "b", "c"]
+
+
+def test_coalesce_mode_flushes_by_size():
+    pacer = OutputPacer(mode="coalesce", flush_interval=10, max_bytes=4)
+    result = asyncio.run(collect(pacer, chunks(["ab", "cd", "ef", "g"])))
+    assert result == ["abcd", "efg"]
+
+
+def test_coalesce_mode_flushes_by_time_window():
+    pacer = OutputPacer(mode="coalesce", flush_interval=0.02, max_bytes=1024)
+    result = asyncio.run(collect(pacer, chunks(["a", "b", "c"], delay=0.05)))
+    assert result == ["a", "b", "c"]
+    result = asyncio.run(collect(pacer, chunks(["a", "b", "c"])))
+    assert result == ["abc"]
@@ -0,0 +1,54 @@
+import asyncio
+
+from financial_a2a_solution.llm import FakeProvider
+from financial_a2a_solution.main_agent.agent import Agent
+from financial_a2a_solution.main_agent.pacing import OutputPacer
+
+
+DECIDE_RESPONSE = (
+    "<thoughts>\nthoughts:\n- Ask the balance sheet agent.\n</thoughts>\n\n"
+    "<selected_agents>\n```json\n"
+    '[{"index": 1, "name": "Agent 1", "prompt": "How is KBANK?"}]\n'
+    "```\n</selected_agents>\n" + "Trailing thoughts. " * 10
+)
+
+
+class RecordingAgent(Agent):
+    def __init__(self, **kwargs):
+        super().__init__(agent_urls=[], **kwargs)
+        self.events: list[str] = []
+
+    async def get_agents(self):
+        return {"Agent 1": None}, "agents"
+
+    async def send_message_to_an_agent(self, agent_card, message):
+        self.events.append("agent started")
+        yield "<Answer>KBANK is fine.</Answer>"
+
+
+async def run(speculative_dispatch: bool) -> tuple[list[str], str]:
+    agent = RecordingAgent(
+        llm=FakeProvider(
+            [DECIDE_RESPONSE, "<answer>Done.</answer>"], chunk_size=8
+        ),
+        pacer=OutputPacer(mode="none"),
+        speculative_dispatch=speculative_dispatch,
+    )
+    output = ""
+    async for chunk in agent.stream("How is KBANK balance sheet?"):
+        if chunk == "</main_agent>\n" and not output.count("</main_agent>"):
+            agent.events.append("decide finished")
+        output += chunk
+    return agent.events, output
+
+
+def test_agents_are_dispatched_before_decide_finishes():
+    events, output = asyncio.run(run(speculative_dispatch=True))
+    assert events == ["agent started", "decide finished"]
+    assert '<agent name="Agent 1">\n<Answer>KBANK is fine.</Answer>' in output
+
+
+def test_agents_are_dispatched_after_decide_without_speculation():
+    events, output = asyncio.run(run(speculative_dispatch=False))
+    assert events == ["decide finished", "agent started"]
+    assert '<agent name="Agent 1">\n<Answer>KBANK is fine.</Answer>' in output
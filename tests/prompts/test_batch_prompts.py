@@ -0,0 +1,44 @@
+from financial_a2a_solution.the_solution import prompts
+from financial_a2a_solution.types import AgentAnswer, CalledTool, Tool
+
+
+histories = [
+    [
+        CalledTool(
+            name=f"tool_{i}",
+            arguments=f'{{"n": {j}}}',
+            isError=False,
+            result="ok",
+        )
+        for j in range(i)
+    ]
+    for i in range(1, 6)
+]
+
+
+def test_get_called_tools_history_prompts():
+    assert prompts.get_called_tools_history_prompts(histories) == [
+        prompts.get_called_tools_history_prompt(history)
+        for history in histories
+    ]
+
+
+def test_get_tools_prompts():
+    batch = [
+        [Tool(name="a", description="A", inputSchema='{"type": "object"}')],
+        [],
+    ]
+    assert prompts.get_tools_prompts(batch) == [
+        prompts.get_tools_prompt(tools) for tools in batch
+    ]
+
+
+def test_get_agent_answer_prompts():
+    batch = [[AgentAnswer(name="Agent 1", prompt="Q", answer="A")]]
+    assert prompts.get_agent_answer_prompts(batch) == [
+        prompts.get_agent_answer_prompt(batch[0])
+    ]
+
+
+def test_get_prompts_empty_batch():
+    assert prompts.get_called_tools_history_prompts([]) == []
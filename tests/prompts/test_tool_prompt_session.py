@@ -0,0 +1,59 @@
+from financial_a2a_solution.the_solution import prompts
+from financial_a2a_solution.types import CalledTool
+
+
+def called_tool(index: int, result: str = "ok") -> CalledTool:
+    return CalledTool(
+        name=f"tool_{index}",
+        arguments=f'{{"n": {index}}}',
+        isError=False,
+        result=result,
+    )
+
+
+def expected_prompt(called_tools: list[CalledTool]) -> str:
+    history = (
+        prompts.get_called_tools_history_prompt(called_tools)
+        if called_tools
+        else ""
+    )
+    return prompts.get_tool_decide_prompt(
+        question="What is the price?",
+        called_tools=history,
+        tool_prompt="Tools",
+    )
+
+
+def test_session_matches_full_render():
+    session = prompts.ToolPromptSession(
+        question="What is the price?", tool_prompt="Tools"
+    )
+    assert session.history() == ""
+    assert session.prompt() == expected_prompt([])
+
+    called_tools: list[CalledTool] = []
+    for index in range(4):
+        called_tools.append(called_tool(index))
+        assert session.update(called_tools) == index
+        assert session.prompt() == expected_prompt(called_tools)
+        assert session.history() == prompts.get_called_tools_history_prompt(
+            called_tools
+        )
+    assert len(session) == 4
+
+
+def test_session_rerenders_from_first_changed_entry():
+    session = prompts.ToolPromptSession(
+        question="What is the price?", tool_prompt="Tools"
+    )
+    called_tools = [called_tool(index) for index in range(4)]
+    session.update(called_tools)
+    prefix = session.prompt().split("tool_1")[0]
+
+    called_tools[1] = called_tool(1, "... [2 characters omitted]")
+    assert session.update(called_tools) == 1
+    assert session.prompt() == expected_prompt(called_tools)
+    assert session.prompt().startswith(prefix)
+
+    assert session.update([]) == 0
+    assert session.prompt() == expected_prompt([])
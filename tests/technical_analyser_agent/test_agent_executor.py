@@ -0,0 +1,19 @@
+from financial_a2a_solution.technical_analyser_agent.agent_executor import (
+    TechnicalAnalyserAgentExecutor,
+)
+
+
+def test_price_data_dir_is_read_when_the_executor_is_built(
+    monkeypatch, tmp_path
+):
+    monkeypatch.delenv("PRICE_DATA_DIR", raising=False)
+    executor = TechnicalAnalyserAgentExecutor()
+    assert "backtest_moving_average_crossover" not in (
+        executor.agent.local_tools
+    )
+
+    # As `main` does with the env file, after the modules are imported.
+    monkeypatch.setenv("PRICE_DATA_DIR", str(tmp_path))
+    executor = TechnicalAnalyserAgentExecutor()
+    assert "backtest_moving_average_crossover" in executor.agent.local_tools
+    assert "sweep_moving_average_crossover" in executor.agent.local_tools
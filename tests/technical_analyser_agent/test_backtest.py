@@ -0,0 +1,109 @@
+import asyncio
+import math
+
+import numpy as np
+import pytest
+
+from financial_a2a_solution.local_tools import LocalToolbox
+from financial_a2a_solution.technical_analyser_agent.backtest import (
+    CSVPriceLoader,
+    PriceHistory,
+    backtest_cross_moving_average,
+    register_backtest_tools,
+    sma,
+)
+
+
+def random_prices(bars: int = 500, seed: int = 0) -> PriceHistory:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    open_ = close * np.exp(rng.normal(0, 0.005, bars))
+    dates = [f"d{index:04}" for index in range(bars)]
+    return PriceHistory(dates=dates, open=open_, close=close)
+
+
+def reference_equity(prices, n1, n2, cash, commission, short):
+    """Bar by bar simulation of the strategy."""
+    fast, slow = sma(prices.close, n1), sma(prices.close, n2)
+    equity, units, direction, entry, pending = cash, 0, 0, 0.0, None
+    curve = []
+    for bar, close in enumerate(prices.close):
+        if pending is not None:
+            price = prices.open[bar]
+            if direction:
+                equity += units * (
+                    direction * (price - entry) - price * commission
+                )
+            direction = pending if pending > 0 or short else 0
+            entry = price
+            units = math.floor(equity / (price * (1 + commission)))
+            units = units if direction else 0
+            equity -= units * price * commission
+            pending = None
+        curve.append(equity + direction * units * (close - entry))
+        if bar and not np.isnan(slow[bar - 1]):
+            before, now = fast[bar - 1] - slow[bar - 1], fast[bar] - slow[bar]
+            if before < 0 < now:
+                pending = 1
+            elif now < 0 < before:
+                pending = -1
+    return np.array(curve)
+
+
+@pytest.mark.parametrize("short", [True, False])
+def test_matches_a_bar_by_bar_simulation(short):
+    prices = random_prices()
+    result = backtest_cross_moving_average(
+        prices, 10, 20, cash=10000, commission=0.002, short=short
+    )
+    expected = reference_equity(prices, 10, 20, 10000, 0.002, short)
+    assert result.equity == pytest.approx(expected)
+    assert len(result.trade_returns) > 0
+    # The trades compound to the final equity.
+    assert 10000 * np.prod(1 + result.trade_returns) == pytest.approx(
+        result.equity[-1]
+    )
+
+
+def test_statistics():
+    prices = random_prices()
+    result = backtest_cross_moving_average(prices, 5, 30)
+    assert result.total_return == pytest.approx(result.equity[-1] / 10000 - 1)
+    assert -1 < result.max_drawdown <= 0
+    assert 0 < result.exposure <= 1
+
+
+def test_invalid_windows_are_rejected():
+    with pytest.raises(ValueError, match="0 < n1 < n2"):
+        backtest_cross_moving_average(random_prices(), 20, 10)
+
+
+def test_backtest_tool(tmp_path):
+    prices = random_prices(300)
+    lines = ["Date,Open,High,Low,Close"] + [
+        f"{date},{o},{max(o, c)},{min(o, c)},{c}"
+        for date, o, c in zip(
+            prices.dates, prices.open, prices.close, strict=True
+        )
+    ]
+    (tmp_path / "SET_KBANK.csv").write_text("\n".join(lines))
+    toolbox = LocalToolbox()
+    register_backtest_tools(toolbox, CSVPriceLoader(tmp_path))
+
+    async def run():
+        return await asyncio.gather(
+            toolbox.call(
+                "backtest_moving_average_crossover",
+                {"symbol": "SET:KBANK", "n1": 10, "n2": 20},
+            ),
+            toolbox.call(
+                "backtest_moving_average_crossover",
+                {"symbol": "SET:PTT", "n1": 10, "n2": 20},
+            ),
+        )
+
+    found, missing = asyncio.run(run())
+    assert not found.isError
+    assert "Bars: 300" in found.content[0].text
+    assert missing.isError
+    assert "No price data for SET:PTT" in missing.content[0].text
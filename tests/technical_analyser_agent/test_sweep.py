@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from financial_a2a_solution.technical_analyser_agent.backtest import (
+    PriceHistory,
+    backtest_cross_moving_average,
+)
+from financial_a2a_solution.technical_analyser_agent.sweep import (
+    ParameterSweep,
+    format_sweep,
+    parameter_grid,
+)
+
+
+def random_prices(bars: int = 400) -> PriceHistory:
+    rng = np.random.default_rng(1)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, bars)))
+    return PriceHistory(
+        dates=[str(index) for index in range(bars)], open=close, close=close
+    )
+
+
+def test_parameter_grid_keeps_ordered_windows():
+    assert parameter_grid([20, 5, 10], [10, 20]) == [
+        (5, 10),
+        (5, 20),
+        (10, 20),
+    ]
+
+
+def test_sweep_matches_single_backtests():
+    prices = random_prices()
+    pairs = parameter_grid([5, 10, 15], [20, 30, 50])
+    sweep = ParameterSweep(workers=2)
+    try:
+        results = asyncio.run(sweep.run(prices, pairs, commission=0.001))
+    finally:
+        sweep.shutdown()
+
+    assert len(results) == len(pairs)
+    returns = [result.total_return for result in results]
+    assert returns == sorted(returns, reverse=True)
+    for result in results:
+        single = backtest_cross_moving_average(
+            prices, result.n1, result.n2, commission=0.001
+        )
+        assert result.total_return == pytest.approx(single.total_return)
+        assert result.trades == len(single.trade_returns)
+    table = format_sweep("SET:KBANK", 400, results, top=3).splitlines()
+    assert len(table) == 2 + 3
+    assert table[2].startswith(f"1|{results[0].n1}|{results[0].n2}|")
+
+
+def test_sweep_rejects_oversized_grids():
+    sweep = ParameterSweep(workers=1, max_combinations=2)
+    with pytest.raises(ValueError, match="exceed the limit"):
+        asyncio.run(sweep.run(random_prices(), parameter_grid([1, 2], [3, 4])))
+
+
+def test_cancelled_sweep_waits_for_its_chunks(monkeypatch):
+    submitted = []
+    unlinked_with_running_chunks = []
+
+    class RecordingPool(ProcessPoolExecutor):
+        def submit(self, *args, **kwargs):
+            future = super().submit(*args, **kwargs)
+            submitted.append(future)
+            return future
+
+    unlink = SharedMemory.unlink
+
+    def checked_unlink(shared):
+        unlinked_with_running_chunks.append(
+            not all(future.done() for future in submitted)
+        )
+        unlink(shared)
+
+    monkeypatch.setattr(SharedMemory, "unlink", checked_unlink)
+    sweep = ParameterSweep(workers=2)
+    sweep._pool = RecordingPool(2, mp_context=get_context("spawn"))  # noqa: SLF001
+    pairs = parameter_grid(list(range(2, 40)), list(range(40, 80)))
+
+    async def cancel_sweep():
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.5):
+                await sweep.run(random_prices(20000), pairs)
+
+    try:
+        asyncio.run(cancel_sweep())
+        assert submitted
+        assert unlinked_with_running_chunks == [False]
+        # The pool is still usable after the cancellation.
+        results = asyncio.run(sweep.run(random_prices(), [(5, 20)]))
+        assert len(results) == 1
+    finally:
+        sweep.shutdown()
+
+
+def test_sweep_settings_are_read_when_the_sweep_is_built(monkeypatch):
+    monkeypatch.setenv("SWEEP_WORKERS", "3")
+    monkeypatch.setenv("SWEEP_MAX_COMBINATIONS", "40")
+    sweep = ParameterSweep()
+    assert sweep.workers == 3
+    assert sweep.max_combinations == 40
+    assert ParameterSweep(workers=2, max_combinations=5).workers == 2
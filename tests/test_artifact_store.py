@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+from financial_a2a_solution.artifact_store import ArtifactStore
+from financial_a2a_solution.llm import FakeProvider
+from financial_a2a_solution.technical_analyser_agent.agent import Agent
+
+
+def test_payloads_are_content_addressed(tmp_path):
+    store = ArtifactStore(tmp_path)
+    handle = store.put("report")
+    assert store.put("report") == handle
+    assert store.put("other") != handle
+    assert handle.startswith("artifact://")
+    assert store.get(handle) == "report"
+    assert len(list(tmp_path.iterdir())) == 2  # noqa: PLR2004
+
+
+def test_unknown_handles_are_rejected(tmp_path):
+    store = ArtifactStore(tmp_path)
+    with pytest.raises(KeyError):
+        store.get("artifact://" + "0" * 64)
+    with pytest.raises(ValueError, match="Not an artifact handle"):
+        store.get("artifact://../../etc/passwd")
+
+
+def test_only_large_payloads_are_spilled(tmp_path):
+    store = ArtifactStore(tmp_path, threshold=10, summary_chars=4)
+    assert store.spill("short") is None
+    stored = store.spill("x" * 20)
+    assert stored is not None
+    assert stored.size == 20  # noqa: PLR2004
+    assert stored.handle in stored.summary
+    assert "xxxx\n... [16 characters omitted]" in stored.summary
+    assert store.get(stored.handle) == "x" * 20
+
+
+def test_agent_records_large_results_by_handle(tmp_path):
+    store = ArtifactStore(tmp_path, threshold=10)
+    agent = Agent(llm=FakeProvider(), artifact_store=store)
+    tool = {"name": "report", "arguments": {}}
+
+    def result(text):
+        return CallToolResult(content=[TextContent(type="text", text=text)])
+
+    small = asyncio.run(agent.record_call(tool, result("ok")))
+    large = asyncio.run(agent.record_call(tool, result("y" * 50)))
+    assert (small.result, small.artifact) == ("ok", None)
+    assert large.artifact is not None
+    assert large.artifact in large.result
+    assert store.get(large.artifact) == "y" * 50
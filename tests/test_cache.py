@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+from financial_a2a_solution.cache import (
+    DiskCache,
+    MemoryCache,
+    TieredCache,
+    make_key,
+)
+from financial_a2a_solution.llm import CachedProvider, FakeProvider
+
+
+def test_make_key_is_content_addressed():
+    assert make_key("model", "prompt") == make_key("model", "prompt")
+    assert make_key("model", "prompt") != make_key("model", "prompt ")
+    assert make_key("ab", "c") != make_key("a", "bc")
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryCache(ttl=0.01)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_disk_cache_persists_and_evicts_by_size(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=200)
+    cache.set("a", "x" * 50)
+    assert DiskCache(tmp_path).get("a") == "x" * 50
+
+    cache.set("b", "y" * 50)
+    cache.set("c", "z" * 50)
+    assert cache.get("a") is None
+    assert cache.get("c") == "z" * 50
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    DiskCache(tmp_path).set("a", {"value": 1})
+    cache = TieredCache(MemoryCache(), DiskCache(tmp_path))
+    assert cache.memory.get("a") is None
+    assert cache.get("a") == {"value": 1}
+    assert cache.memory.get("a") == {"value": 1}
+
+
+def test_cached_provider_replays_responses():
+    fake = FakeProvider(["first", "second"])
+    provider = CachedProvider(fake, TieredCache(MemoryCache()), chunk_size=2)
+
+    async def collect(prompt: str) -> str:
+        return "".join([chunk async for chunk in provider.stream(prompt)])
+
+    assert asyncio.run(collect("How is KBANK balance sheet?")) == "first"
+    assert asyncio.run(collect("How is KBANK balance sheet?")) == "first"
+    assert asyncio.run(collect("Another question")) == "second"
+    assert fake.prompts == ["How is KBANK balance sheet?", "Another question"]
@@ -0,0 +1,100 @@
+import asyncio
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.server.tasks.inmemory_task_store import InMemoryTaskStore
+from a2a.types import (
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    TaskState,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from a2a.utils import new_task
+
+from financial_a2a_solution.balance_sheet_agent.agent_executor import (
+    BalanceSheetAgentExecutor,
+)
+from financial_a2a_solution.request_handler import CancellingRequestHandler
+from financial_a2a_solution.technical_analyser_agent.agent_executor import (
+    TechnicalAnalyserAgentExecutor,
+)
+
+
+def make_message() -> Message:
+    return Message(
+        role=Role.user,
+        parts=[Part(TextPart(text="How is KBANK?"))],
+        messageId="message",
+    )
+
+
+class SlowExecutor(AgentExecutor):
+    def __init__(self):
+        self.cancelled = asyncio.Event()
+
+    async def execute(self, context, event_queue):
+        event_queue.enqueue_event(new_task(context.message))
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+    async def cancel(self, context, event_queue):
+        pass
+
+
+def test_execution_is_cancelled_when_the_client_disconnects():
+    async def run():
+        executor = SlowExecutor()
+        handler = CancellingRequestHandler(
+            agent_executor=executor, task_store=InMemoryTaskStore()
+        )
+        stream = handler.on_message_send_stream(
+            MessageSendParams(message=make_message())
+        )
+        await anext(stream)
+        await stream.aclose()
+        await asyncio.wait_for(executor.cancelled.wait(), timeout=1)
+        return handler._running_agents
+
+    assert asyncio.run(run()) == {}
+
+
+class SlowAgent:
+    async def stream(self, question):
+        await asyncio.sleep(60)
+        yield
+
+
+def test_execution_fails_once_the_deadline_is_exceeded():
+    async def run():
+        executor = BalanceSheetAgentExecutor(timeout=0.05)
+        executor.agent = SlowAgent()
+        queue = EventQueue()
+        await executor.execute(
+            RequestContext(MessageSendParams(message=make_message())), queue
+        )
+        events = []
+        while not queue.queue.empty():
+            events.append(await queue.dequeue_event())
+        return events[-1]
+
+    event = asyncio.run(run())
+    assert isinstance(event, TaskStatusUpdateEvent)
+    assert event.final
+    assert event.status.state == TaskState.failed
+
+
+def test_deadline_is_read_when_the_executor_is_built(monkeypatch):
+    timeout = 5.0
+    # As `main` does with the env file, after the modules are imported.
+    monkeypatch.setenv("AGENT_REQUEST_TIMEOUT", str(timeout))
+    assert BalanceSheetAgentExecutor().timeout == timeout
+    assert TechnicalAnalyserAgentExecutor().timeout == timeout
+    assert BalanceSheetAgentExecutor(timeout=1).timeout == 1
+    monkeypatch.setenv("AGENT_REQUEST_TIMEOUT", "0")
+    assert BalanceSheetAgentExecutor().timeout is None
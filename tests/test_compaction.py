@@ -0,0 +1,42 @@
+from financial_a2a_solution.compaction import HistoryCompactor
+from financial_a2a_solution.types import AgentAnswer, CalledTool
+
+
+def make_tool(name: str, result: str) -> CalledTool:
+    return CalledTool(name=name, arguments="{}", isError=False, result=result)
+
+
+def test_history_within_budget_is_untouched():
+    tools = [make_tool("a", "x" * 100), make_tool("b", "y" * 100)]
+    compacted, report = HistoryCompactor(budget=1000).compact_tools(tools)
+    assert compacted == tools
+    assert report.saved_chars == 0
+    assert report.compacted_entries == 0
+
+
+def test_older_entries_are_truncated_oldest_first():
+    tools = [make_tool(name, name * 1000) for name in "abcd"]
+    compactor = HistoryCompactor(budget=3200, keep_latest=2, min_chars=100)
+    compacted, report = compactor.compact_tools(tools)
+
+    assert compacted[0].result.startswith("a" * 100 + "\n... [900 ")
+    assert compacted[1].result == "b" * 1000
+    assert compacted[2:] == tools[2:]
+    assert report.compacted_entries == 1
+    assert report.original_chars == 4000
+    assert report.compacted_chars == sum(len(t.result) for t in compacted)
+    assert report.compacted_chars <= 3200
+
+
+def test_older_entries_are_dropped_when_truncation_is_not_enough():
+    answers = [
+        AgentAnswer(name=name, prompt="?", answer=name * 1000) for name in "abc"
+    ]
+    compactor = HistoryCompactor(budget=1000, keep_latest=1, min_chars=100)
+    compacted, report = compactor.compact_answers(answers)
+
+    assert compacted[0].answer == "\n... [1000 characters omitted]"
+    assert compacted[1].answer == "\n... [1000 characters omitted]"
+    assert compacted[2] == answers[2]
+    assert report.compacted_entries == 2
+    assert answers[0].answer == "a" * 1000
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from financial_a2a_solution.llm import (
+    FakeProvider,
+    GeminiProvider,
+    get_llm_provider,
+)
+
+
+async def collect(provider: FakeProvider, prompt: str) -> list[str]:
+    return [chunk async for chunk in provider.stream(prompt)]
+
+
+def test_fake_provider_replays_sequence_in_chunks():
+    provider = FakeProvider(["first answer", "second"], chunk_size=5)
+    assert asyncio.run(collect(provider, "a")) == ["first", " answ", "er"]
+    assert asyncio.run(collect(provider, "b")) == ["secon", "d"]
+    assert asyncio.run(collect(provider, "c")) == ["secon", "d"]
+    assert provider.prompts == ["a", "b", "c"]
+
+
+def test_fake_provider_matches_mapping_and_callable():
+    provider = FakeProvider({"KBANK": "bank"}, chunk_size=100)
+    assert asyncio.run(collect(provider, "How is KBANK?")) == ["bank"]
+    assert asyncio.run(collect(provider, "Other")) == [
+        FakeProvider.DEFAULT_RESPONSE
+    ]
+
+    provider = FakeProvider(str.upper, chunk_size=100)
+    assert asyncio.run(collect(provider, "abc")) == ["ABC"]
+
+
+def test_get_llm_provider_is_cached():
+    provider = get_llm_provider("fake")
+    assert provider is get_llm_provider("fake")
+    assert isinstance(get_llm_provider("gemini"), GeminiProvider)
+    with pytest.raises(ValueError, match="Unknown LLM provider"):
+        get_llm_provider("unknown")
@@ -0,0 +1,60 @@
+import asyncio
+
+from financial_a2a_solution.mcp_catalog import ToolCatalog
+from financial_a2a_solution.mcp_pool import MCPSessionPool
+
+
+def test_tools_are_listed_once(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd)
+        calls = 0
+        list_tools = pool.list_tools
+
+        async def counting_list_tools():
+            nonlocal calls
+            calls += 1
+            return await list_tools()
+
+        pool.list_tools = counting_list_tools
+        catalog = ToolCatalog(pool)
+        try:
+            first = await catalog.get_prompt()
+            second = await catalog.get_prompt()
+        finally:
+            await pool.close()
+        return first, second, calls
+
+    first, second, calls = asyncio.run(run())
+    assert first == second
+    assert "pid" in first
+    assert calls == 1
+
+
+def test_catalog_is_refreshed_when_the_tools_change(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd)
+        catalog = ToolCatalog(pool)
+        try:
+            before = [tool.name for tool in await catalog.get_tools()]
+            await pool.call_tool("add_tool")
+            after = [tool.name for tool in await catalog.get_tools()]
+        finally:
+            await pool.close()
+        return before, after
+
+    before, after = asyncio.run(run())
+    assert "extra" not in before
+    assert "extra" in after
+
+
+def test_catalog_expires_after_its_ttl(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd)
+        catalog = ToolCatalog(pool, ttl=0)
+        try:
+            await catalog.get_tools()
+            return catalog.stale
+        finally:
+            await pool.close()
+
+    assert asyncio.run(run())
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from financial_a2a_solution.mcp_pool import MCPSessionPool
+
+
+def text(result) -> str:
+    return result.content[0].text
+
+
+def test_sessions_are_reused(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd, size=2)
+        try:
+            first = text(await pool.call_tool("pid"))
+            second = text(await pool.call_tool("pid"))
+            tools = await pool.list_tools()
+        finally:
+            await pool.close()
+        return first, second, [tool.name for tool in tools.tools]
+
+    first, second, tools = asyncio.run(run())
+    assert first == second
+    assert tools == ["pid", "crash", "sleep", "progress", "add_tool"]
+
+
+def test_pool_size_bounds_concurrent_sessions(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd, size=2)
+        try:
+            results = await asyncio.gather(
+                *(pool.call_tool("pid") for _ in range(6))
+            )
+        finally:
+            await pool.close()
+        return {text(result) for result in results}
+
+    assert len(asyncio.run(run())) <= 2  # noqa: PLR2004
+
+
+def test_crashed_server_is_restarted(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd, size=1)
+        try:
+            before = text(await pool.call_tool("pid"))
+            with pytest.raises(Exception):  # noqa: B017, PT011
+                await pool.call_tool("crash")
+            after = text(await pool.call_tool("pid"))
+        finally:
+            await pool.close()
+        return before, after
+
+    before, after = asyncio.run(run())
+    assert before != after
+
+
+def test_cancelled_call_discards_its_session(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd, size=1)
+        try:
+            before = text(await pool.call_tool("pid"))
+            call = asyncio.ensure_future(
+                pool.call_tool("sleep", {"seconds": 3})
+            )
+            await asyncio.sleep(0.5)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+            idle = len(pool._idle)
+            after = text(await pool.call_tool("pid"))
+        finally:
+            await pool.close()
+        return before, idle, after
+
+    before, idle, after = asyncio.run(run())
+    assert idle == 0
+    assert before != after
+
+
+def test_idle_sessions_are_reaped(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd, idle_timeout=0.2)
+        try:
+            await pool.call_tool("pid")
+            await asyncio.sleep(0.5)
+            return len(pool._sessions)
+        finally:
+            await pool.close()
+
+    assert asyncio.run(run()) == 0
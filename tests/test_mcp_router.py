@@ -0,0 +1,68 @@
+import asyncio
+import shutil
+
+import pytest
+
+from financial_a2a_solution.mcp_pool import MCPSessionPool
+from financial_a2a_solution.mcp_router import MCPRouter
+
+
+@pytest.fixture
+def servers(mcp_cmd, tmp_path) -> dict[str, dict]:
+    python, server = mcp_cmd
+    other = tmp_path / "other_server.py"
+    shutil.copy(server, other)
+    return {
+        "set": {"cmd": [python, server]},
+        "backtest": {"cmd": [python, str(other)]},
+    }
+
+
+def test_tools_of_every_server_are_namespaced(servers):
+    async def run():
+        router = MCPRouter.shared(servers)
+        try:
+            tools = [tool.name for tool in await router.get_tools()]
+            prompt = await router.get_prompt()
+        finally:
+            await MCPSessionPool.close_all()
+        return tools, prompt
+
+    tools, prompt = asyncio.run(run())
+    assert tools == [
+        "set.pid",
+        "set.crash",
+        "set.sleep",
+        "set.progress",
+        "set.add_tool",
+        "backtest.pid",
+        "backtest.crash",
+        "backtest.sleep",
+        "backtest.progress",
+        "backtest.add_tool",
+    ]
+    assert "backtest.pid" in prompt
+
+
+def test_calls_are_routed_to_the_owning_server(servers):
+    async def run():
+        router = MCPRouter.shared(servers)
+        try:
+            set_pid = await router.call_tool("set.pid")
+            backtest_pid = await router.call_tool("backtest.pid")
+            again = await router.call_tool("set.pid")
+        finally:
+            await MCPSessionPool.close_all()
+        return [r.content[0].text for r in (set_pid, backtest_pid, again)]
+
+    set_pid, backtest_pid, again = asyncio.run(run())
+    assert set_pid == again
+    assert set_pid != backtest_pid
+
+
+def test_unknown_tools_are_rejected(servers):
+    router = MCPRouter(servers)
+    with pytest.raises(ValueError, match="Unknown MCP tool"):
+        router.route("other.pid")
+    with pytest.raises(ValueError, match="Unknown MCP tool"):
+        router.route("pid")
@@ -0,0 +1,80 @@
+import asyncio
+
+from financial_a2a_solution.llm import FakeProvider
+from financial_a2a_solution.mcp_pool import MCPSessionPool
+from financial_a2a_solution.progress import ProgressRelay, format_progress
+from financial_a2a_solution.technical_analyser_agent.agent import (
+    Agent,
+    MCPParameters,
+)
+
+SELECT_PROGRESS = (
+    '```json\n[{"name": "progress", "arguments": {"steps": 2}}]\n```\n'
+)
+
+
+def test_format_progress():
+    assert format_progress("t", 1, 4, "loading") == "[t] loading (1/4)\n"
+    assert format_progress("t", 2.5, None, None) == "[t] 2.5\n"
+
+
+def test_pool_reports_progress(mcp_cmd):
+    async def run():
+        pool = MCPSessionPool(cmd=mcp_cmd)
+        relay = ProgressRelay()
+        try:
+            call = asyncio.ensure_future(
+                pool.call_tool(
+                    "progress", progress_callback=relay.callback("progress")
+                )
+            )
+            updates = [update async for update in relay.updates(call)]
+        finally:
+            await pool.close()
+        return updates, call.result()
+
+    updates, result = asyncio.run(run())
+    assert updates == [
+        "[progress] step 1 (1/3)\n",
+        "[progress] step 2 (2/3)\n",
+        "[progress] step 3 (3/3)\n",
+    ]
+    assert result.content[0].text == "done"
+
+
+def test_closing_the_updates_cancels_the_calls():
+    async def run():
+        calls = asyncio.ensure_future(asyncio.sleep(60))
+
+        async def consume():
+            async for _ in ProgressRelay().updates(calls):
+                pass
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0)
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        return calls.cancelled()
+
+    assert asyncio.run(run())
+
+
+def test_agent_streams_tool_progress(mcp_cmd):
+    async def run():
+        agent = Agent(
+            mcp_parameters=MCPParameters(cmd=mcp_cmd),
+            llm=FakeProvider([SELECT_PROGRESS, FakeProvider.DEFAULT_RESPONSE]),
+        )
+        try:
+            return [chunk async for chunk in agent.stream("go")]
+        finally:
+            await MCPSessionPool.close_all()
+
+    chunks = asyncio.run(run())
+    progress = [chunk.content for chunk in chunks if chunk.is_progress]
+    assert progress == [
+        "[progress] step 1 (1/2)\n",
+        "[progress] step 2 (2/2)\n",
+    ]
+    history = next(c for c in chunks if "done" in c.content)
+    assert not history.is_progress
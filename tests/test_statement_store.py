@@ -0,0 +1,129 @@
+import asyncio
+
+import numpy as np
+import pytest
+from mcp.types import CallToolResult, TextContent
+
+from financial_a2a_solution.balance_sheet_agent.agent import Agent
+from financial_a2a_solution.llm import FakeProvider
+from financial_a2a_solution.local_tools import LocalToolbox
+from financial_a2a_solution.statement_store import (
+    StatementStore,
+    format_value,
+    parse_financial_statement,
+)
+
+
+def statement(net_income: tuple[float, float], assets: tuple[float, float]):
+    return f"""
+    Business Type: Bank
+
+    UNIT: Million THB
+
+    Income Statement:
+    accountCode|accountName|2023|2024
+400000|Comprehensive income statement||
+409996|Net profit for the period|{net_income[0]}|{net_income[1]}
+
+
+    Balance Sheet:
+    accountCode|accountName|2023|2024
+109999|Total assets|{assets[0]}|{assets[1]}
+"""
+
+
+def make_store() -> StatementStore:
+    store = StatementStore()
+    store.ingest("kbank", statement((40.0, 50.0), (3000.0, 3600.0)))
+    store.ingest("SCB", statement((-10.0, 20.0), (2000.0, 1000.0)))
+    return store
+
+
+def test_statements_are_parsed():
+    rows = list(parse_financial_statement(statement((1, 2), (3, 4))))
+    assert [(row.code, row.period, row.value) for row in rows] == [
+        ("409996", "2023", 1),
+        ("409996", "2024", 2),
+        ("109999", "2023", 3),
+        ("109999", "2024", 4),
+    ]
+    assert rows[0].statement == "Income Statement"
+    assert rows[-1].statement == "Balance Sheet"
+
+
+def test_store_grows_and_updates():
+    store = StatementStore()
+    for index in range(10):
+        store.ingest(f"S{index}", statement((index, index), (1, 1)))
+    store.ingest("S0", statement((7, 8), (1, 1)))
+    assert store.values.shape == (10, 2, 2)
+    _, _, _, values = store.query(["S0", "S9"], ["409996"])
+    assert values[:, :, 0].tolist() == [[7, 8], [9, 9]]
+
+
+def test_query_by_name_across_symbols():
+    symbols, periods, codes, values = make_store().query(
+        items=["total assets"], periods=["2024"]
+    )
+    assert (symbols, periods, codes) == (["KBANK", "SCB"], ["2024"], ["109999"])
+    assert values.ravel().tolist() == [3600, 1000]
+
+
+def test_growth_rates():
+    _, periods, growth = make_store().growth(None, "Net profit")
+    assert periods == ["2023", "2024"]
+    assert np.isnan(growth[:, 0]).all()
+    assert growth[:, 1] == pytest.approx([0.25, 3.0])
+
+
+def test_unknown_labels_are_rejected():
+    store = make_store()
+    with pytest.raises(KeyError):
+        store.query(["PTT"], ["109999"])
+    with pytest.raises(KeyError):
+        store.resolve_item("goodwill")
+
+
+def test_query_tools():
+    async def run():
+        toolbox = LocalToolbox()
+        make_store().register(toolbox)
+        table = await toolbox.call(
+            "query_statements", {"items": ["109999"], "symbols": ["scb"]}
+        )
+        growth = await toolbox.call("statement_growth", {"item": "409996"})
+        missing = await toolbox.call("query_statements", {"items": ["x"]})
+        return table, growth, missing
+
+    table, growth, missing = asyncio.run(run())
+    assert table.content[0].text.splitlines() == [
+        "symbol|accountCode|accountName|2023|2024",
+        "SCB|109999|Total assets|2000|1000",
+    ]
+    assert "KBANK||25.00%" in growth.content[0].text
+    assert missing.isError
+
+
+@pytest.mark.parametrize(
+    ("value", "text"),
+    [
+        (1234567890.0, "1234567890"),
+        (-98765432109.87, "-98765432109.87"),
+        (0.25, "0.25"),
+        (float("nan"), ""),
+    ],
+)
+def test_format_value_is_exact(value, text):
+    assert format_value(value) == text
+
+
+def test_agent_fills_the_store_from_fetched_statements():
+    store = StatementStore()
+    agent = Agent(llm=FakeProvider(), statement_store=store)
+    tool = {"name": "get_financial_statement", "arguments": {"symbol": "SCB"}}
+    result = CallToolResult(
+        content=[TextContent(type="text", text=statement((1, 2), (3, 4)))]
+    )
+    asyncio.run(agent.record_call(tool, result))
+    assert store.symbols == ["SCB"]
+    assert "query_statements" in agent.local_tools
@@ -0,0 +1,88 @@
+import asyncio
+
+from mcp.types import CallToolResult, TextContent
+
+from financial_a2a_solution.cache import DiskCache, MemoryCache, TieredCache
+from financial_a2a_solution.tool_cache import (
+    ToolResultCache,
+    canonicalize_arguments,
+)
+
+
+class CountingTool:
+    def __init__(self, is_error: bool = False):
+        self.calls = 0
+        self.is_error = is_error
+
+    async def __call__(self) -> CallToolResult:
+        self.calls += 1
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"result {self.calls}")],
+            isError=self.is_error,
+        )
+
+
+def make_cache(**kwargs) -> ToolResultCache:
+    kwargs.setdefault("cache", TieredCache(MemoryCache()))
+    return ToolResultCache(
+        **{"tool_ttls": {}, "allow": [], "deny": [], **kwargs}
+    )
+
+
+async def call_twice(cache, tool, name="get_financial_statement", **args):
+    first = await cache.call("set-mcp", name, args, tool)
+    second = await cache.call(
+        "set-mcp", name, dict(reversed(args.items())), tool
+    )
+    return first.content[0].text, second.content[0].text
+
+
+def test_arguments_are_canonicalized():
+    assert canonicalize_arguments({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+    assert canonicalize_arguments(None) == canonicalize_arguments({})
+
+
+def test_results_are_cached_by_tool_and_arguments():
+    tool = CountingTool()
+    results = asyncio.run(
+        call_twice(make_cache(), tool, symbol="KBANK", from_year=2024)
+    )
+    assert results == ("result 1", "result 1")
+    assert tool.calls == 1
+
+
+def test_errors_are_not_cached():
+    tool = CountingTool(is_error=True)
+    asyncio.run(call_twice(make_cache(), tool, symbol="KBANK"))
+    assert tool.calls == 2  # noqa: PLR2004
+
+
+def test_allow_and_deny_lists():
+    cache = make_cache(allow=["get_*", "back_test_*"], deny=["get_live_*"])
+    assert cache.ttl_for("get_financial_statement") > 0
+    assert cache.ttl_for("back_test_asset_price_cross_moving_average") > 0
+    assert cache.ttl_for("get_live_price") == 0
+    assert cache.ttl_for("place_order") == 0
+
+
+def test_per_tool_ttl():
+    cache = make_cache(ttl=60, tool_ttls={"get_financial_statement": 86400})
+    assert cache.ttl_for("get_financial_statement") == 86400  # noqa: PLR2004
+    assert cache.ttl_for("back_test") == 60  # noqa: PLR2004
+
+
+def test_results_survive_restarts(tmp_path):
+    tool = CountingTool()
+
+    def disk_cache() -> ToolResultCache:
+        return make_cache(cache=TieredCache(MemoryCache(), DiskCache(tmp_path)))
+
+    async def run():
+        await disk_cache().call("set-mcp", "get_financial_statement", {}, tool)
+        result = await disk_cache().call(
+            "set-mcp", "get_financial_statement", {}, tool
+        )
+        return result.content[0].text
+
+    assert asyncio.run(run()) == "result 1"
+    assert tool.calls == 1
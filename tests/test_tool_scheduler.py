@@ -0,0 +1,91 @@
+import asyncio
+
+from financial_a2a_solution.scheduler import ToolScheduler
+
+
+async def call(scheduler, server, owner, log, started=None):
+    async with scheduler.slot(server, owner):
+        log.append((owner, server))
+        if started is not None:
+            started.set()
+        await asyncio.sleep(0.01)
+
+
+def test_limits_are_enforced():
+    async def run():
+        scheduler = ToolScheduler(max_concurrency=3, max_per_server=2)
+        peak = {"total": 0, "a": 0}
+
+        async def track(server):
+            async with scheduler.slot(server, "task"):
+                peak["total"] = max(peak["total"], scheduler.running)
+                peak["a"] = max(peak["a"], scheduler.running_per_server["a"])
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(track("a") for _ in range(5)), track("b"))
+        return peak, scheduler.running, scheduler.queue_depth
+
+    peak, running, depth = asyncio.run(run())
+    assert peak == {"total": 3, "a": 2}
+    assert running == depth == 0
+
+
+def test_owners_are_served_in_turn():
+    async def run():
+        scheduler = ToolScheduler(max_concurrency=1, max_per_server=1)
+        log: list[tuple[str, str]] = []
+        started = asyncio.Event()
+        blocker = asyncio.create_task(
+            call(scheduler, "s", "blocker", log, started)
+        )
+        await started.wait()
+        greedy = [
+            asyncio.create_task(call(scheduler, "s", "greedy", log))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        polite = asyncio.create_task(call(scheduler, "s", "polite", log))
+        await asyncio.sleep(0)
+        depths = scheduler.queue_depths()
+        await asyncio.gather(blocker, *greedy, polite)
+        return [owner for owner, _ in log], depths
+
+    owners, depths = asyncio.run(run())
+    assert depths == {"greedy": 3, "polite": 1}
+    assert owners == ["blocker", "greedy", "polite", "greedy", "greedy"]
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def run():
+        scheduler = ToolScheduler(max_concurrency=1, max_per_server=1)
+        log: list[tuple[str, str]] = []
+        started = asyncio.Event()
+        blocker = asyncio.create_task(call(scheduler, "s", "a", log, started))
+        await started.wait()
+        waiting = asyncio.create_task(call(scheduler, "s", "b", log))
+        await asyncio.sleep(0)
+        depth = scheduler.queue_depth
+        waiting.cancel()
+        await asyncio.sleep(0)
+        await blocker
+        return depth, scheduler.queue_depth, scheduler.running, log
+
+    depth, after, running, log = asyncio.run(run())
+    assert (depth, after, running) == (1, 0, 0)
+    assert log == [("a", "s")]
+
+
+def test_free_server_is_not_blocked_by_a_busy_one():
+    async def run():
+        scheduler = ToolScheduler(max_concurrency=2, max_per_server=1)
+        log: list[tuple[str, str]] = []
+        started = asyncio.Event()
+        busy = asyncio.create_task(call(scheduler, "a", "x", log, started))
+        await started.wait()
+        queued = asyncio.create_task(call(scheduler, "a", "x", log))
+        await asyncio.sleep(0)
+        await call(scheduler, "b", "y", log)
+        await asyncio.gather(busy, queued)
+        return log
+
+    assert asyncio.run(run())[:2] == [("x", "a"), ("y", "b")]
@@ -0,0 +1,73 @@
+from financial_a2a_solution.the_solution import utils
+import pytest
+
+
+RESPONSE = """<thoughts>
+Use `get_price`.
+</thoughts>
+
+<selected_tools>
+```json
+[
+    {
+        // The latest price
+        "name": "get_price",
+        "arguments": {"symbol": "SET:KBANK", "note": "a // b, ]"},  # trailing
+    },
+]
+```
+</selected_tools>
+
+<answer>
+</answer>"""
+
+TOOLS = [
+    {
+        "name": "get_price",
+        "arguments": {"symbol": "SET:KBANK", "note": "a // b, ]"},
+    }
+]
+
+
+def test_extract_json_block():
+    assert utils.extract_json_block(RESPONSE, "selected_tools") == TOOLS
+
+
+def test_extract_json_block_on_partial_stream():
+    end = RESPONSE.index("```\n</selected_tools>")
+    for size in range(0, end, 7):
+        assert (
+            utils.extract_json_block(RESPONSE[:size], "selected_tools") is None
+        )
+    assert (
+        utils.extract_json_block(RESPONSE[: end + 3], "selected_tools") == TOOLS
+    )
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        '<selected_tools>[{"name": "a"}]</selected_tools>',
+        '<selected_tools>``` JSON\n[{"name": "a"}]```</selected_tools>',
+        'Text\n```json\n[{"name": "a"}]\n```',
+    ],
+)
+def test_extract_json_block_formatting_drift(response):
+    assert utils.extract_json_block(response, "selected_tools") == [
+        {"name": "a"}
+    ]
+
+
+def test_extract_json_block_without_block():
+    assert (
+        utils.extract_json_block("<answer>42</answer>", "selected_tools")
+        is None
+    )
+    assert utils.extract_json_block("```python\nprint(1)\n```") is None
+
+
+def test_extract_json_block_invalid():
+    with pytest.raises(ValueError):
+        utils.extract_json_block(
+            "<selected_tools>[1 2]</selected_tools>", "selected_tools"
+        )
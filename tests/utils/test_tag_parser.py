@@ -0,0 +1,52 @@
+from financial_a2a_solution.the_solution import utils
+import pytest
+
+
+STREAM = (
+    "<thoughts>Check the price</thoughts>\n"
+    '<agent name="A">x <agent name="B">y</agent> z</agent> 1 < 2 '
+    '<selected_tools>[{"name": "<b>"}]</selected_tools>'
+    "<answer>42"
+)
+
+
+def feed_all(parser, chunks):
+    latest = {}
+    for chunk in chunks:
+        for event in parser.feed(chunk):
+            latest[event.pop("index")] = event
+    return [latest[index] for index in sorted(latest)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, len(STREAM)])
+def test_feed_matches_parse_streamed_tags(size):
+    chunks = [STREAM[i : i + size] for i in range(0, len(STREAM), size)]
+    parser = utils.TagParser()
+    assert feed_all(parser, chunks) == utils.parse_streamed_tags(STREAM)
+    assert parser.tag_count == 4
+
+
+def test_feed_returns_only_changed_tags():
+    parser = utils.TagParser()
+    assert parser.feed("<thoughts>a</thoughts><ans") == [
+        {
+            "tag": "thoughts",
+            "attributes": {},
+            "content": "a",
+            "is_complete": True,
+            "index": 0,
+        }
+    ]
+    assert parser.feed("wer>4") == [
+        {
+            "tag": "answer",
+            "attributes": {},
+            "content": "4",
+            "is_complete": False,
+            "index": 1,
+        }
+    ]
+    assert parser.feed("") == []
+    assert parser.feed("2</answer>")[0]["content"] == "42"
+    parser.reset()
+    assert parser.tag_count == 0
@@ -0,0 +1,31 @@
+from financial_a2a_solution.the_solution import utils
+
+
+STREAM = (
+    "<thoughts>Check the price</thoughts>\n"
+    '<agent name="A">x <agent name="B">y</agent> z</agent> '
+    "<answer>ราคา 42"
+)
+
+
+def test_spans_match_parse_streamed_tags():
+    spans = utils.parse_tag_spans(STREAM)
+    tags = utils.parse_streamed_tags(STREAM)
+    assert len(spans) == len(tags) == 3
+    for span, tag in zip(spans, tags, strict=True):
+        assert span.tag == tag["tag"]
+        assert span.attributes == tag["attributes"]
+        assert span.content(STREAM) == tag["content"]
+        assert span.is_complete == tag["is_complete"]
+
+
+def test_span_offsets_are_utf8_bytes():
+    data = STREAM.encode()
+    span = utils.parse_tag_spans(STREAM)[-1]
+    assert data[span.start : span.content_start] == b"<answer>"
+    assert span.end == span.content_end == len(data)
+
+
+def test_parse_last_tag():
+    assert utils.parse_last_tag(STREAM) == utils.parse_streamed_tags(STREAM)[-1]
+    assert utils.parse_last_tag("no tags < here") is None